@@ -5,12 +5,13 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import time
 import random
-import logging
 from utils.mqtt_client import MQTTClient
-from utils.direct_simulator import initialize_direct_simulator, get_direct_simulator
+from utils.ingestion_service import get_ingestion_handle, MODE_DIRECT, MODE_MQTT, MODE_SHARDED
+from utils.sharded_ingest import SHARD_BY_TOPIC, SHARD_SHARED_SUBSCRIPTION
 from utils.sensor_utils import get_sensor_status_color, generate_sample_data
 from utils.visualization import create_gauge_chart, create_status_distribution_chart
-from utils.translation import get_translation, get_languages, set_language
+from utils.live_charts import figure_json, live_chart
+from utils.translation import bind, get_languages, set_language
 from utils.data_manager import get_sensors_data, get_mattresses_data, get_alerts_data
 
 # Page configuration
@@ -24,10 +25,6 @@ st.set_page_config(
 # Initialize session state
 if 'language' not in st.session_state:
     st.session_state['language'] = 'en'
-if 'connected' not in st.session_state:
-    st.session_state['connected'] = False
-if 'mqtt_client' not in st.session_state:
-    st.session_state['mqtt_client'] = None
 if 'last_update' not in st.session_state:
     st.session_state['last_update'] = datetime.now()
 if 'auto_refresh' not in st.session_state:
@@ -35,23 +32,41 @@ if 'auto_refresh' not in st.session_state:
 if 'refresh_interval' not in st.session_state:
     st.session_state['refresh_interval'] = 2
 
-# Force regular page updates
-if st.session_state.auto_refresh:
-    st.empty().markdown(f"<p style='display:none'>{time.time()}</p>", unsafe_allow_html=True)
-    time.sleep(st.session_state.refresh_interval)
-    st.rerun()
-
-# Initialize direct simulator for simulating sensor data
-# This will be used to get sensor data for mattress 1 (MAT-101)
-if 'direct_simulator' not in st.session_state:
-    try:
-        logging.info("Initializing direct simulator...")
-        direct_simulator = initialize_direct_simulator()
-        st.session_state['direct_simulator'] = direct_simulator
-        logging.info("Direct simulator initialized successfully")
-    except Exception as e:
-        logging.error(f"Failed to initialize direct simulator: {e}")
-        st.session_state['direct_simulator'] = None
+# Live areas refresh themselves as fragments (see below): the page itself is only rerun by user actions.
+# Refresh interval of each live area in seconds; the metrics row follows the session's refresh interval
+LIVE_REFRESH_INTERVALS = {
+    'status_chart': 5,
+    'alert_summary': 10,
+    'signal_gauge': 5,
+}
+
+def live_fragment(run_every):
+    """Fragment rerun every run_every seconds while auto refresh is on"""
+    return st.fragment(run_every=run_every if st.session_state.auto_refresh else None)
+
+def memoized(name, version, build):
+    """
+    Rebuilds a live element only when the version of its data changed (kept per session):
+    a fragment tick without new data just redraws the previous result
+    """
+    cached = st.session_state.get(f"live_{name}")
+    if cached is None or cached[0] != version:
+        cached = (version, build())
+        st.session_state[f"live_{name}"] = cached
+    return cached[1]
+
+def live_alerts():
+    """Alert table of the session, regenerated at the alert summary interval"""
+    cached = st.session_state.get("live_alerts")
+    if cached is None or time.monotonic() - cached[0] >= LIVE_REFRESH_INTERVALS['alert_summary']:
+        cached = (time.monotonic(), get_alerts_data())
+        st.session_state["live_alerts"] = cached
+    return cached[1]
+
+# Shared ingestion service: one broker connection / simulator per server process.
+# The session only keeps a lightweight read handle to it.
+ingestion = get_ingestion_handle()
+ingestion_service = ingestion.service
 
 # Sidebar with hospital information and settings
 with st.sidebar:
@@ -72,153 +87,198 @@ with st.sidebar:
             set_language(code)
             st.rerun()
     
-    # MQTT & Sensor Simulator
+    # MQTT & Sensor Simulator (shared by every open session)
     st.markdown("### Données des capteurs")
-    
-    if 'simulator_type' not in st.session_state:
-        st.session_state['simulator_type'] = 'direct'
-    
-    if not st.session_state.connected:
-        with st.expander("Options de connexion", expanded=True):
-            # Option 1: Direct Simulator (local)
-            st.markdown("##### Option 1: Simulateur intégré")
-            if st.button("Démarrer le simulateur intégré", key="start_direct"):
-                # Start the direct simulator
-                st.session_state.connected = True
-                st.session_state.simulator_type = "direct"
-                if 'direct_simulator' in st.session_state and st.session_state.direct_simulator:
-                    st.session_state.direct_simulator.start()
-                    st.success("Simulateur intégré démarré")
-                else:
-                    st.warning("Échec du démarrage du simulateur. Essayez de rafraîchir la page.")
-                time.sleep(1)
-                st.rerun()
-            
-            st.markdown("---")
-            # Option 2: External MQTT Broker
-            st.markdown("##### Option 2: Broker MQTT externe")
-            
-            with st.form("mqtt_config_form_sidebar"):
-                mqtt_host = st.text_input("Adresse du broker MQTT", value="localhost")
-                mqtt_port = st.number_input("Port MQTT", value=1883, min_value=1, max_value=65535)
-                mqtt_username = st.text_input("Nom d'utilisateur (optionnel)")
-                mqtt_password = st.text_input("Mot de passe (optionnel)", type="password")
-                
-                # Form submission
-                submit_button = st.form_submit_button("Connecter au Broker MQTT")
-                
-                if submit_button:
-                    from utils.mqtt_integration import initialize_mqtt_integration
-                    
-                    # Tenter de se connecter au broker MQTT
-                    with st.spinner("Connexion au broker MQTT..."):
-                        mqtt_integration = initialize_mqtt_integration(
-                            host=mqtt_host,
-                            port=int(mqtt_port),
-                            username=mqtt_username if mqtt_username else None,
-                            password=mqtt_password if mqtt_password else None
-                        )
-                        
-                        if mqtt_integration and mqtt_integration.connected:
-                            st.session_state.connected = True
-                            st.session_state.simulator_type = "mqtt"
-                            st.success(f"Connecté au broker MQTT à {mqtt_host}:{mqtt_port}")
-                            
-                            # Stocker les informations de connexion pour les réutiliser
-                            st.session_state['mqtt_broker_info'] = {
-                                'host': mqtt_host,
-                                'port': mqtt_port,
-                                'username': mqtt_username,
-                                'password': mqtt_password
-                            }
-                            
-                            # Mettre à jour le timestamp de dernière mise à jour
-                            st.session_state.last_update = datetime.now()
-                            time.sleep(1)
-                            st.rerun()
-                        else:
-                            st.error(f"Échec de connexion au broker MQTT à {mqtt_host}:{mqtt_port}")
-    else:
-        # Afficher l'état actuel et le bouton pour arrêter
-        simulator_type = st.session_state.get('simulator_type', 'direct')
-        
-        if simulator_type == "direct":
-            st.success("✅ Simulateur intégré en cours d'exécution")
-            if st.button("Arrêter le simulateur"):
-                st.session_state.connected = False
-                if 'direct_simulator' in st.session_state and st.session_state.direct_simulator:
-                    st.session_state.direct_simulator.stop()
-                st.info("Simulateur arrêté")
-                time.sleep(1)
-                st.rerun()
-        else:  # MQTT
-            broker_info = st.session_state.get('mqtt_broker_info', {})
+
+    service_status = ingestion_service.status()
+
+    if service_status['mode'] == MODE_DIRECT:
+        st.success("✅ Simulateur intégré en cours d'exécution")
+    elif service_status['mode'] in (MODE_MQTT, MODE_SHARDED):
+        broker_info = service_status['broker_info']
+        if service_status['connected']:
             st.success(f"✅ Connecté au broker MQTT à {broker_info.get('host', 'localhost')}:{broker_info.get('port', 1883)}")
-            
-            if st.button("Déconnecter du broker MQTT"):
-                st.session_state.connected = False
-                if 'mqtt_integration' in st.session_state:
-                    mqtt_integration = st.session_state['mqtt_integration']
-                    mqtt_integration.disconnect()
-                    st.session_state['mqtt_integration'] = None
-                st.info("Déconnecté du broker MQTT")
-                time.sleep(1)
+        else:
+            st.warning(f"Connexion au broker MQTT {broker_info.get('host', 'localhost')}:{broker_info.get('port', 1883)} en cours...")
+    else:
+        st.info("Aucune source de données active")
+
+    with st.expander("Options de connexion", expanded=not service_status['running']):
+        # Option 1: Direct Simulator (local)
+        st.markdown("##### Option 1: Simulateur intégré")
+        if service_status['mode'] != MODE_DIRECT:
+            if st.button("Démarrer le simulateur intégré", key="start_direct"):
+                ingestion_service.start(MODE_DIRECT)
+                st.success("Simulateur intégré démarré")
                 st.rerun()
-    
+
+        st.markdown("---")
+        # Option 2: External MQTT Broker (connect, or reconfigure the running connection)
+        st.markdown("##### Option 2: Broker MQTT externe")
+
+        with st.form("mqtt_config_form_sidebar"):
+            current_broker = service_status['broker_info']
+            mqtt_host = st.text_input("Adresse du broker MQTT", value=current_broker.get('host', "localhost"))
+            mqtt_port = st.number_input("Port MQTT", value=int(current_broker.get('port', 1883)), min_value=1, max_value=65535)
+            mqtt_username = st.text_input("Nom d'utilisateur (optionnel)")
+            mqtt_password = st.text_input("Mot de passe (optionnel)", type="password")
+            mqtt_workers = st.number_input("Processus d'ingestion", value=1, min_value=1, max_value=32,
+                                           help="Au-delà de 1, le trafic est réparti sur plusieurs processus "
+                                                "(dernières valeurs uniquement : l'historique persistant n'est pas alimenté)")
+            mqtt_shared = st.checkbox("Abonnements partagés MQTT v5 ($share)", value=False)
+
+            # Form submission
+            submit_label = "Reconfigurer le broker MQTT" if service_status['mode'] in (MODE_MQTT, MODE_SHARDED) else "Connecter au Broker MQTT"
+            submit_button = st.form_submit_button(submit_label)
+
+            if submit_button:
+                # Tenter de se connecter au broker MQTT
+                with st.spinner("Connexion au broker MQTT..."):
+                    success = ingestion_service.reconfigure(
+                        host=mqtt_host,
+                        port=int(mqtt_port),
+                        username=mqtt_username if mqtt_username else None,
+                        password=mqtt_password if mqtt_password else None,
+                        workers=int(mqtt_workers),
+                        shard_mode=SHARD_SHARED_SUBSCRIPTION if mqtt_shared else SHARD_BY_TOPIC
+                    )
+
+                    if success:
+                        st.success(f"Connecté au broker MQTT à {mqtt_host}:{mqtt_port}")
+
+                        # Mettre à jour le timestamp de dernière mise à jour
+                        st.session_state.last_update = datetime.now()
+                        st.rerun()
+                    else:
+                        st.error(f"Échec de connexion au broker MQTT à {mqtt_host}:{mqtt_port}")
+
+        if service_status['mode'] == MODE_SHARDED and not service_status['persistent_history']:
+            st.warning("Ingestion multi-processus : l'historique persistant n'est pas alimenté")
+
+    # Stop whichever source is running (affects every session of this server)
+    if service_status['running']:
+        stop_label = "Arrêter le simulateur" if service_status['mode'] == MODE_DIRECT else "Déconnecter du broker MQTT"
+        if st.button(stop_label, key="stop_ingestion"):
+            ingestion_service.stop()
+            st.info("Source de données arrêtée")
+            st.rerun()
+
     st.markdown("---")
     st.markdown("👨‍💻 User: Medical Technician")
     st.markdown("📅 " + datetime.now().strftime("%Y-%m-%d"))
 
 # Main content
-tr = lambda key: get_translation(key, st.session_state.language)
+tr = bind(st.session_state.language)
 
 st.title(tr("main_title"))
 st.markdown(tr("main_subtitle"))
 
 # Top metrics row
-col1, col2, col3, col4 = st.columns(4)
-
-# We will replace this with real data from MQTT later
-sensors_data = get_sensors_data()
-mattresses_data = get_mattresses_data()
-alerts_data = get_alerts_data()
-
-total_mattresses = len(mattresses_data)
-active_sensors = sensors_data[sensors_data['status'] == 'active'].shape[0]
-total_sensors = len(sensors_data)
-active_alerts = alerts_data[alerts_data['status'] == 'active'].shape[0]
-critical_alerts = alerts_data[(alerts_data['status'] == 'active') & (alerts_data['priority'] == 'critical')].shape[0]
-
-with col1:
-    st.metric(
-        label=tr("total_mattresses"),
-        value=total_mattresses,
-        delta=None
-    )
-
-with col2:
-    st.metric(
-        label=tr("active_sensors"),
-        value=f"{active_sensors}/{total_sensors}",
-        delta=f"{round(active_sensors/total_sensors*100)}%" if total_sensors > 0 else "N/A",
-        delta_color="normal"
-    )
-
-with col3:
-    st.metric(
-        label=tr("active_alerts"),
-        value=active_alerts,
-        delta=None,
-        help=tr("alerts_help")
-    )
-
-with col4:
-    st.metric(
-        label=tr("critical_alerts"),
-        value=critical_alerts,
-        delta=None,
-        help=tr("critical_alerts_help")
-    )
+@live_fragment(st.session_state.refresh_interval)
+def metrics_row():
+    col1, col2, col3, col4 = st.columns(4)
+
+    # Shared tables, only rebuilt when the fleet or the live snapshot changed
+    sensors_data = get_sensors_data()
+    mattresses_data = get_mattresses_data()
+    alerts_data = live_alerts()
+
+    total_mattresses = len(mattresses_data)
+    active_sensors = sensors_data[sensors_data['status'] == 'active'].shape[0]
+    total_sensors = len(sensors_data)
+    active_alerts = alerts_data[alerts_data['status'] == 'active'].shape[0]
+    critical_alerts = alerts_data[(alerts_data['status'] == 'active') & (alerts_data['priority'] == 'critical')].shape[0]
+
+    with col1:
+        st.metric(
+            label=tr("total_mattresses"),
+            value=total_mattresses,
+            delta=None
+        )
+
+    with col2:
+        st.metric(
+            label=tr("active_sensors"),
+            value=f"{active_sensors}/{total_sensors}",
+            delta=f"{round(active_sensors/total_sensors*100)}%" if total_sensors > 0 else "N/A",
+            delta_color="normal"
+        )
+
+    with col3:
+        st.metric(
+            label=tr("active_alerts"),
+            value=active_alerts,
+            delta=None,
+            help=tr("alerts_help")
+        )
+
+    with col4:
+        st.metric(
+            label=tr("critical_alerts"),
+            value=critical_alerts,
+            delta=None,
+            help=tr("critical_alerts_help")
+        )
+
+@live_fragment(LIVE_REFRESH_INTERVALS['status_chart'])
+def status_chart():
+    sensors_data = get_sensors_data()
+    version = (sensors_data.attrs.get('fleet_version'), sensors_data.attrs.get('snapshot_version'),
+               st.session_state.language)
+
+    def build():
+        # Distribution of sensor statuses
+        status_counts = sensors_data['status'].value_counts().reset_index()
+        status_counts.columns = ['status', 'count']
+        return figure_json(create_status_distribution_chart(status_counts, language=st.session_state.language))
+
+    # Updated in place in the browser: only the changed bar heights are sent
+    live_chart(memoized("status_chart", version, build), "status_chart")
+
+@live_fragment(LIVE_REFRESH_INTERVALS['alert_summary'])
+def alert_summary():
+    alerts_data = live_alerts()
+
+    # Display top alerts
+    if not alerts_data.empty:
+        alerts_to_show = alerts_data[alerts_data['status'] == 'active'].sort_values('priority', ascending=False).head(5)
+        
+        for _, alert in alerts_to_show.iterrows():
+            priority_color = "#ff4b4b" if alert['priority'] == 'critical' else "#ff9d00"
+            with st.container():
+                st.markdown(
+                    f"""
+                    <div style='border-left: 3px solid {priority_color}; padding-left: 10px; margin-bottom: 10px;'>
+                    <b>{alert['title']}</b><br>
+                    <small>{alert['description']}</small><br>
+                    <small>Mattress: {alert['mattress_id']} | Priority: {alert['priority'].upper()}</small>
+                    </div>
+                    """, 
+                    unsafe_allow_html=True
+                )
+    else:
+        st.info(tr("no_active_alerts"))
+
+@live_fragment(LIVE_REFRESH_INTERVALS['signal_gauge'])
+def signal_gauge():
+    sensors_data = get_sensors_data()
+    version = (sensors_data.attrs.get('fleet_version'), sensors_data.attrs.get('snapshot_version'),
+               st.session_state.language)
+
+    def build():
+        # Connection quality
+        signal_levels = sensors_data['signal_strength'].dropna()
+        avg_signal = signal_levels.mean() if not signal_levels.empty else 0
+        return figure_json(create_gauge_chart(
+            value=avg_signal,
+            title=tr("avg_signal_strength"),
+            suffix="/10",
+            language=st.session_state.language
+        ))
+
+    live_chart(memoized("signal_gauge", version, build), "signal_gauge")
+
+metrics_row()
 
 # Main dashboard content in two columns
 left_col, right_col = st.columns([2, 1])
@@ -226,13 +286,7 @@ left_col, right_col = st.columns([2, 1])
 with left_col:
     # Sensor Status Overview
     st.subheader(tr("sensor_status_overview"))
-    
-    # Distribution of sensor statuses
-    status_counts = sensors_data['status'].value_counts().reset_index()
-    status_counts.columns = ['status', 'count']
-    
-    fig = create_status_distribution_chart(status_counts)
-    st.plotly_chart(fig, use_container_width=True)
+    status_chart()
 
     # Recent activity
     st.subheader(tr("recent_activity"))
@@ -267,26 +321,7 @@ with left_col:
 with right_col:
     # Alert Summary
     st.subheader(tr("alert_summary"))
-    
-    # Display top alerts
-    if not alerts_data.empty:
-        alerts_to_show = alerts_data[alerts_data['status'] == 'active'].sort_values('priority', ascending=False).head(5)
-        
-        for _, alert in alerts_to_show.iterrows():
-            priority_color = "#ff4b4b" if alert['priority'] == 'critical' else "#ff9d00"
-            with st.container():
-                st.markdown(
-                    f"""
-                    <div style='border-left: 3px solid {priority_color}; padding-left: 10px; margin-bottom: 10px;'>
-                    <b>{alert['title']}</b><br>
-                    <small>{alert['description']}</small><br>
-                    <small>Mattress: {alert['mattress_id']} | Priority: {alert['priority'].upper()}</small>
-                    </div>
-                    """, 
-                    unsafe_allow_html=True
-                )
-    else:
-        st.info(tr("no_active_alerts"))
+    alert_summary()
     
     # System health
     st.subheader(tr("system_health"))
@@ -294,22 +329,13 @@ with right_col:
     # Power status (replaces battery level since devices are plugged in)
     st.success(tr("power_status_ok"))
     
-    # Connection quality
-    signal_levels = sensors_data['signal_strength'].dropna()
-    avg_signal = signal_levels.mean() if not signal_levels.empty else 0
-    
-    fig = create_gauge_chart(
-        value=avg_signal,
-        title=tr("avg_signal_strength"),
-        suffix="/10"
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    signal_gauge()
 
 # Quick links to mattress monitoring
 st.subheader(tr("quick_access"))
 
 mattress_cols = st.columns(4)
-for i, mattress in enumerate(mattresses_data.head(4).itertuples()):
+for i, mattress in enumerate(get_mattresses_data().head(4).itertuples()):
     with mattress_cols[i]:
         status = mattress.status
         color = get_sensor_status_color(status)
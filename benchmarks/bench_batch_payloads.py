@@ -0,0 +1,124 @@
+"""
+Benchmark des lots multi-lectures : un message par mesure (format historique) contre un message
+par matelas et par cycle (lot JSON ou trame binaire)
+
+Mesure, pour le même volume de lectures :
+- le nombre de messages et d'octets PUBLISH vus par le broker (en-tête MQTT QoS 0 compris)
+- le coût d'encodage côté capteur
+- le coût du callback on_message (thread réseau) et du décodage/application par le worker
+
+Usage: python -m benchmarks.bench_batch_payloads [--mattresses N] [--cycles N]
+"""
+
+import argparse
+import json
+import logging
+import random
+import time
+from types import SimpleNamespace
+
+from benchmarks.bench_mqtt_routing import TOPICS, UIDS
+from utils.mqtt_integration import MQTTIntegration
+from utils.payload_decoders import make_batch, encode_batch_frame, BATCH_TOPIC, BATCH_FRAME_TOPIC
+
+
+def make_cycles(mattresses, cycles):
+    """Lectures de chaque cycle : une valeur par type de capteur et par matelas"""
+    uids = [UIDS[i % len(UIDS)] for i in range(mattresses)]
+    start = time.time()
+    return [
+        [(uid, [(topic, round(random.uniform(20.0, 40.0), 2), start + cycle) for topic in TOPICS]) for uid in uids]
+        for cycle in range(cycles)
+    ]
+
+
+def encode_single(cycles):
+    """Format historique : un message JSON par lecture, sur le topic du type"""
+    return [(topic, json.dumps({"uid": uid, "value": value, "timestamp": ts}).encode())
+            for cycle in cycles for uid, readings in cycle for topic, value, ts in readings]
+
+
+def encode_json_batch(cycles):
+    """Un lot JSON par matelas et par cycle"""
+    return [(BATCH_TOPIC, json.dumps(make_batch(uid, readings, timestamp=readings[0][2])).encode())
+            for cycle in cycles for uid, readings in cycle]
+
+
+def encode_frame_batch(cycles):
+    """Une trame binaire par matelas et par cycle"""
+    return [(BATCH_FRAME_TOPIC, encode_batch_frame(uid, readings)) for cycle in cycles for uid, readings in cycle]
+
+
+def publish_size(topic, payload):
+    """Taille d'un paquet PUBLISH QoS 0 : en-tête fixe, longueur restante, nom du topic, payload"""
+    remaining = 2 + len(topic.encode()) + len(payload)
+    length_bytes = 1 if remaining < 128 else 2 if remaining < 16384 else 3
+    return 1 + length_bytes + remaining
+
+
+def bench_mode(encoder, cycles):
+    """
+    Returns:
+    - Dictionnaire: messages, octets, temps d'encodage, d'empilement et de traitement, lectures appliquées
+    """
+    start = time.perf_counter()
+    messages = encoder(cycles)
+    encode_elapsed = time.perf_counter() - start
+
+    integration = MQTTIntegration(queue_capacity=len(messages))
+    msgs = [SimpleNamespace(topic=topic, payload=payload) for topic, payload in messages]
+    start = time.perf_counter()
+    for msg in msgs:
+        integration.on_message(None, None, msg)
+    enqueue_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    while True:
+        batch = integration.ingest_queue.drain(500, timeout=0)
+        if not batch:
+            break
+        integration._process_batch(batch)
+    process_elapsed = time.perf_counter() - start
+
+    applied = sum(buffer.total_appended for buffer in integration.history.buffers.values())
+    return {
+        'messages': len(messages),
+        'bytes': sum(publish_size(topic, payload) for topic, payload in messages),
+        'encode': encode_elapsed,
+        'enqueue': enqueue_elapsed,
+        'process': process_elapsed,
+        'applied': applied
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des lots multi-lectures MQTT")
+    parser.add_argument("--mattresses", type=int, default=5, help="Nombre de matelas (UID)")
+    parser.add_argument("--cycles", type=int, default=20_000, help="Nombre de cycles de mesure")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    cycles = make_cycles(args.mattresses, args.cycles)
+    readings = args.mattresses * args.cycles * len(TOPICS)
+    print(f"{readings} lectures ({args.mattresses} matelas x {len(TOPICS)} capteurs x {args.cycles} cycles)")
+    print(f"{'mode':<12}{'messages':>10}{'octets':>12}{'encodage µs/lect':>18}"
+          f"{'on_message µs/lect':>20}{'worker µs/lect':>16}{'appliquées':>12}")
+
+    baseline = None
+    for name, encoder in (('unitaire', encode_single), ('lot json', encode_json_batch), ('lot trame', encode_frame_batch)):
+        result = bench_mode(encoder, cycles)
+        print(f"{name:<12}{result['messages']:>10}{result['bytes']:>12}"
+              f"{result['encode'] / readings * 1e6:>18.2f}{result['enqueue'] / readings * 1e6:>20.2f}"
+              f"{result['process'] / readings * 1e6:>16.2f}{result['applied']:>12}")
+        if baseline is None:
+            baseline = result
+        else:
+            cpu = result['enqueue'] + result['process']
+            baseline_cpu = baseline['enqueue'] + baseline['process']
+            print(f"{'':<12}broker: /{baseline['messages'] / result['messages']:.1f} messages, "
+                  f"-{100 * (1 - result['bytes'] / baseline['bytes']):.0f}% octets ; "
+                  f"CPU ingestion x{baseline_cpu / cpu:.2f}")
+
+
+if __name__ == "__main__":
+    main()
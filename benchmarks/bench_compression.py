@@ -0,0 +1,114 @@
+"""
+Benchmark des chunks compressés (delta-of-delta + XOR, style Gorilla)
+
+Pour plusieurs profils de série (température bruitée à 1 Hz, mêmes valeurs avec la gigue
+d'horodatage de l'arrivée MQTT, créatinine qui évolue lentement, valeur constante), compare :
+- la représentation liste de dictionnaires {'timestamp', 'value'} (historique MQTT initial)
+- les tableaux NumPy des buffers circulaires (16 octets par point)
+- les chunks compressés de utils.gorilla
+en octets par point et en débit de décodage vers des tableaux NumPy, ainsi que le débit
+d'ajout en flux (CompressedSeries.append).
+
+Usage: python -m benchmarks.bench_compression [--points N] [--chunk-size N]
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from utils.gorilla import CompressedSeries, decode_chunk
+
+START_NS = 1_700_000_000 * 1_000_000_000
+
+
+def make_profiles(points, seed=0):
+    """Séries de test : dictionnaire nom -> (timestamps_ns, values)"""
+    rng = np.random.default_rng(seed)
+    regular = START_NS + np.arange(points, dtype=np.int64) * 1_000_000_000
+    # Horodatage à l'arrivée : quelques ms de gigue, arrondi à la µs comme time.time()
+    jitter = (rng.normal(0, 3e6, points) // 1000 * 1000).astype(np.int64)
+    temperature = rng.normal(36.5, 0.5, points).round(2)
+    creatinine = np.round(1.0 + np.cumsum(rng.normal(0, 0.0005, points)), 2)
+    return {
+        'température 1 Hz': (regular, temperature),
+        'température gigue': (regular + jitter, temperature),
+        'créatinine lente': (regular, creatinine),
+        'constante': (regular, np.full(points, 25.0))
+    }
+
+
+def to_records(timestamps_ns, values):
+    """Représentation liste de dictionnaires, comme MQTTIntegration._history_records"""
+    return [
+        {'timestamp': datetime.fromtimestamp(ts / 1e9).strftime("%Y-%m-%d %H:%M:%S"), 'value': float(value)}
+        for ts, value in zip(timestamps_ns.tolist(), values.tolist())
+    ]
+
+
+def records_size(records):
+    """Taille mémoire profonde de la liste (liste, dictionnaires, chaînes, flottants)"""
+    size = sys.getsizeof(records)
+    for record in records:
+        size += sys.getsizeof(record) + sys.getsizeof(record['timestamp']) + sys.getsizeof(record['value'])
+    return size
+
+
+def records_to_arrays(records):
+    """Décodage de la liste de dictionnaires vers des tableaux (chemin DataFrame de l'historique initial)"""
+    frame = pd.DataFrame(records)
+    return pd.to_datetime(frame['timestamp']).to_numpy(), frame['value'].to_numpy()
+
+
+def _best_of(function, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_profile(name, timestamps_ns, values, chunk_size, repeat):
+    points = len(values)
+    series = CompressedSeries(chunk_size)
+    start = time.perf_counter()
+    for ts_ns, value in zip(timestamps_ns.tolist(), values.tolist()):
+        series.append(ts_ns, value)
+    series.seal()
+    append_rate = points / (time.perf_counter() - start)
+
+    decoded_ts, decoded_values = series.decode()
+    assert np.array_equal(decoded_ts, timestamps_ns) and np.array_equal(decoded_values, values)
+
+    records = to_records(timestamps_ns, values)
+    chunks = [data for _, _, data in series.chunks]
+    records_rate = points / _best_of(lambda: records_to_arrays(records), max(1, repeat // 5))
+    chunk_rate = points / _best_of(lambda: [decode_chunk(data) for data in chunks], repeat)
+
+    dict_bytes = records_size(records) / points
+    chunk_bytes = series.nbytes / points
+    print(f"{name:<20}{dict_bytes:>10.1f}{16:>8.1f}{chunk_bytes:>9.2f}{dict_bytes / chunk_bytes:>10.0f}x"
+          f"{16 / chunk_bytes:>8.1f}x{records_rate / 1e6:>12.2f}{chunk_rate / 1e6:>12.2f}{append_rate / 1e6:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des chunks compressés")
+    parser.add_argument("--points", type=int, default=200_000, help="Points par série")
+    parser.add_argument("--chunk-size", type=int, default=1024, help="Points par chunk")
+    parser.add_argument("--repeat", type=int, default=10, help="Répétitions du décodage")
+    args = parser.parse_args()
+
+    print(f"{args.points:,} points par série, chunks de {args.chunk_size} points")
+    print(f"{'':<20}{'octets/point':^27}{'gain':^20}{'décodage Mpts/s':^24}{'ajout':>10}")
+    print(f"{'profil':<20}{'dicts':>10}{'numpy':>8}{'chunks':>9}{'/dicts':>11}{'/numpy':>9}"
+          f"{'dicts':>12}{'chunks':>12}{'Mpts/s':>10}")
+    for name, (timestamps_ns, values) in make_profiles(args.points).items():
+        bench_profile(name, timestamps_ns, values, args.chunk_size, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
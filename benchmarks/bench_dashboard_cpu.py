@@ -0,0 +1,96 @@
+"""
+Coût CPU serveur d'un onglet ouvert sur le tableau de bord des capteurs
+
+Exécute pages/1_Sensor_Dashboard.py avec AppTest (filtres par défaut) et simule des
+ticks de rafraîchissement espacés de --interval secondes. Le temps CPU du processus
+(time.process_time, tous les threads) est mesuré pour chaque tick, dans quatre scénarios :
+- reconstruction complète à chaque tick, comme l'ancienne boucle while True
+  (état de la session effacé avant chaque tick)
+- aucune donnée nouvelle
+- données modifiées hors du filtre (version du parc changée, lignes filtrées identiques)
+- données modifiées dans le filtre (reconstruction limitée par MIN_REDRAW_SECONDS)
+
+Chaque tick réexécute toute la page alors qu'en production seul le fragment est relancé :
+les chiffres majorent le coût réel. L'attente entre deux ticks ne consomme pas de CPU.
+
+Usage: python -m benchmarks.bench_dashboard_cpu [--ticks N] [--interval S]
+"""
+
+import argparse
+import datetime
+import logging
+import os
+import time
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+from utils.data_manager import get_sensors_data
+from utils.fleet_registry import get_fleet_registry
+
+PAGE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pages", "1_Sensor_Dashboard.py")
+
+
+def open_tab(language):
+    at = AppTest.from_file(PAGE, default_timeout=60)
+    at.session_state.language = language
+    at.session_state.last_update = datetime.datetime.now()
+    at.run()
+    assert not at.exception, [e.value for e in at.exception]
+    return at
+
+
+def measure(at, ticks, interval, before_tick):
+    """Temps CPU (ms) de chaque tick"""
+    times = []
+    for tick in range(ticks):
+        time.sleep(interval)
+        before_tick(tick)
+        start = time.process_time()
+        at.run()
+        times.append(time.process_time() - start)
+    assert not at.exception, [e.value for e in at.exception]
+    return np.array(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Coût CPU d'un onglet du tableau de bord des capteurs")
+    parser.add_argument("--ticks", type=int, default=8, help="Ticks mesurés par scénario")
+    parser.add_argument("--interval", type=float, default=2, help="Secondes entre deux ticks")
+    parser.add_argument("--language", default="fr", help="Code de langue")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    registry = get_fleet_registry()
+    sensors = get_sensors_data()
+    inside = sensors.loc[sensors['status'].isin(['active', 'error']), 'id'].iloc[0]
+    outside = sensors.loc[~sensors['status'].isin(['active', 'error']), 'id']
+    outside = outside.iloc[0] if not outside.empty else None
+
+    def full_rebuild(tick):
+        del at.session_state["dashboard_view"]
+
+    def change_outside(tick):
+        if outside is not None:
+            registry.update_sensor(outside, name=f"Capteur hors filtre {tick}")
+
+    def change_inside(tick):
+        registry.update_sensor(inside, name=f"Capteur filtré {tick}")
+
+    scenarios = [
+        ("reconstruction complète (ancienne boucle)", full_rebuild),
+        ("aucune donnée nouvelle", lambda tick: None),
+        ("changement hors filtre", change_outside),
+        ("changement dans le filtre", change_inside),
+    ]
+    print(f"{len(sensors)} capteurs, {args.ticks} ticks toutes les {args.interval:g} s par scénario")
+    print(f"{'scénario':<44}{'ms CPU / tick':>14}{'% d un cœur':>14}")
+    for name, before_tick in scenarios:
+        at = open_tab(args.language)
+        times = measure(at, args.ticks, args.interval, before_tick)
+        share = times.mean() / 1000 / args.interval * 100
+        print(f"{name:<44}{np.median(times):>14.2f}{share:>13.2f}%")
+
+
+if __name__ == "__main__":
+    main()
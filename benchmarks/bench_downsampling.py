@@ -0,0 +1,67 @@
+"""
+Benchmark du sous-échantillonnage visuel des graphiques
+
+Construit le graphique de create_time_series_chart pour une série de pouls à 1 Hz
+(un mois par défaut, avec quelques pics isolés) sans réduction, puis réduite par
+min/max et par LTTB à environ 2 points par pixel. Mesure le temps de réduction, le
+temps de construction et de sérialisation JSON de la figure (ce que Streamlit envoie
+au navigateur) et la taille du JSON, et vérifie que les pics sont conservés.
+
+Usage: python -m benchmarks.bench_downsampling [--days N] [--width PIXELS]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.downsampling import downsample_frame, target_points
+from utils.visualization import create_time_series_chart
+
+
+def make_series(days, seed=0):
+    """Pouls à 1 Hz : rythme circadien, bruit, et un pic isolé par jour"""
+    rng = np.random.default_rng(seed)
+    points = days * 86400
+    start = np.datetime64('2024-01-01T00:00:00', 'ns')
+    timestamps = start + np.arange(points) * np.timedelta64(1, 's')
+    values = 70 + 8 * np.sin(np.arange(points) * 2 * np.pi / 86400) + rng.normal(0, 2, points)
+    spikes = rng.choice(points, size=days, replace=False)
+    values[spikes] = 160
+    return pd.DataFrame({'timestamp': timestamps, 'value': values.round(1)}), spikes
+
+
+def bench(frame, spikes, method, max_points):
+    start = time.perf_counter()
+    reduced = frame if method is None else downsample_frame(frame, max_points, method)
+    reduce_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    # max_points au-delà de la taille : create_time_series_chart ne réduit plus rien
+    fig = create_time_series_chart(reduced, "Pouls", "pulse", max_points=len(reduced) + 1)
+    payload = fig.to_json()
+    figure_elapsed = time.perf_counter() - start
+
+    kept = np.isin(frame.index.to_numpy()[spikes], reduced.index.to_numpy()).mean()
+    return len(reduced), reduce_elapsed, figure_elapsed, len(payload), kept
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du sous-échantillonnage des graphiques")
+    parser.add_argument("--days", type=int, default=30, help="Jours de données à 1 Hz")
+    parser.add_argument("--width", type=int, default=1200, help="Largeur du graphique en pixels")
+    args = parser.parse_args()
+
+    frame, spikes = make_series(args.days)
+    max_points = target_points(args.width)
+    print(f"{len(frame):,} points, cible {max_points} points ({args.width} px)")
+    print(f"{'méthode':<10}{'points':>10}{'réduction ms':>14}{'figure+JSON ms':>16}{'JSON Mo':>10}{'pics gardés':>13}")
+    for method in (None, 'minmax', 'lttb'):
+        points, reduce_elapsed, figure_elapsed, size, kept = bench(frame, spikes, method, max_points)
+        print(f"{method or 'aucune':<10}{points:>10,}{reduce_elapsed * 1000:>14.1f}{figure_elapsed * 1000:>16.1f}"
+              f"{size / 1e6:>10.2f}{kept:>12.0%}")
+
+
+if __name__ == "__main__":
+    main()
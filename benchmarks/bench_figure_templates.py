@@ -0,0 +1,115 @@
+"""
+Benchmark des modèles de figures de utils.visualization
+
+Pour les trois graphiques en direct (jauge, distribution des statuts, série
+temporelle), mesure le temps par rafraîchissement :
+- de construction de la figure : ancienne construction complète avec validation de
+  chaque propriété (reproduite ci-dessous) contre modèle validé une fois dont on ne
+  remplace que les données
+- de sérialisation JSON de la figure obtenue (pio.to_json, comme st.plotly_chart)
+- de figure_json (forme envoyée par utils.live_charts)
+Vérifie aussi que les deux constructions produisent exactement la même figure.
+
+Usage: python -m benchmarks.bench_figure_templates [--points N] [--repeat R]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from utils.downsampling import downsample_frame
+from utils.live_charts import figure_json
+from utils.visualization import (STATUS_COLORS, create_gauge_chart, create_status_distribution_chart,
+                                 create_time_series_chart, get_figure_template)
+
+
+def reference_gauge(value, title, suffix="", min_value=0, max_value=100):
+    """Ancienne create_gauge_chart : figure construite et validée à chaque appel"""
+    threshold_low = min_value + (max_value - min_value) * 0.3
+    threshold_high = min_value + (max_value - min_value) * 0.7
+    color = "red" if value < threshold_low else "green" if value > threshold_high else "orange"
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number", value=value, domain={'x': [0, 1], 'y': [0, 1]}, title={'text': title},
+        gauge={
+            'axis': {'range': [min_value, max_value]}, 'bar': {'color': color},
+            'steps': [{'range': [min_value, threshold_low], 'color': "lightcoral"},
+                      {'range': [threshold_low, threshold_high], 'color': "lightyellow"},
+                      {'range': [threshold_high, max_value], 'color': "lightgreen"}],
+            'threshold': {'line': {'color': "black", 'width': 4}, 'thickness': 0.75, 'value': value}
+        },
+        number={'suffix': suffix}
+    ))
+    fig.update_layout(height=250, margin=dict(l=10, r=10, t=50, b=10), font=dict(size=12))
+    return fig
+
+
+def reference_status_distribution(status_counts):
+    """Ancienne create_status_distribution_chart"""
+    colors = [STATUS_COLORS.get(status, '#6c757d') for status in status_counts['status']]
+    fig = go.Figure(data=[go.Bar(x=status_counts['status'], y=status_counts['count'], marker_color=colors,
+                                 text=status_counts['count'], textposition='auto')])
+    fig.update_layout(title='Sensor Status Distribution', xaxis_title='Status', yaxis_title='Count', height=350,
+                      margin=dict(l=20, r=20, t=40, b=20))
+    return fig
+
+
+def reference_time_series(data, title, max_points=None):
+    """Ancienne create_time_series_chart (capteur de température)"""
+    data = downsample_frame(data, max_points)
+    fig = px.line(data, x='timestamp', y='value', title=title,
+                  labels={'timestamp': 'Time', 'value': 'Temperature (°C)'})
+    fig.update_traces(line=dict(color='#ff7f0e', width=2))
+    fig.update_layout(xaxis=dict(rangeslider=dict(visible=True), type='date'), height=400,
+                      margin=dict(l=20, r=20, t=40, b=20))
+    return fig
+
+
+def median_ms(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return np.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des modèles de figures")
+    parser.add_argument("--points", type=int, default=1000, help="Points de la série temporelle")
+    parser.add_argument("--repeat", type=int, default=30, help="Répétitions par mesure")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    history = pd.DataFrame({'timestamp': pd.date_range("2024-06-01", periods=args.points, freq="min"),
+                            'value': 36.5 + rng.normal(0, 0.3, args.points)})
+    status_counts = pd.DataFrame({'status': ['active', 'inactive', 'maintenance', 'error'], 'count': [12, 3, 2, 1]})
+    charts = [
+        ("jauge", lambda: reference_gauge(7.2, "Signal", "/10", 0, 10),
+         lambda: create_gauge_chart(7.2, "Signal", "/10", 0, 10)),
+        ("distribution des statuts", lambda: reference_status_distribution(status_counts),
+         lambda: create_status_distribution_chart(status_counts)),
+        (f"série temporelle ({args.points:,} pts)", lambda: reference_time_series(history, "Température", args.points),
+         lambda: create_time_series_chart(history, "Température", 'temperature', max_points=args.points)),
+    ]
+
+    start = time.perf_counter()
+    for kind, sensor_type in [('gauge', None), ('status_distribution', None), ('time_series', 'temperature')]:
+        get_figure_template(kind, sensor_type)
+    print(f"construction des modèles (une fois par processus) : {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    print(f"{'graphique':<30}{'construction ms':>18}{'modèle ms':>12}{'to_json ms':>12}{'figure_json ms':>16}")
+    for name, reference, templated in charts:
+        assert figure_json(reference()) == figure_json(templated()), name
+        figure = templated()
+        print(f"{name:<30}{median_ms(reference, args.repeat):>18.2f}{median_ms(templated, args.repeat):>12.2f}"
+              f"{median_ms(lambda: pio.to_json(figure, validate=False), args.repeat):>12.2f}"
+              f"{median_ms(lambda: figure_json(figure), args.repeat):>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
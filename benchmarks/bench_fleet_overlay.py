@@ -0,0 +1,109 @@
+"""
+Benchmark de la superposition des valeurs en direct sur la table des capteurs
+
+Flotte de N capteurs (10 000 par défaut) dont une partie reçoit des valeurs en direct.
+Compare, pour chaque nouvel instantané :
+- la boucle par capteur de l'ancien get_sensors_data (recherche dans l'instantané,
+  mise à jour de l'enregistrement, log de debug, puis construction du DataFrame)
+- la jointure vectorisée overlay_live (vue en colonnes de l'instantané + get_indexer)
+- l'appel en cache de FleetRegistry.live_frame (même version d'instantané)
+
+Usage: python -m benchmarks.bench_fleet_overlay [--sensors N] [--live-ratio R]
+"""
+
+import argparse
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.fleet_registry import FleetRegistry, overlay_live
+from utils.snapshot import EMPTY_SNAPSHOT, SnapshotStore
+
+
+def make_fleet(sensors, seed=0):
+    rng = np.random.default_rng(seed)
+    records = []
+    for i in range(sensors):
+        records.append({
+            'id': f"SEN-{10000 + i}", 'name': f"Capteur {i}", 'type': 'temperature',
+            'status': str(rng.choice(['active', 'inactive', 'maintenance', 'error'])),
+            'power_connection': True, 'signal_strength': int(rng.integers(1, 11)), 'firmware_version': 'v2.0',
+            'installation_date': '2024-01-01', 'last_maintenance': '2024-06-01',
+            'mattress_id': f"MAT-{100 + i // 10}" if rng.random() < 0.9 else None, 'is_mqtt_updated': False
+        })
+    return records
+
+
+def make_snapshot(records, ratio, seed=0):
+    rng = np.random.default_rng(seed)
+    store = SnapshotStore()
+    store.publish({record['id']: {'id': record['id'], 'value': float(rng.normal(36.5, 0.5)), 'unit': '°C',
+                                  'timestamp': '2024-06-01 12:00:00', 'mattress_id': record['mattress_id']}
+                   for record in records if rng.random() < ratio})
+    return store
+
+
+def loop_overlay(records, snapshot):
+    """Ancienne approche : une recherche et un log par capteur, puis un DataFrame ligne à ligne"""
+    rows = []
+    for record in records:
+        row = dict(record)
+        live_data = snapshot.get(row['id'])
+        if row['mattress_id'] and live_data and 'value' in live_data:
+            row['is_mqtt_updated'] = True
+            row['status'] = 'active'
+            row['signal_strength'] = max(row['signal_strength'], 8)
+            row['value'] = live_data['value']
+            logging.debug("Using live data for sensor %s on mattress %s", row['id'], row['mattress_id'])
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def median_ms(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return np.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la superposition des valeurs en direct")
+    parser.add_argument("--sensors", type=int, default=10_000, help="Nombre de capteurs")
+    parser.add_argument("--live-ratio", type=float, default=0.5, help="Part des capteurs avec une valeur en direct")
+    parser.add_argument("--repeat", type=int, default=20, help="Répétitions par mesure")
+    args = parser.parse_args()
+
+    records = make_fleet(args.sensors)
+    store = make_snapshot(records, args.live_ratio)
+    registry = FleetRegistry(sensors=records, mattresses=[])
+    fleet = registry.sensors_frame()
+
+    expected = loop_overlay(records, store.snapshot())
+    result = overlay_live(fleet, store.snapshot())
+    assert (expected['is_mqtt_updated'].to_numpy() == result['is_mqtt_updated'].to_numpy()).all()
+    assert (expected['status'].to_numpy() == result['status'].to_numpy()).all()
+    # Instantané vide (source arrêtée, broker sans trafic) : aucune valeur en direct
+    empty = overlay_live(fleet, EMPTY_SNAPSHOT)
+    assert empty['value'].isna().all() and not empty['is_mqtt_updated'].any()
+
+    def fresh_overlay():
+        # Nouvel instantané à chaque fois : la vue en colonnes est reconstruite
+        store.publish({records[0]['id']: {'value': 1.0}})
+        overlay_live(fleet, store.snapshot())
+
+    registry.live_frame(store.snapshot())
+    print(f"{args.sensors:,} capteurs, {args.live_ratio:.0%} avec une valeur en direct")
+    print(f"{'boucle par capteur':<42}{median_ms(lambda: loop_overlay(records, store.snapshot()), args.repeat):>10.2f} ms")
+    print(f"{'jointure vectorisée (nouvel instantané)':<42}{median_ms(fresh_overlay, args.repeat):>10.2f} ms")
+    snapshot = store.snapshot()
+    snapshot.frame()
+    print(f"{'jointure vectorisée (vue construite)':<42}{median_ms(lambda: overlay_live(fleet, snapshot), args.repeat):>10.2f} ms")
+    print(f"{'live_frame en cache':<42}{median_ms(lambda: registry.live_frame(snapshot), args.repeat):>10.4f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark de la file d'ingestion : coût du callback on_message sur le thread réseau
+et débit du worker de décodage par lots
+
+Usage: python -m benchmarks.bench_ingest_queue [-n MESSAGES] [--capacity N] [--batch N]
+"""
+
+import argparse
+import logging
+import time
+
+from benchmarks.bench_mqtt_routing import make_messages
+from utils.mqtt_integration import MQTTIntegration
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la file d'ingestion MQTT")
+    parser.add_argument("-n", "--messages", type=int, default=200_000, help="Nombre de messages")
+    parser.add_argument("--capacity", type=int, default=10_000, help="Taille de la file")
+    parser.add_argument("--batch", type=int, default=500, help="Taille maximale d'un lot")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    messages = make_messages(args.messages)
+
+    # Décodage en ligne : ce que coûtait chaque message au thread paho avant la file
+    inline = MQTTIntegration()
+    start = time.perf_counter()
+    for msg in messages:
+        inline._process_batch([(msg.topic, msg.payload, time.time())])
+    inline_elapsed = time.perf_counter() - start
+
+    integration = MQTTIntegration(queue_capacity=args.capacity, max_batch=args.batch)
+    integration.ingest_worker.start()
+
+    # Coût côté thread réseau : uniquement l'empilement
+    start = time.perf_counter()
+    for msg in messages:
+        integration.on_message(None, None, msg)
+    enqueue_elapsed = time.perf_counter() - start
+
+    # Attendre que le worker ait tout consommé
+    while len(integration.ingest_queue):
+        time.sleep(0.01)
+    integration.ingest_worker.stop()
+    total_elapsed = time.perf_counter() - start
+
+    stats = integration.get_ingest_stats()
+    count = len(messages)
+    print(f"décodage en ligne (avant)    {inline_elapsed * 1e6 / count:8.2f} µs/msg sur le thread réseau")
+    print(f"on_message avec file (après) {enqueue_elapsed * 1e6 / count:8.2f} µs/msg sur le thread réseau")
+    print(f"débit de bout en bout        {count / total_elapsed:12,.0f} msg/s")
+    print(f"lots: {stats['batches']}  taille moyenne: {stats['avg_batch_size']:.1f}  "
+          f"max: {stats['max_batch_size']}  perdus: {stats['dropped']}")
+
+
+if __name__ == "__main__":
+    main()
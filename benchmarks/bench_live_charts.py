@@ -0,0 +1,81 @@
+"""
+Volume envoyé au navigateur par rafraîchissement des graphiques en direct
+
+Pour chaque graphique du tableau de bord, compare la taille JSON de la figure
+complète (ce que st.plotly_chart renvoie à chaque rafraîchissement) à celle du
+delta calculé par utils.live_charts :
+- série temporelle de --points points qui avance de --new-points points par tick
+  (extendTraces, les points les plus anciens sortent de la fenêtre)
+- distribution des statuts dont une hauteur de barre change (restyle)
+- jauge dont la valeur change (restyle)
+
+Usage: python -m benchmarks.bench_live_charts [--points N] [--new-points K] [--ticks T]
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.live_charts import figure_delta, figure_json
+from utils.visualization import create_gauge_chart, create_status_distribution_chart, create_time_series_chart
+
+
+def payload_bytes(value):
+    return len(json.dumps(value).encode('utf-8'))
+
+
+def replay(name, figures):
+    """Taille moyenne par tick de la figure complète et du delta, et temps de calcul du delta"""
+    states = [figure_json(figure) for figure in figures]
+    full = [payload_bytes(state) for state in states[1:]]
+    deltas, elapsed, kinds = [], [], set()
+    for old, new in zip(states, states[1:]):
+        start = time.perf_counter()
+        operations = figure_delta(old, new)
+        elapsed.append(time.perf_counter() - start)
+        deltas.append(payload_bytes(operations if operations is not None else new))
+        if operations is None:
+            kinds.add('figure complète')
+        else:
+            kinds.update(operation[0] for operation in operations)
+    print(f"{name:<30}{np.mean(full):>14,.0f}{np.mean(deltas):>12,.0f}{np.mean(full) / np.mean(deltas):>8.0f}x"
+          f"{np.median(elapsed) * 1000:>10.2f}  {'+'.join(sorted(kinds))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Volume envoyé par rafraîchissement des graphiques en direct")
+    parser.add_argument("--points", type=int, default=2000, help="Points de la série temporelle")
+    parser.add_argument("--new-points", type=int, default=5, help="Nouveaux points par tick")
+    parser.add_argument("--ticks", type=int, default=20, help="Rafraîchissements simulés")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    total = args.points + args.new_points * args.ticks
+    history = pd.DataFrame({'timestamp': pd.date_range("2024-06-01", periods=total, freq="min"),
+                            'value': 36.5 + rng.normal(0, 0.3, total).cumsum() * 0.01})
+    series = [create_time_series_chart(history.iloc[tick * args.new_points:tick * args.new_points + args.points],
+                                       "Température", 'temperature', max_points=args.points)
+              for tick in range(args.ticks + 1)]
+
+    statuses = ['active', 'inactive', 'maintenance', 'error']
+    counts = rng.integers(0, 50, len(statuses))
+    bars = []
+    for tick in range(args.ticks + 1):
+        counts[tick % len(statuses)] += 1
+        bars.append(create_status_distribution_chart(pd.DataFrame({'status': statuses, 'count': counts.copy()})))
+
+    gauges = [create_gauge_chart(value=5 + tick % 5, title="Signal", suffix="/10", max_value=10)
+              for tick in range(args.ticks + 1)]
+
+    print(f"{args.ticks} ticks, série de {args.points:,} points (+{args.new_points} par tick)")
+    print(f"{'graphique':<30}{'figure (o)':>14}{'delta (o)':>12}{'gain':>9}{'delta ms':>10}  opérations")
+    replay("série temporelle", series)
+    replay("distribution des statuts", bars)
+    replay("jauge", gauges)
+
+
+if __name__ == "__main__":
+    main()
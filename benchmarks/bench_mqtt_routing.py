@@ -0,0 +1,135 @@
+"""
+Benchmark du callback MQTTIntegration.on_message : routage recalculé à chaque message
+(ancienne implémentation) contre la table de routage précompilée
+
+Usage: python -m benchmarks.bench_mqtt_routing [-n MESSAGES]
+"""
+
+import argparse
+import json
+import logging
+import random
+import time
+from types import SimpleNamespace
+from datetime import datetime
+
+from utils.mqtt_integration import MQTTIntegration
+
+TOPICS = [
+    "capteur/temperature",
+    "capteur/humidite",
+    "capteur/debit_urinaire",
+    "capteur/poul",
+    "capteur/creatine"
+]
+UIDS = ["1234567890abcdef", "abcdef1234567890", "0abcdef123456789", "def0123456789abc", "789abcdef012345"]
+
+
+def make_messages(count):
+    """Prépare des messages au format publié par mqtt_live_test.py"""
+    messages = []
+    for _ in range(count):
+        payload = {
+            "uid": random.choice(UIDS),
+            "value": round(random.uniform(20.0, 40.0), 2),
+            "timestamp": time.time()
+        }
+        messages.append(SimpleNamespace(topic=random.choice(TOPICS), payload=json.dumps(payload).encode()))
+    return messages
+
+
+def legacy_on_message(latest_data, msg):
+    """Reproduction du callback d'origine : toutes les tables sont reconstruites par message"""
+    topic_type_map = {
+        "capteur/temperature": "temperature",
+        "capteur/humidite": "humidity",
+        "capteur/debit_urinaire": "debit",
+        "capteur/poul": "poul",
+        "capteur/creatine": "creatine"
+    }
+    if msg.topic not in topic_type_map:
+        return
+    sensor_type = topic_type_map[msg.topic]
+    sensor_type_map = {
+        "temperature": "temperature",
+        "humidity": "humidity",
+        "debit": "flow",
+        "poul": "pulse",
+        "creatine": "creatinine"
+    }
+
+    def get_sensor_id(sensor_type, mattress_id):
+        base_ids = {"temperature": 202, "humidity": 203, "debit": 204, "poul": 205, "creatine": 206}
+        try:
+            return base_ids[sensor_type] + (int(mattress_id.split('-')[1]) - 101) * 10
+        except (ValueError, KeyError, IndexError):
+            return None
+
+    payload = json.loads(msg.payload.decode())
+    value = payload.get("value")
+    uid = payload.get("uid", "1234567890abcdef")
+    timestamp = datetime.fromtimestamp(payload.get("timestamp", time.time())).strftime("%Y-%m-%d %H:%M:%S")
+    mattress_map = {
+        "1234567890abcdef": "MAT-101",
+        "abcdef1234567890": "MAT-102",
+        "0abcdef123456789": "MAT-103",
+        "def0123456789abc": "MAT-104",
+        "789abcdef012345": "MAT-105"
+    }
+    mattress_id = mattress_map.get(uid, "MAT-101")
+    sensor_id = get_sensor_id(sensor_type, mattress_id)
+    units = {"temperature": "°C", "humidity": "%", "debit": "L/h", "poul": "bpm", "creatine": "mg/dL"}
+    current_data = {
+        'id': sensor_id,
+        'name': f"Capteur {sensor_type.capitalize()}",
+        'type': sensor_type_map.get(sensor_type, sensor_type),
+        'value': value,
+        'unit': units.get(sensor_type, ""),
+        'timestamp': timestamp,
+        'topic': msg.topic,
+        'mattress_id': mattress_id,
+        'status': "active"
+    }
+    if sensor_id not in latest_data:
+        latest_data[sensor_id] = {'current': current_data, 'history': [current_data]}
+    else:
+        latest_data[sensor_id]['current'] = current_data
+        history = latest_data[sensor_id]['history']
+        history.append(current_data)
+        if len(history) > 20:
+            latest_data[sensor_id]['history'] = history[-20:]
+
+
+def run(label, handler, messages):
+    """Exécute le handler sur tous les messages et affiche le débit"""
+    start = time.perf_counter()
+    for msg in messages:
+        handler(msg)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {len(messages) / elapsed:>12,.0f} msg/s  ({elapsed * 1e6 / len(messages):.2f} µs/msg)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du routage des messages MQTT")
+    parser.add_argument("-n", "--messages", type=int, default=200_000, help="Nombre de messages")
+    args = parser.parse_args()
+
+    # Le logging par message fausserait la mesure dans les deux cas
+    logging.disable(logging.WARNING)
+    messages = make_messages(args.messages)
+
+    legacy_store = {}
+    before = run("avant (tables par message)", lambda msg: legacy_on_message(legacy_store, msg), messages)
+
+    # Chemin de décodage/routage complet, un message par lot pour rester comparable
+    integration = MQTTIntegration()
+    after = run("après (table précompilée)",
+                lambda msg: integration._process_batch([(msg.topic, msg.payload, time.time())]),
+                messages)
+
+    print(f"accélération: x{before / after:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark des décodeurs de payloads : débit de décodage et taille par message pour chaque format
+(json standard, orjson, msgspec typé, CBOR, MessagePack, trames struct), puis débit du
+chemin d'ingestion complet de MQTTIntegration avec le registre par défaut
+
+Usage: python -m benchmarks.bench_payload_decoders [-n MESSAGES]
+"""
+
+import argparse
+import json
+import logging
+import random
+import time
+
+from benchmarks.bench_mqtt_routing import TOPICS, UIDS
+from utils.mqtt_integration import MQTTIntegration
+from utils.payload_decoders import (
+    JsonDecoder, CborDecoder, MsgpackDecoder, StructFrameDecoder, encode_frame,
+    TYPE_CODE_BY_TOPIC, FRAME_TOPIC, CBOR_TOPIC, MSGPACK_TOPIC,
+    msgspec, orjson, cbor2, msgpack
+)
+
+
+def make_readings(count):
+    """Lectures aléatoires (topic, uid, valeur, timestamp)"""
+    return [
+        (random.choice(TOPICS), random.choice(UIDS), round(random.uniform(20.0, 40.0), 2), time.time())
+        for _ in range(count)
+    ]
+
+
+def encode_all(readings):
+    """
+    Encode les mêmes lectures dans chaque format disponible
+
+    Returns:
+    - Dictionnaire nom du format -> (décodeur, liste de (topic, payload))
+    """
+    json_messages = [(topic, json.dumps({"uid": uid, "value": value, "timestamp": ts}).encode())
+                     for topic, uid, value, ts in readings]
+    formats = {'json': (JsonDecoder("json"), json_messages)}
+    if orjson is not None:
+        formats['orjson'] = (JsonDecoder("orjson"), json_messages)
+    if msgspec is not None:
+        formats['msgspec'] = (JsonDecoder("msgspec"), json_messages)
+
+    def compact(topic, uid, value, ts):
+        return {"uid": uid, "type": TYPE_CODE_BY_TOPIC[topic], "value": value, "timestamp": ts}
+
+    if cbor2 is not None:
+        formats['cbor'] = (CborDecoder(), [(CBOR_TOPIC, cbor2.dumps(compact(*r))) for r in readings])
+    if msgpack is not None:
+        formats['msgpack'] = (MsgpackDecoder(), [(MSGPACK_TOPIC, msgpack.packb(compact(*r))) for r in readings])
+    formats['struct'] = (StructFrameDecoder(), [(FRAME_TOPIC, encode_frame(uid, topic, value, ts))
+                                               for topic, uid, value, ts in readings])
+    return formats
+
+
+def bench_decoder(decoder, messages):
+    """Temps de décodage seul (lectures produites, sans routage)"""
+    start = time.perf_counter()
+    for topic, payload in messages:
+        decoder.decode(topic, payload)
+    return time.perf_counter() - start
+
+
+def bench_ingest(messages):
+    """Temps du chemin d'ingestion complet (décodage, routage, mise à jour de l'historique)"""
+    integration = MQTTIntegration()
+    now = time.time()
+    batch = [(topic, payload, now) for topic, payload in messages]
+    start = time.perf_counter()
+    for i in range(0, len(batch), 500):
+        integration._process_batch(batch[i:i + 500])
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des décodeurs de payloads MQTT")
+    parser.add_argument("-n", "--messages", type=int, default=200_000, help="Nombre de messages")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    readings = make_readings(args.messages)
+    formats = encode_all(readings)
+
+    print(f"{args.messages} messages")
+    print(f"{'format':<10}{'octets/msg':>12}{'décodage msg/s':>18}{'ingestion msg/s':>18}")
+    # Le chemin d'ingestion JSON utilise le backend le plus rapide disponible : mesuré une seule fois
+    json_backend = JsonDecoder().backend
+    baseline = None
+    for name, (decoder, messages) in formats.items():
+        size = sum(len(payload) for _, payload in messages) / len(messages)
+        decode_rate = len(messages) / bench_decoder(decoder, messages)
+        if name in ('json', 'orjson', 'msgspec') and name != json_backend:
+            ingest = f"{'-':>18}"
+        else:
+            ingest = f"{len(messages) / bench_ingest(messages):>18,.0f}"
+        baseline = baseline or decode_rate
+        print(f"{name:<10}{size:>12.1f}{decode_rate:>18,.0f}{ingest}  (x{decode_rate / baseline:.2f})")
+    missing = [lib for lib, module in (('orjson', orjson), ('msgspec', msgspec), ('cbor2', cbor2), ('msgpack', msgpack))
+               if module is None]
+    if missing:
+        print(f"Bibliothèques absentes (formats non mesurés): {', '.join(missing)}")
+
+
+if __name__ == "__main__":
+    main()
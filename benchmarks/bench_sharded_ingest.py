@@ -0,0 +1,113 @@
+"""
+Benchmark de l'ingestion multi-processus avec un broker simulé
+Chaque worker reçoit sa part de messages préencodés (comme le lui livrerait mosquitto)
+et exécute le même chemin décodage -> routage -> table partagée que les workers réels.
+Le débit agrégé est mesuré pour 1, 2, 4, ... processus.
+
+Usage: python -m benchmarks.bench_sharded_ingest [--mattresses 500] [-n MESSAGES] [--max-workers N]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import time
+
+from utils.sharded_ingest import (SharedLatestTable, ShardWriter, SHARD_BY_TOPIC,
+                                  SHARD_SHARED_SUBSCRIPTION, LOCK_STRIPES, shard_topics)
+from utils.topic_router import TopicRouter, DEFAULT_TOPIC_TYPE_MAP
+
+
+def build_router(mattresses):
+    """Routeur pour une flotte de N matelas (un UID par matelas)"""
+    mattress_map = {f"{i:016x}": f"MAT-{101 + i}" for i in range(mattresses)}
+    return TopicRouter(mattress_map=mattress_map)
+
+
+def make_payloads(router, count):
+    """Messages (topic, payload) répartis uniformément sur toute la flotte"""
+    uids = list(router.mattress_map)
+    topics = list(DEFAULT_TOPIC_TYPE_MAP)
+    now = time.time()
+    return [
+        (random.choice(topics), json.dumps({
+            "uid": random.choice(uids),
+            "value": round(random.uniform(20.0, 40.0), 2),
+            "timestamp": now
+        }).encode())
+        for _ in range(count)
+    ]
+
+
+def _bench_worker(table_name, sensor_ids, router_config, messages, locks, barrier, results, index):
+    """Worker du benchmark : consomme sa part de messages aussi vite que possible"""
+    table = SharedLatestTable(sensor_ids, name=table_name, create=False)
+    writer = ShardWriter(table, TopicRouter(**router_config), locks)
+    barrier.wait()
+    start = time.perf_counter()
+    for topic, payload in messages:
+        writer.handle(topic, payload, 0.0)
+    results[index] = time.perf_counter() - start
+    table.close()
+
+
+def run(router, payloads, workers, shard_mode):
+    """Exécute un scénario et retourne le débit agrégé (messages/s)"""
+    ctx = multiprocessing.get_context("spawn")
+    routes = list(router.routes.values()) + list(router.default_routes.values())
+    table = SharedLatestTable(sorted({route.sensor_id for route in routes}))
+
+    if shard_mode == SHARD_BY_TOPIC:
+        # Le broker ne livre à chaque worker que les topics de sa partition
+        shards = shard_topics(DEFAULT_TOPIC_TYPE_MAP, workers)
+        parts = [[m for m in payloads if m[0] in set(shard)] for shard in shards]
+    else:
+        # Abonnement partagé : distribution en tourniquet
+        parts = [payloads[i::workers] for i in range(workers)]
+    # Comme ShardedIngestion : verrous par bande dès qu'il y a plusieurs workers, quel que soit le mode
+    locks = [ctx.Lock() for _ in range(LOCK_STRIPES)] if len(parts) > 1 else None
+
+    barrier = ctx.Barrier(len(parts) + 1)
+    results = ctx.Array('d', len(parts), lock=False)
+    processes = [
+        ctx.Process(target=_bench_worker,
+                    args=(table.name, table.sensor_ids, router.config(), part, locks, barrier, results, i))
+        for i, part in enumerate(parts)
+    ]
+    for process in processes:
+        process.start()
+    barrier.wait()
+    for process in processes:
+        process.join()
+
+    elapsed = max(results)
+    written = table.total_writes()
+    table.close()
+    return written / elapsed if elapsed else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de l'ingestion multi-processus")
+    parser.add_argument("--mattresses", type=int, default=500, help="Nombre de matelas simulés")
+    parser.add_argument("-n", "--messages", type=int, default=400_000, help="Nombre de messages")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1, help="Nombre maximal de workers")
+    args = parser.parse_args()
+
+    router = build_router(args.mattresses)
+    payloads = make_payloads(router, args.messages)
+    print(f"{args.mattresses} matelas x {len(DEFAULT_TOPIC_TYPE_MAP)} capteurs, {len(payloads):,} messages, "
+          f"{os.cpu_count()} coeur(s)")
+    if (os.cpu_count() or 1) < 2:
+        print("attention: un seul coeur disponible, le passage à l'échelle ne peut pas être observé")
+
+    workers = 1
+    while workers <= args.max_workers:
+        for shard_mode in (SHARD_BY_TOPIC, SHARD_SHARED_SUBSCRIPTION):
+            rate = run(router, payloads, workers, shard_mode)
+            print(f"workers={workers:<3} mode={shard_mode:<7} {rate:>12,.0f} msg/s")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
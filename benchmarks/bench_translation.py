@@ -0,0 +1,77 @@
+"""
+Micro-benchmark des traductions
+
+Rejoue les appels tr("...") d'une exécution de chaque page (clés relevées dans le
+source de app.py et des pages) avec :
+- l'ancienne get_translation, qui reconstruisait tout le dictionnaire imbriqué à chaque appel
+  (reproduite en compilant le même littéral dans le corps d'une fonction)
+- la nouvelle get_translation (catalogues plats compilés une fois)
+- la fonction liée de bind(language), utilisée par les pages
+
+Usage: python -m benchmarks.bench_translation [--language fr] [--repeat N]
+"""
+
+import argparse
+import glob
+import re
+import time
+
+import numpy as np
+
+from utils.translation import TRANSLATIONS, bind, get_translation
+
+OLD_FUNCTION = """
+def old_get_translation(key, language='en'):
+    translations = {literal}
+    if key in translations:
+        if language in translations[key]:
+            return translations[key][language]
+    return key
+"""
+
+
+def page_keys():
+    """Clés traduites par page, dans l'ordre du source"""
+    pages = {}
+    for path in ['app.py'] + sorted(glob.glob('pages/*.py')):
+        with open(path, encoding='utf-8') as f:
+            keys = re.findall(r"""\btr\(\s*["'](\w+)["']\s*\)""", f.read())
+        if keys:
+            pages[path] = keys
+    return pages
+
+
+def median_us(function, keys, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for key in keys:
+            function(key)
+        times.append(time.perf_counter() - start)
+    return np.median(times) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark des traductions")
+    parser.add_argument("--language", default="fr", help="Code de langue")
+    parser.add_argument("--repeat", type=int, default=50, help="Répétitions par mesure")
+    args = parser.parse_args()
+
+    namespace = {}
+    exec(OLD_FUNCTION.format(literal=repr(TRANSLATIONS)), namespace)
+    old_get_translation = namespace['old_get_translation']
+    tr = bind(args.language)
+
+    pages = page_keys()
+    print(f"{len(TRANSLATIONS)} clés, langue '{args.language}'")
+    print(f"{'page':<32}{'appels':>8}{'ancienne µs':>14}{'get_translation µs':>20}{'bind µs':>10}")
+    for path, keys in pages.items():
+        assert all(old_get_translation(key, args.language) == tr(key) for key in keys)
+        old = median_us(lambda key: old_get_translation(key, args.language), keys, args.repeat)
+        new = median_us(lambda key: get_translation(key, args.language), keys, args.repeat)
+        bound = median_us(tr, keys, args.repeat)
+        print(f"{path:<32}{len(keys):>8}{old:>14.0f}{new:>20.1f}{bound:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark du démarrage à chaud
+
+Prépare l'état d'une instance en fonctionnement (S capteurs, tampons circulaires pleins),
+l'écrit dans un instantané, puis mesure pour une nouvelle instance le temps entre le
+démarrage et des tableaux de bord complets (dernières valeurs + historique de chaque capteur) :
+- démarrage à froid : aucune donnée avant le prochain message MQTT
+- démarrage à chaud : projection mmap de l'instantané et amorçage de la source
+- référence : reconstruction des tampons en relisant la dernière heure dans l'historique SQLite
+
+Usage: python -m benchmarks.bench_warm_start [--sensors S] [--points P] [--no-store]
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from utils.history_store import HistoryStore
+from utils.ingestion_service import IngestionService
+from utils.mqtt_integration import MQTTIntegration
+from utils.warm_start import load_warm_snapshot, write_warm_snapshot
+
+
+def make_state(sensors, points):
+    """Dernières valeurs et historiques d'une instance en fonctionnement"""
+    rng = np.random.default_rng(0)
+    end_ns = time.time_ns()
+    timestamps = end_ns - (points - np.arange(points, dtype=np.int64)) * 1_000_000_000
+    latest = {}
+    history = {}
+    for i in range(sensors):
+        sensor_id = f"SEN-{1000 + i}"
+        values = rng.normal(36.5, 0.5, points).round(2)
+        history[sensor_id] = (timestamps, values)
+        latest[sensor_id] = {
+            'id': sensor_id, 'name': f"Capteur {sensor_id}", 'type': 'temperature', 'value': float(values[-1]),
+            'unit': '°C', 'timestamp': time.strftime("%Y-%m-%d %H:%M:%S"),
+            'topic': 'capteur/temperature', 'mattress_id': 'MAT-101', 'status': 'active'
+        }
+    return latest, history
+
+
+def dashboard_ready(integration, sensor_ids):
+    """Ce que lisent les pages : une dernière valeur et un historique pour chaque capteur"""
+    snapshot = integration.get_snapshot()
+    return all(sensor_id in snapshot and len(integration.history.get(sensor_id) or ()) for sensor_id in sensor_ids)
+
+
+def warm_boot(path, capacity, sensor_ids):
+    start = time.perf_counter()
+    state = load_warm_snapshot(path)
+    loaded = time.perf_counter() - start
+    service = IngestionService(warm_state=state)
+    integration = MQTTIntegration(history_capacity=capacity)
+    service._seed(integration)
+    ready = dashboard_ready(integration, sensor_ids)
+    return loaded, time.perf_counter() - start, ready
+
+
+def store_boot(store, capacity, sensor_ids, window_ns):
+    start = time.perf_counter()
+    integration = MQTTIntegration(history_capacity=capacity)
+    start_ns = time.time_ns() - window_ns
+    for sensor_id in sensor_ids:
+        timestamps_ns, values = store.query(sensor_id, start_ns=start_ns)
+        integration.history.extend(sensor_id, timestamps_ns, values)
+    # Les dernières valeurs n'ont pas d'équivalent dans le store : l'instantané reste vide
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du démarrage à chaud")
+    parser.add_argument("--sensors", type=int, default=200, help="Nombre de capteurs")
+    parser.add_argument("--points", type=int, default=3600, help="Points par tampon circulaire")
+    parser.add_argument("--no-store", action="store_true", help="Ne pas mesurer la reconstruction depuis SQLite")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    directory = tempfile.mkdtemp(prefix="medimat-bench-")
+    path = os.path.join(directory, "warm_start.bin")
+    latest, history = make_state(args.sensors, args.points)
+    sensor_ids = list(latest)
+
+    start = time.perf_counter()
+    size = write_warm_snapshot(path, latest, history)
+    print(f"instantané: {args.sensors} capteurs x {args.points} points, {size / 1e6:.1f} Mo "
+          f"écrits en {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    cold = MQTTIntegration(history_capacity=args.points)
+    cold_ready = dashboard_ready(cold, sensor_ids)
+    print(f"{'à froid':<28}{(time.perf_counter() - start) * 1000:>10.1f} ms  tableaux de bord complets: {cold_ready}")
+
+    loads, boots = [], []
+    for _ in range(5):
+        loaded, booted, ready = warm_boot(path, args.points, sensor_ids)
+        loads.append(loaded)
+        boots.append(booted)
+    print(f"{'à chaud: projection mmap':<28}{np.median(loads) * 1000:>10.1f} ms")
+    print(f"{'à chaud: tableaux complets':<28}{np.median(boots) * 1000:>10.1f} ms  tableaux de bord complets: {ready}")
+
+    if not args.no_store:
+        store = HistoryStore(os.path.join(directory, "history.db"), commit_rows=50_000)
+        for sensor_id, (timestamps_ns, values) in history.items():
+            store.append_many(list(zip([sensor_id] * len(values), timestamps_ns.tolist(), values.tolist())))
+        store.flush(timeout=600)
+        elapsed = store_boot(store, args.points, sensor_ids, args.points * 1_000_000_000)
+        print(f"{'référence: relecture SQLite':<28}{elapsed * 1000:>10.1f} ms  (historiques seulement)")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
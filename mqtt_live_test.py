@@ -4,6 +4,8 @@ import random
 import time
 import json
 import logging
+import argparse
+from utils.payload_decoders import make_batch, encode_batch_frame, BATCH_TOPIC, BATCH_FRAME_TOPIC
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -49,7 +51,32 @@ def on_connect(client, userdata, flags, rc, properties=None):
     else:
         logging.error(f"Échec de connexion au broker MQTT, code de retour: {rc}")
 
+def publish_batch(client, uid, batch_format):
+    """Publie toutes les lectures d'un ESP32 en un seul message (lot JSON ou trame binaire)"""
+    now = time.time()
+    readings = []
+    for sensor_type, topic in topics.items():
+        value = generate_data(sensor_type)
+        if value is not None:
+            readings.append((topic, value, now))
+
+    if batch_format == "frame":
+        topic, payload = BATCH_FRAME_TOPIC, encode_batch_frame(uid, readings)
+    else:
+        topic, payload = BATCH_TOPIC, json.dumps(make_batch(uid, readings, timestamp=now))
+
+    result = client.publish(topic, payload, qos=0)
+    if result.rc == mqtt.MQTT_ERR_SUCCESS:
+        logging.info(f"Lot publié sur {topic}: {len(readings)} lectures, {len(payload)} octets")
+    else:
+        logging.error(f"Échec de publication sur {topic}")
+
 def main():
+    parser = argparse.ArgumentParser(description="Publication de mesures de test sur le broker MQTT")
+    parser.add_argument("--batch", choices=["json", "frame"], default=None,
+                        help="Un message par ESP32 et par cycle (lot JSON ou trame binaire) au lieu d'un message par mesure")
+    args = parser.parse_args()
+
     # Configuration du client avec ID unique
     client_id = f"sensor_publisher_{int(time.time())}"
     client = mqtt.Client(client_id=client_id)
@@ -70,6 +97,9 @@ def main():
 
         while True:
             for esp32_id, uid in esp32_uuids.items():
+                if args.batch:
+                    publish_batch(client, uid, args.batch)
+                    continue
                 for sensor_type, topic in topics.items():
                     value = generate_data(sensor_type)
                     if value is not None:
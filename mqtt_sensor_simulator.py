@@ -143,8 +143,22 @@ def create_sensor_payload(sensor_id, value):
         "timestamp": datetime.now().isoformat()
     }
 
-def simulate_sensors(client):
-    """Simule les capteurs et publie les données"""
+def create_batch_payload(payloads):
+    """Regroupe les mesures d'un cycle en un seul message pour le matelas"""
+    return {
+        "mattress_id": mattress_id,
+        "timestamp": datetime.now().isoformat(),
+        "readings": payloads
+    }
+
+def simulate_sensors(client, batch=False):
+    """
+    Simule les capteurs et publie les données
+
+    Parameters:
+    - client: Client MQTT connecté
+    - batch: Si True, les mesures d'un cycle sont publiées en un seul message sur hospital/mattress/<id>/batch
+    """
     logger.info(f"Démarrage de la simulation pour {len(sensor_types)} capteurs sur le matelas {mattress_id}")
     
     last_update = {sensor_id: 0 for sensor_id in sensor_types}
@@ -152,6 +166,7 @@ def simulate_sensors(client):
     try:
         while running:
             current_time = time.time()
+            pending = []
             
             for sensor_id, sensor_config in sensor_types.items():
                 # Vérifier si c'est le moment de mettre à jour ce capteur
@@ -159,6 +174,10 @@ def simulate_sensors(client):
                     # Générer et publier une nouvelle valeur
                     value = generate_sensor_value(sensor_id)
                     payload = create_sensor_payload(sensor_id, value)
+                    last_update[sensor_id] = current_time
+                    if batch:
+                        pending.append(payload)
+                        continue
                     
                     # Construire le topic MQTT
                     topic = f"hospital/mattress/{mattress_id}/{sensor_id}"
@@ -166,9 +185,12 @@ def simulate_sensors(client):
                     # Publier le message
                     client.publish(topic, json.dumps(payload), qos=0)
                     logger.info(f"Publié: {topic} = {payload['value']} {payload['unit']}")
-                    
-                    # Mettre à jour le timestamp
-                    last_update[sensor_id] = current_time
+            
+            # Un seul message pour toutes les mesures du cycle
+            if pending:
+                topic = f"hospital/mattress/{mattress_id}/batch"
+                client.publish(topic, json.dumps(create_batch_payload(pending)), qos=0)
+                logger.info(f"Publié: {topic} = {len(pending)} mesures")
             
             # Attendre un peu pour ne pas surcharger le système
             time.sleep(1)
@@ -188,6 +210,8 @@ def main():
                         help="Adresse du broker MQTT (défaut: 127.0.0.1)")
     parser.add_argument("--port", type=int, default=1883, 
                         help="Port du broker MQTT (défaut: 1883)")
+    parser.add_argument("--batch", action="store_true",
+                        help="Publier les mesures de chaque cycle en un seul message par matelas")
     args = parser.parse_args()
     
     # Utiliser les arguments de ligne de commande
@@ -210,7 +234,7 @@ def main():
         client.loop_start()
         
         # Simuler les capteurs
-        simulate_sensors(client)
+        simulate_sensors(client, batch=args.batch)
         
     except KeyboardInterrupt:
         logger.info("Interruption par l'utilisateur")
@@ -4,9 +4,11 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import time
+import numpy as np
 from utils.sensor_utils import get_sensor_status_color
 from utils.visualization import create_status_distribution_chart
-from utils.translation import get_translation
+from utils.live_charts import figure_json, live_chart
+from utils.translation import bind
 from utils.data_manager import get_sensors_data, get_sensor_types
 
 # Page configuration
@@ -17,144 +19,114 @@ st.set_page_config(
 )
 
 # Header
-tr = lambda key: get_translation(key, st.session_state.language)
+tr = bind(st.session_state.language)
 st.title(tr("sensor_dashboard_title"))
 st.markdown(tr("sensor_dashboard_description"))
 
-# Création d'un conteneur pour les données qui seront mises à jour automatiquement
-live_data_container = st.empty()
+# Le contenu en direct est un fragment relancé toutes les refresh_interval secondes (voir plus bas) :
+# la page elle-même n'est réexécutée que par les actions de l'utilisateur, et chaque relance du
+# fragment ne reconstruit le contenu que si l'ensemble filtré des capteurs a changé.
+# Délai minimal entre deux reconstructions dues aux données, quel que soit l'intervalle choisi
+MIN_REDRAW_SECONDS = 2
 
-# Fonction pour mettre à jour l'affichage
-def update_dashboard():
-    # Get sensors data
+def build_view(filtered_sensors):
+    """Métriques, graphiques et table des capteurs filtrés"""
+    view = {'total': len(filtered_sensors),
+            'active': int((filtered_sensors['status'] == 'active').sum()),
+            'error': int((filtered_sensors['status'] == 'error').sum()),
+            'built_at': datetime.now()}
+    if filtered_sensors.empty:
+        return view
+
+    # Status distribution chart
+    status_counts = filtered_sensors['status'].value_counts().reset_index()
+    status_counts.columns = ['status', 'count']
+    view['status_chart'] = figure_json(create_status_distribution_chart(status_counts, language=st.session_state.language))
+
+    # Sensor types pie chart
+    type_counts = filtered_sensors['type'].value_counts().reset_index()
+    type_counts.columns = ['type', 'count']
+
+    fig = px.pie(
+        type_counts, 
+        values='count', 
+        names='type',
+        title=tr("sensor_types_distribution"),
+        color_discrete_sequence=px.colors.qualitative.Pastel
+    )
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    fig.update_layout(margin=dict(l=20, r=20, t=30, b=20))
+    view['pie_chart'] = figure_json(fig)
+
+    # Create a horizontal bar chart for signal strength by sensor type
+    avg_signal = filtered_sensors.groupby('type')['signal_strength'].mean().reset_index()
+
+    fig = px.bar(
+        avg_signal,
+        x='signal_strength',
+        y='type',
+        orientation='h',
+        labels={
+            'signal_strength': tr('avg_signal_strength'),
+            'type': tr('sensor_type')
+        },
+        title=tr('avg_signal_by_type'),
+        color='signal_strength',
+        color_continuous_scale='blues',
+        range_color=[0, 10]
+    )
+    fig.update_layout(margin=dict(l=20, r=20, t=30, b=20))
+    view['signal_chart'] = figure_json(fig)
+
+    # Add colored status indicator to the dataframe
+    def format_status(status):
+        color = get_sensor_status_color(status)
+        return f'<span style="color:{color};font-weight:bold;">{status.upper()}</span>'
+
+    # Format the dataframe for display
+    display_df = filtered_sensors.copy()
+    display_df['formatted_status'] = display_df['status'].apply(format_status)
+
+    # Display as HTML to show colored status
+    view['table_html'] = display_df.to_html(
+        escape=False, 
+        index=False,
+        columns=['id', 'name', 'type', 'formatted_status', 'signal_strength', 'last_maintenance'],
+        col_space=100
+    )
+    view['csv'] = filtered_sensors.to_csv(index=False).encode('utf-8')
+    return view
+
+def dashboard_view(selected_types, selected_statuses):
+    """
+    Contenu du tableau de bord pour les filtres donnés, conservé par session
+
+    Reconstruit seulement quand les filtres changent, ou quand les versions du parc et des
+    valeurs en direct ont bougé ET que les lignes filtrées ont réellement changé (empreinte
+    des lignes) ; dans ce dernier cas au plus une fois toutes les MIN_REDRAW_SECONDS.
+    """
     sensors_data = get_sensors_data()
-    sensor_types = get_sensor_types()
-    
+    filters = (tuple(selected_types), tuple(selected_statuses), st.session_state.language)
+    version = (sensors_data.attrs.get('fleet_version'), sensors_data.attrs.get('snapshot_version'))
+    state = st.session_state.get("dashboard_view")
+    if state is not None and state['filters'] == filters:
+        if state['version'] == version or time.monotonic() - state['checked_at'] < MIN_REDRAW_SECONDS:
+            return state['view']
+
     # Apply filters
     filtered_sensors = sensors_data[
         (sensors_data['type'].isin(selected_types)) &
         (sensors_data['status'].isin(selected_statuses))
     ]
-    
-    # Container pour contenu principal
-    with live_data_container.container():
-        # Update last update time
-        st.session_state.last_update = datetime.now()
-        
-        # Main dashboard content in two columns
-        left_col, right_col = st.columns([2, 1])
-        
-        with left_col:
-            st.subheader(tr("sensor_overview"))
-            
-            # Show key metrics
-            total_sensors = len(filtered_sensors)
-            active_sensors = filtered_sensors[filtered_sensors['status'] == 'active'].shape[0]
-            error_sensors = filtered_sensors[filtered_sensors['status'] == 'error'].shape[0]
-            
-            col1, col2, col3 = st.columns(3)
-            col1.metric(tr("total_filtered_sensors"), total_sensors)
-            col2.metric(tr("active_sensors"), active_sensors, f"{round(active_sensors/total_sensors*100)}%" if total_sensors > 0 else "N/A")
-            col3.metric(tr("error_sensors"), error_sensors, help=tr("sensors_in_error_state"))
-            
-            # Status distribution chart
-            if not filtered_sensors.empty:
-                status_counts = filtered_sensors['status'].value_counts().reset_index()
-                status_counts.columns = ['status', 'count']
-                
-                fig = create_status_distribution_chart(status_counts)
-                st.plotly_chart(fig, use_container_width=True, key=f"status_chart_{datetime.now().timestamp()}")
-            else:
-                st.warning(tr("no_sensors_match_criteria"))
-            
-            # Power status (devices are plugged in)
-            if not filtered_sensors.empty:
-                st.subheader(tr("power_status"))
-                st.success(tr("power_status_ok"))
-        
-        with right_col:
-            st.subheader(tr("sensor_types_distribution"))
-            
-            # Sensor types pie chart
-            if not filtered_sensors.empty:
-                type_counts = filtered_sensors['type'].value_counts().reset_index()
-                type_counts.columns = ['type', 'count']
-                
-                fig = px.pie(
-                    type_counts, 
-                    values='count', 
-                    names='type',
-                    title=tr("sensor_types_distribution"),
-                    color_discrete_sequence=px.colors.qualitative.Pastel
-                )
-                fig.update_traces(textposition='inside', textinfo='percent+label')
-                fig.update_layout(margin=dict(l=20, r=20, t=30, b=20))
-                
-                st.plotly_chart(fig, use_container_width=True, key=f"pie_chart_{datetime.now().timestamp()}")
-            
-            # Signal strength overview
-            st.subheader(tr("signal_strength"))
-            
-            if not filtered_sensors.empty:
-                # Create a horizontal bar chart for signal strength by sensor type
-                avg_signal = filtered_sensors.groupby('type')['signal_strength'].mean().reset_index()
-                
-                fig = px.bar(
-                    avg_signal,
-                    x='signal_strength',
-                    y='type',
-                    orientation='h',
-                    labels={
-                        'signal_strength': tr('avg_signal_strength'),
-                        'type': tr('sensor_type')
-                    },
-                    title=tr('avg_signal_by_type'),
-                    color='signal_strength',
-                    color_continuous_scale='blues',
-                    range_color=[0, 10]
-                )
-                fig.update_layout(margin=dict(l=20, r=20, t=30, b=20))
-                
-                st.plotly_chart(fig, use_container_width=True, key=f"signal_chart_{datetime.now().timestamp()}")
-        
-        # Display the sensor table
-        st.subheader(tr("sensors_list"))
-        
-        if not filtered_sensors.empty:
-            # Add colored status indicator to the dataframe
-            def format_status(status):
-                color = get_sensor_status_color(status)
-                return f'<span style="color:{color};font-weight:bold;">{status.upper()}</span>'
-            
-            # Format the dataframe for display
-            display_df = filtered_sensors.copy()
-            display_df['formatted_status'] = display_df['status'].apply(format_status)
-            
-            # Select columns to display
-            display_cols = ['id', 'name', 'type', 'formatted_status', 'signal_strength', 'last_maintenance']
-            
-            # Display as HTML to show colored status
-            st.write(
-                display_df[display_cols].to_html(
-                    escape=False, 
-                    index=False,
-                    columns=['id', 'name', 'type', 'formatted_status', 'signal_strength', 'last_maintenance'],
-                    col_space=100
-                ),
-                unsafe_allow_html=True
-            )
-            
-            # Add a download button for the filtered data
-            csv = filtered_sensors.to_csv(index=False).encode('utf-8')
-            st.download_button(
-                label=tr("download_csv"),
-                data=csv,
-                file_name=f"sensors_data_{datetime.now().strftime('%Y%m%d')}.csv",
-                mime="text/csv",
-                key=f"download_csv_{datetime.now().timestamp()}"
-            )
-        else:
-            st.warning(tr("no_sensors_match_criteria"))
+    signature = pd.util.hash_pandas_object(filtered_sensors, index=False).to_numpy()
+
+    if state is None or state['filters'] != filters or not np.array_equal(state['signature'], signature):
+        state = {'filters': filters, 'signature': signature, 'view': build_view(filtered_sensors)}
+        st.session_state.dashboard_view = state
+        st.session_state.last_update = state['view']['built_at']
+    state['version'] = version
+    state['checked_at'] = time.monotonic()
+    return state['view']
 
 # Filter controls
 st.sidebar.header(tr("filters"))
@@ -183,24 +155,74 @@ auto_refresh = st.sidebar.checkbox("Mise à jour automatique", value=True)
 refresh_interval = st.sidebar.slider("Intervalle de rafraîchissement (secondes)", min_value=1, max_value=10, value=2)
 
 # Refresh button (pour les mises à jour manuelles)
+# (le clic relance déjà la page ; on force seulement la reconstruction, sans attendre MIN_REDRAW_SECONDS)
 if st.sidebar.button(tr("refresh_data")):
-    st.rerun()
-
-# Show last update time
-st.sidebar.info(f"{tr('last_update')}: {st.session_state.last_update.strftime('%Y-%m-%d %H:%M:%S')}")
-
-# Appel initial pour remplir l'interface
-update_dashboard()
-
-# Auto-refresh avec st.empty comme conteneur pour éviter les rafraîchissements de page complets
-if auto_refresh:
-    while True:
-        # Pause avant le prochain rafraîchissement
-        time.sleep(refresh_interval)
-        # Mise à jour du dashboard
-        update_dashboard()
-        # Force la mise à jour de l'heure
-        st.sidebar.info(f"{tr('last_update')}: {st.session_state.last_update.strftime('%Y-%m-%d %H:%M:%S')}")
+    st.session_state.pop("dashboard_view", None)
+
+@st.fragment(run_every=refresh_interval if auto_refresh else None)
+def live_dashboard():
+    view = dashboard_view(selected_types, selected_statuses)
+
+    # Main dashboard content in two columns
+    left_col, right_col = st.columns([2, 1])
+
+    with left_col:
+        st.subheader(tr("sensor_overview"))
+
+        # Show key metrics
+        total_sensors = view['total']
+        active_sensors = view['active']
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric(tr("total_filtered_sensors"), total_sensors)
+        col2.metric(tr("active_sensors"), active_sensors, f"{round(active_sensors/total_sensors*100)}%" if total_sensors > 0 else "N/A")
+        col3.metric(tr("error_sensors"), view['error'], help=tr("sensors_in_error_state"))
+
+        # Status distribution chart (graphique conservé par le navigateur : seules les hauteurs modifiées sont envoyées)
+        if total_sensors:
+            live_chart(view['status_chart'], "status_chart")
+        else:
+            st.warning(tr("no_sensors_match_criteria"))
+
+        # Power status (devices are plugged in)
+        if total_sensors:
+            st.subheader(tr("power_status"))
+            st.success(tr("power_status_ok"))
+
+    with right_col:
+        st.subheader(tr("sensor_types_distribution"))
+
+        # Sensor types pie chart
+        if total_sensors:
+            live_chart(view['pie_chart'], "pie_chart")
+
+        # Signal strength overview
+        st.subheader(tr("signal_strength"))
+
+        if total_sensors:
+            live_chart(view['signal_chart'], "signal_chart")
+
+    # Display the sensor table
+    st.subheader(tr("sensors_list"))
+
+    if total_sensors:
+        st.write(view['table_html'], unsafe_allow_html=True)
+
+        # Add a download button for the filtered data
+        st.download_button(
+            label=tr("download_csv"),
+            data=view['csv'],
+            file_name=f"sensors_data_{view['built_at'].strftime('%Y%m%d')}.csv",
+            mime="text/csv",
+            key="download_csv"
+        )
+    else:
+        st.warning(tr("no_sensors_match_criteria"))
+
+    # Heure de la dernière reconstruction (le fragment ne peut pas écrire dans la barre latérale)
+    st.caption(f"{tr('last_update')}: {view['built_at'].strftime('%Y-%m-%d %H:%M:%S')}")
+
+live_dashboard()
 
 # Footer
 st.markdown("---")
@@ -6,8 +6,11 @@ from datetime import datetime
 import time
 import random
 from utils.sensor_utils import get_sensor_status_color
-from utils.translation import get_translation
+from utils.translation import bind
 from utils.data_manager import get_sensors_data, get_mattresses_data
+from utils.ingestion_service import get_ingestion_handle
+from utils.downsampling import downsample_frame, target_points
+from utils.live_charts import live_chart
 
 # Page configuration
 st.set_page_config(
@@ -17,10 +20,16 @@ st.set_page_config(
 )
 
 # Header
-tr = lambda key: get_translation(key, st.session_state.language)
+tr = bind(st.session_state.language)
 st.title(tr("mattress_view_title"))
 st.markdown(tr("mattress_view_description"))
 
+# Read handle to the shared ingestion service
+ingestion = get_ingestion_handle()
+
+# History charts sit in the right-hand column (2/5 of a wide layout)
+CHART_PIXEL_WIDTH = 600
+
 # Get data
 mattresses_data = get_mattresses_data()
 sensors_data = get_sensors_data()
@@ -68,45 +77,36 @@ capteur/creatine""")
         submit_button = st.form_submit_button("Connecter au Broker MQTT")
 
         if submit_button:
-            from utils.mqtt_integration import initialize_mqtt_integration
-
-            # Try to connect to MQTT broker
+            # Reconfigure the shared ingestion service (one connection for all sessions)
             with st.spinner("Connexion au broker MQTT..."):
-                mqtt_integration = initialize_mqtt_integration(
+                success = ingestion.service.reconfigure(
                     host=mqtt_host,
                     port=int(mqtt_port),
                     username=mqtt_username if mqtt_username else None,
                     password=mqtt_password if mqtt_password else None
                 )
 
-                if mqtt_integration and mqtt_integration.connected:
+                if success:
                     st.success(f"Connecté au broker MQTT à {mqtt_host}:{mqtt_port}")
 
-                    # Store connection info for reuse
-                    st.session_state['mqtt_broker_info'] = {
-                        'host': mqtt_host,
-                        'port': mqtt_port,
-                        'username': mqtt_username,
-                        'password': mqtt_password
-                    }
-
                     # Update last refresh timestamp
                     st.session_state.last_update = datetime.now()
                 else:
                     st.error(f"Échec de connexion au broker MQTT à {mqtt_host}:{mqtt_port}")
 
 # Show MQTT connection status
-if 'mqtt_integration' in st.session_state and st.session_state.get('mqtt_integration').connected:
-    broker_info = st.session_state.get('mqtt_broker_info', {})
+mqtt_integration = ingestion.mqtt_integration
+if mqtt_integration:
+    broker_info = ingestion.status()['broker_info']
     st.sidebar.success(f"✅ Connecté au broker MQTT à {broker_info.get('host', 'localhost')}:{broker_info.get('port', 1883)}")
 
     if st.sidebar.button("Déconnecter du Broker MQTT"):
-        if 'mqtt_integration' in st.session_state:
-            mqtt_integration = st.session_state['mqtt_integration']
-            mqtt_integration.disconnect()
-            st.session_state['mqtt_integration'] = None
-            st.sidebar.info("Déconnecté du broker MQTT")
-            st.rerun()
+        ingestion.service.stop()
+        st.sidebar.info("Déconnecté du broker MQTT")
+        st.rerun()
+
+# One consistent snapshot of the live MQTT values for the whole page (lock-free read)
+live_snapshot = mqtt_integration.get_snapshot() if mqtt_integration else None
 
 # Refresh button
 if st.sidebar.button(tr("refresh_data")):
@@ -220,9 +220,8 @@ with col1:
         
         # Add sensor as 3D marker with real-time data
         mqtt_value = None
-        if 'mqtt_integration' in st.session_state and st.session_state['mqtt_integration'].connected: #Check connection before accessing
-            mqtt_integration = st.session_state['mqtt_integration']
-            mqtt_data = mqtt_integration.get_latest_data(sensor.id)
+        if live_snapshot is not None:
+            mqtt_data = live_snapshot.get(sensor.id)
             if mqtt_data:
                 mqtt_value = mqtt_data.get('value')
 
@@ -317,9 +316,8 @@ with col2:
             mqtt_data = None
             mqtt_value = None
             
-            if 'mqtt_integration' in st.session_state and st.session_state['mqtt_integration'].connected:
-                mqtt_integration = st.session_state['mqtt_integration']
-                mqtt_data = mqtt_integration.get_latest_data(sensor.id)
+            if live_snapshot is not None:
+                mqtt_data = live_snapshot.get(sensor.id)
                 
                 if mqtt_data:
                     mqtt_value = mqtt_data.get('value')
@@ -332,18 +330,19 @@ with col2:
                         "Horodatage": mqtt_data.get('timestamp', '')
                     })
                     
-                    # Get historical data for charts
-                    historical_data = mqtt_integration.get_latest_data(sensor.id, history=True)
-                    if historical_data and isinstance(historical_data, list):
+                    # Get historical data for charts, reduced to what a half-width chart can show
+                    historical_data = downsample_frame(mqtt_integration.get_history_frame(sensor.id),
+                                                       target_points(CHART_PIXEL_WIDTH))
+                    if not historical_data.empty:
                         with chart_container:
                             st.subheader(f"Historique {sensor.name}")
                             
                             # Create real-time line chart
                             fig = go.Figure()
                             
-                            # Convert MQTT timestamps to datetime
-                            x_data = [datetime.strptime(d['timestamp'], "%Y-%m-%d %H:%M:%S") for d in historical_data]
-                            y_data = [d['value'] for d in historical_data]
+                            # Timestamps are already datetime64 in the history frame
+                            x_data = historical_data['timestamp']
+                            y_data = historical_data['value']
                             
                             # Add the real-time data trace
                             fig.add_trace(go.Scatter(
@@ -386,7 +385,8 @@ with col2:
                                 height=300
                             )
                             
-                            st.plotly_chart(fig, use_container_width=True, key=f"chart_{sensor.id}")
+                            # Graphique conservé par le navigateur : seuls les nouveaux points sont envoyés
+                            live_chart(fig, f"chart_{sensor.id}")
         
         # Display real-time data table
         if mqtt_rows:
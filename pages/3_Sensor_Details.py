@@ -3,9 +3,11 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import time
-from datetime import datetime, timedelta
 from utils.sensor_utils import generate_sample_data
 from utils.data_manager import get_sensors_data, get_mattresses_data
+from utils.ingestion_service import get_ingestion_handle
+from utils.downsampling import downsample_frame
+from utils.live_charts import live_chart
 
 # Configuration de la page
 st.set_page_config(page_title="Détails des Capteurs", page_icon="📊", layout="wide")
@@ -70,21 +72,25 @@ selected_sensor = filtered_sensors[filtered_sensors['id'] == selected_sensor_id]
 st.title(f"📊 {selected_sensor['name']}")
 st.markdown("Monitoring en temps réel des données du capteur")
 
-# Récupération des données MQTT
-if 'mqtt_integration' in st.session_state and st.session_state['mqtt_integration'].connected:
-    mqtt_data = st.session_state['mqtt_integration'].get_latest_data(selected_sensor_id, history=True)
-    if mqtt_data and isinstance(mqtt_data, list):
-        historical_data = pd.DataFrame([
-            {
-                'timestamp': datetime.strptime(entry['timestamp'], "%Y-%m-%d %H:%M:%S"),
-                'value': entry['value']
-            }
-            for entry in mqtt_data
-        ]).sort_values('timestamp')
-    else:
-        historical_data = pd.DataFrame({'timestamp': [], 'value': []})
-else:
+# Récupération des données de la dernière heure : historique persistant (statistiques calculées
+# dans le store), sinon tampon circulaire MQTT
+ingestion = get_ingestion_handle()
+history_store = ingestion.history_store
+mqtt_integration = ingestion.mqtt_integration
+window_start_ns = time.time_ns() - 3600 * 1_000_000_000
+stats = None
+if history_store is not None:
+    historical_data = history_store.query_frame(selected_sensor_id, start_ns=window_start_ns)
+    if not historical_data.empty:
+        _, stats = history_store.query(selected_sensor_id, start_ns=window_start_ns, agg=('last', 'mean', 'max', 'min'))
+        stats = {name: values[0] for name, values in stats.items()}
+if stats is None and mqtt_integration:
+    historical_data = mqtt_integration.get_history_frame(selected_sensor_id, start_ns=window_start_ns)
+elif stats is None:
     historical_data = pd.DataFrame({'timestamp': [], 'value': []})
+if stats is None and not historical_data.empty:
+    values = historical_data['value']
+    stats = {'last': values.iloc[-1], 'mean': values.mean(), 'max': values.max(), 'min': values.min()}
 
 # Layout principal
 col1, col2 = st.columns([2, 1])
@@ -93,7 +99,7 @@ with col1:
     # Graphique
     st.subheader("📈 Historique des mesures")
     fig = px.line(
-        historical_data,
+        downsample_frame(historical_data),
         x='timestamp',
         y='value',
         title=f"Évolution - {selected_sensor['name']}",
@@ -103,12 +109,13 @@ with col1:
         yaxis_title=f"Valeur ({selected_sensor['unit']})",
         height=400
     )
-    st.plotly_chart(fig, use_container_width=True)
+    # Mis à jour sur place à chaque rafraîchissement (nouveaux points uniquement)
+    live_chart(fig, "history_chart")
 
     # Tableau des dernières mesures
     st.subheader("📋 Dernières mesures")
     st.dataframe(
-        historical_data.tail(10).sort_values('timestamp', ascending=False),
+        historical_data.iloc[:-11:-1],
         use_container_width=True,
         hide_index=True
     )
@@ -117,15 +124,10 @@ with col2:
     # Statistiques actuelles
     st.subheader("📊 Statistiques")
     
-    if not historical_data.empty:
-        current_value = historical_data['value'].iloc[-1]
-        avg_value = historical_data['value'].mean()
-        max_value = historical_data['value'].max()
-        min_value = historical_data['value'].min()
-
-        st.metric("Valeur actuelle", f"{current_value:.1f} {selected_sensor['unit']}")
-        st.metric("Moyenne", f"{avg_value:.1f} {selected_sensor['unit']}")
-        st.metric("Maximum", f"{max_value:.1f} {selected_sensor['unit']}")
-        st.metric("Minimum", f"{min_value:.1f} {selected_sensor['unit']}")
+    if stats is not None:
+        st.metric("Valeur actuelle", f"{stats['last']:.1f} {selected_sensor['unit']}")
+        st.metric("Moyenne", f"{stats['mean']:.1f} {selected_sensor['unit']}")
+        st.metric("Maximum", f"{stats['max']:.1f} {selected_sensor['unit']}")
+        st.metric("Minimum", f"{stats['min']:.1f} {selected_sensor['unit']}")
     else:
         st.info("En attente de données...")
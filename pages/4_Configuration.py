@@ -2,8 +2,10 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
 from utils.sensor_utils import get_sensor_status_color
-from utils.translation import get_translation
+from utils.translation import bind
 from utils.data_manager import get_sensors_data, get_mattresses_data, get_sensor_types
+from utils.ingestion_service import get_ingestion_handle
+from utils.fleet_registry import get_fleet_registry
 
 # Page configuration
 st.set_page_config(
@@ -13,7 +15,7 @@ st.set_page_config(
 )
 
 # Header
-tr = lambda key: get_translation(key, st.session_state.language)
+tr = bind(st.session_state.language)
 st.title(tr("configuration_title"))
 st.markdown(tr("configuration_description"))
 
@@ -341,10 +343,11 @@ elif config_option == tr("mattress_sensor_assignment"):
                 cols[2].markdown(f"{tr('power_connection')}: {'Connected' if sensor.power_connection else 'Disconnected'}")
                 cols[3].markdown(f"{tr('firmware')}: {sensor.firmware_version}")
                 if cols[4].button(tr("remove"), key=f"remove_{sensor.id}"):
-                    # In a real application, this would update the database to unassign the sensor
                     st.warning(f"{tr('confirm_unassign')} {sensor.name}?")
                     confirm_cols = st.columns([3, 1, 1])
                     if confirm_cols[1].button(tr("yes"), key=f"confirm_{sensor.id}"):
+                        # The shared fleet registry applies (and persists) the change for every session
+                        get_fleet_registry().unassign(sensor.id)
                         # Add to configuration change log
                         st.session_state['config_changes'].append({
                             'timestamp': datetime.now(),
@@ -376,8 +379,10 @@ elif config_option == tr("mattress_sensor_assignment"):
             submit_button = st.form_submit_button(tr("assign_sensors"))
             
             if submit_button and selected_sensor_ids:
-                # In a real application, this would update the database to assign the sensors
+                # The shared fleet registry applies (and persists) the assignment for every session
+                registry = get_fleet_registry()
                 for sensor_id in selected_sensor_ids:
+                    registry.assign(sensor_id, selected_mattress_id)
                     sensor_name = unassigned_sensors[unassigned_sensors['id'] == sensor_id].iloc[0]['name']
                     # Add to configuration change log
                     st.session_state['config_changes'].append({
@@ -394,6 +399,9 @@ elif config_option == tr("mattress_sensor_assignment"):
 elif config_option == tr("system_settings"):
     st.header(tr("system_settings"))
     
+    # Retention is applied by the shared compaction service (None if the history store could not be opened)
+    compaction = get_ingestion_handle().compaction
+    
     # General system settings
     with st.form(key="system_settings_form"):
         st.markdown(f"### {tr('general_settings')}")
@@ -402,7 +410,7 @@ elif config_option == tr("system_settings"):
             tr("data_retention_days"),
             min_value=30,
             max_value=365,
-            value=90,
+            value=compaction.retention_days if compaction else 90,
             step=30,
             help=tr("data_retention_help")
         )
@@ -461,8 +469,10 @@ elif config_option == tr("system_settings"):
         submit_button = st.form_submit_button(tr("save_system_settings"))
         
         if submit_button:
-            # In a real application, this would update the system settings
-            # For this demo, we'll just show a success message and record the change
+            # Data retention is applied for real: expiry runs in the background compaction thread
+            # The other settings are only recorded in the change log for this demo
+            if compaction:
+                compaction.set_retention(data_retention)
             
             # Add to configuration change log
             st.session_state['config_changes'].append({
@@ -472,6 +482,32 @@ elif config_option == tr("system_settings"):
             })
             
             st.success(tr("system_settings_saved"))
+    
+    # Storage status and last compaction report
+    st.markdown(f"### {tr('data_storage')}")
+    
+    if compaction is None:
+        st.warning(tr("history_store_unavailable"))
+    else:
+        storage = compaction.store.storage_info()
+        report = compaction.last_report
+        
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric(tr("database_size"), f"{(storage['file_bytes'] + storage['wal_bytes']) / 1e6:.1f} MB")
+        if report:
+            col2.metric(tr("space_reclaimed"), f"{report['bytes_reclaimed'] / 1e6:.1f} MB")
+            col3.metric(tr("compaction_duration"), f"{report['duration_s']:.2f} s")
+            col4.metric(tr("rows_expired"), f"{sum(report['deleted'].values()):,}")
+            st.caption(f"{tr('last_compaction')}: {datetime.fromtimestamp(report['finished_at']).strftime('%d/%m/%Y %H:%M:%S')}")
+        else:
+            st.info(tr("no_compaction_yet"))
+        
+        if compaction.running_pass:
+            st.info(tr("compaction_running"))
+        
+        if st.button(tr("run_compaction_now")):
+            compaction.run_now()
+            st.success(tr("compaction_requested"))
 
 # Configuration change history
 st.markdown("---")
@@ -4,7 +4,7 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 from utils.sensor_utils import get_sensor_status_color
-from utils.translation import get_translation
+from utils.translation import bind
 from utils.data_manager import get_sensors_data, get_mattresses_data
 
 # Page configuration
@@ -15,7 +15,7 @@ st.set_page_config(
 )
 
 # Header
-tr = lambda key: get_translation(key, st.session_state.language)
+tr = bind(st.session_state.language)
 st.title(tr("maintenance_title"))
 st.markdown(tr("maintenance_description"))
 
@@ -354,7 +354,8 @@ elif maintenance_option == tr("calibration"):
     # For demo purposes, we'll consider last_maintenance date as last calibration date
     # In a real application, this would be a separate field
     
-    # Calculate days since last maintenance
+    # Calculate days since last maintenance (on a copy: the registry's table is shared by every session)
+    sensors_data = sensors_data.copy()
     sensors_data['days_since_maintenance'] = sensors_data['last_maintenance'].apply(
         lambda x: (datetime.now().date() - datetime.strptime(x, '%Y-%m-%d').date()).days if isinstance(x, str) else 999
     )
@@ -6,7 +6,7 @@ from datetime import datetime, timedelta
 import time
 import random
 from utils.sensor_utils import get_sensor_status_color
-from utils.translation import get_translation
+from utils.translation import bind
 from utils.data_manager import get_alerts_data, get_sensors_data, get_mattresses_data
 
 # Page configuration
@@ -17,7 +17,7 @@ st.set_page_config(
 )
 
 # Header
-tr = lambda key: get_translation(key, st.session_state.language)
+tr = bind(st.session_state.language)
 st.title(tr("alerts_logs_title"))
 st.markdown(tr("alerts_logs_description"))
 
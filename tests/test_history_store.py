@@ -0,0 +1,79 @@
+"""
+Historique persistant : les rollups restent cohérents avec les lectures brutes
+"""
+
+import sqlite3
+
+from utils.history_store import ROLLUP_TIERS, HistoryStore
+
+TS_NS = 1_700_000_000_000_000_000
+
+
+def test_duplicate_reading_is_counted_once_in_rollups(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"))
+    try:
+        # Même lecture reçue deux fois (rejeu du journal, redistribution QoS 1), dans deux commits puis dans un seul
+        for batch in ([("SEN-1", TS_NS, 36.5)], [("SEN-1", TS_NS, 36.5)],
+                      [("SEN-1", TS_NS + 1_000_000_000, 37.0), ("SEN-1", TS_NS + 1_000_000_000, 37.0)]):
+            store.append_many(batch)
+            assert store.flush()
+
+        conn = store._reader()
+        assert conn.execute("SELECT count(*) FROM readings").fetchone()[0] == 2
+        for tier in ROLLUP_TIERS:
+            count, total = conn.execute("SELECT sum(count), sum(sum) FROM rollups WHERE tier = ?", (tier,)).fetchone()
+            assert (count, total) == (2, 73.5)
+    finally:
+        store.close()
+
+
+def test_failed_commit_is_reported_and_retried(tmp_path, monkeypatch):
+    store = HistoryStore(str(tmp_path / "history.db"), commit_interval_ms=20)
+    try:
+        insert = HistoryStore._insert_readings
+        failures = []
+
+        def flaky_insert(conn, records):
+            # Premier commit : base verrouillée, comme lors d'un checkpoint concurrent
+            if not failures:
+                failures.append(True)
+                raise sqlite3.OperationalError("database is locked")
+            return insert(conn, records)
+
+        monkeypatch.setattr(store, "_insert_readings", flaky_insert)
+        store.append_many([("SEN-NEW", TS_NS, 36.5)])
+
+        # Le flush signale l'échec au lieu d'annoncer un commit qui n'a pas eu lieu
+        assert not store.flush()
+        assert store.get_stats()["failed_commits"] == 1
+        # Le lot est rejoué au commit suivant, la clé du capteur n'est publiée qu'après lui
+        assert store.flush()
+        conn = store._reader()
+        assert conn.execute("SELECT count(*) FROM readings").fetchone()[0] == 1
+        assert store._sensor_keys["SEN-NEW"] == conn.execute(
+            "SELECT id FROM sensors WHERE name = 'SEN-NEW'").fetchone()[0]
+    finally:
+        store.close()
+
+
+def test_unstorable_batch_does_not_block_the_queue(tmp_path, monkeypatch):
+    store = HistoryStore(str(tmp_path / "history.db"), commit_interval_ms=20)
+    try:
+        insert = HistoryStore._insert_readings
+
+        def strict_insert(conn, records):
+            # Lot rejeté par une contrainte : il ne pourra jamais être écrit, inutile de le rejouer
+            if any(value < 0 for _, _, value in records):
+                raise sqlite3.IntegrityError("CHECK constraint failed")
+            return insert(conn, records)
+
+        monkeypatch.setattr(store, "_insert_readings", strict_insert)
+        store.append_many([("SEN-1", TS_NS, -1.0)])
+        assert not store.flush()
+        assert "SEN-1" not in store._sensor_keys
+
+        store.append_many([("SEN-1", TS_NS, 36.5)])
+        assert store.flush()
+        assert store._reader().execute("SELECT count(*) FROM readings").fetchone()[0] == 1
+    finally:
+        store.close()
@@ -0,0 +1,32 @@
+"""
+Lots d'ingestion MQTT : une lecture invalide n'écarte qu'elle-même, jamais le reste du lot
+"""
+
+import json
+import time
+
+from utils.mqtt_integration import MQTTIntegration
+from utils.payload_decoders import DEFAULT_UID, FRAME_TOPIC, TYPE_CODE_BY_TOPIC, StructFrameDecoder
+
+
+def frame(topic, value, timestamp):
+    """Trame binaire d'une lecture du matelas par défaut"""
+    return StructFrameDecoder.FRAME.pack(DEFAULT_UID.encode("ascii"), TYPE_CODE_BY_TOPIC[topic], value, timestamp)
+
+
+def test_bad_timestamp_frame_keeps_the_rest_of_the_batch():
+    integration = MQTTIntegration(host="localhost")
+    now = time.time()
+    batch = [
+        ("capteur/temperature", json.dumps({"uid": DEFAULT_UID, "value": 36.6, "timestamp": now}).encode(), now),
+        (FRAME_TOPIC, frame("capteur/humidite", 40.0, float("nan")), now),
+        (FRAME_TOPIC, frame("capteur/humidite", 41.0, now * 1_000_000), now),
+        (FRAME_TOPIC, frame("capteur/poul", 72.0, now), now),
+    ]
+
+    integration._process_batch(batch)
+
+    expected = {integration.router.resolve(topic, DEFAULT_UID).sensor_id
+                for topic in ("capteur/temperature", "capteur/poul")}
+    assert set(integration.get_snapshot().data) == expected
+    assert set(integration.history.buffers) == expected
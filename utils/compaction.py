@@ -0,0 +1,208 @@
+"""
+Service de compaction de l'historique persistant
+Applique la durée de conservation réglée dans la page Configuration : les lectures brutes
+expirent après la durée choisie, les tiers de rollup sont conservés plus longtemps.
+Les lectures brutes plus anciennes que seal_after_s sont ensuite scellées en chunks
+compressés (utils.gorilla).
+Le travail est découpé en petites transactions (quelques milliers de lignes) espacées
+de courtes pauses : l'ingestion ne fait qu'empiler dans le store et n'est jamais bloquée,
+et les commits groupés n'attendent au plus qu'une petite transaction.
+"""
+
+import logging
+import threading
+import time
+
+from utils.gorilla import DEFAULT_CHUNK_SIZE
+from utils.history_store import ROLLUP_TIERS
+
+logger = logging.getLogger(__name__)
+
+RAW_TIER = "raw"
+DEFAULT_RETENTION_DAYS = 90
+RETENTION_SETTING = "data_retention_days"
+
+# Durée de conservation de chaque tier, en multiple de la durée réglée (None : conservé indéfiniment)
+ROLLUP_RETENTION_FACTORS = {
+    60: 2,
+    300: 4,
+    3600: 12,
+    7200: None
+}
+
+
+def retention_policy(retention_days):
+    """
+    Durées de conservation par tier
+
+    Parameters:
+    - retention_days: Durée réglée pour les lectures brutes
+
+    Returns:
+    - Dictionnaire tier (RAW_TIER ou largeur de rollup en secondes) -> jours, ou None pour illimité
+    """
+    policy = {RAW_TIER: retention_days}
+    for tier in ROLLUP_TIERS:
+        factor = ROLLUP_RETENTION_FACTORS.get(tier)
+        policy[tier] = None if factor is None else retention_days * factor
+    return policy
+
+
+class CompactionService:
+    """
+    Thread de fond qui expire les données trop anciennes et rend l'espace libéré au disque
+    Une passe est lancée périodiquement, ou immédiatement après un changement de réglage
+    """
+    def __init__(self, store, retention_days=None, interval_s=3600, chunk_rows=5000,
+                 reclaim_pages=256, pause_s=0.005, seal_after_s=3600):
+        """
+        Parameters:
+        - store: HistoryStore à compacter
+        - retention_days: Durée de conservation des lectures brutes (par défaut : valeur persistée, sinon 90)
+        - interval_s: Intervalle entre deux passes automatiques
+        - chunk_rows: Lignes supprimées par transaction
+        - reclaim_pages: Pages rendues au disque par transaction d'auto-vacuum incrémental
+        - pause_s: Pause entre deux transactions, pour laisser passer les commits de l'ingestion
+        - seal_after_s: Âge à partir duquel les lectures brutes sont compressées (plus de retardataires attendus)
+        """
+        self.store = store
+        if retention_days is None:
+            retention_days = int(store.get_setting(RETENTION_SETTING, DEFAULT_RETENTION_DAYS))
+        self.retention_days = retention_days
+        self.interval_s = interval_s
+        self.chunk_rows = chunk_rows
+        self.reclaim_pages = reclaim_pages
+        self.pause_s = pause_s
+        self.seal_after_s = seal_after_s
+
+        self.last_report = None
+        self.running_pass = False
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Démarre le thread de compaction"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="history-compaction", daemon=True)
+            self._thread.start()
+            logger.info(f"Compaction démarrée (conservation {self.retention_days} jours)")
+
+    def stop(self, timeout=10):
+        """Arrête le thread (la passe en cours s'interrompt entre deux transactions)"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def set_retention(self, retention_days):
+        """
+        Change la durée de conservation, la persiste et déclenche une passe
+        """
+        self.retention_days = int(retention_days)
+        self.store.set_setting(RETENTION_SETTING, self.retention_days)
+        logger.info(f"Conservation des données réglée à {self.retention_days} jours")
+        self.run_now()
+
+    def run_now(self):
+        """Demande une passe immédiate (asynchrone)"""
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.compact()
+            except Exception as e:
+                logger.error(f"Erreur lors de la compaction: {e}")
+            self._wake.wait(self.interval_s)
+            self._wake.clear()
+
+    def compact(self, now_ns=None):
+        """
+        Exécute une passe complète : expiration par tier puis récupération de l'espace
+
+        Parameters:
+        - now_ns: Instant de référence en epoch ns (par défaut : maintenant)
+
+        Returns:
+        - Rapport: durée, lignes supprimées par tier, octets récupérés, tailles avant/après
+        """
+        self.running_pass = True
+        started = time.perf_counter()
+        now_ns = time.time_ns() if now_ns is None else now_ns
+        try:
+            before = self.store.storage_info()
+            policy = retention_policy(self.retention_days)
+            deleted = {}
+            sensor_keys = self.store.sensor_keys()
+            for tier, days in policy.items():
+                if days is None:
+                    continue
+                cutoff_ns = now_ns - days * 86400 * 1_000_000_000
+                deleted[tier] = 0
+                if tier == RAW_TIER:
+                    # Un chunk compresse DEFAULT_CHUNK_SIZE lectures : quelques chunks par transaction
+                    chunk_limit = max(1, self.chunk_rows // DEFAULT_CHUNK_SIZE)
+                    expirers = (
+                        (lambda key: self.store.expire_readings(key, cutoff_ns, self.chunk_rows), self.chunk_rows),
+                        (lambda key: self.store.expire_chunks(key, cutoff_ns, chunk_limit),
+                         chunk_limit * DEFAULT_CHUNK_SIZE)
+                    )
+                else:
+                    expirers = (
+                        (lambda key: self.store.expire_rollups(tier, key, cutoff_ns, self.chunk_rows), self.chunk_rows),
+                    )
+                for sensor_key in sensor_keys:
+                    for expire, full_batch in expirers:
+                        while not self._stop.is_set():
+                            count = expire(sensor_key)
+                            deleted[tier] += count
+                            if count < full_batch:
+                                break
+                            time.sleep(self.pause_s)
+
+            # Compression des lectures qui ne recevront plus de retardataires, un chunk par transaction
+            sealed = 0
+            seal_cutoff_ns = now_ns - int(self.seal_after_s * 1_000_000_000)
+            for sensor_key in sensor_keys:
+                while not self._stop.is_set():
+                    count = self.store.seal_chunk(sensor_key, seal_cutoff_ns)
+                    sealed += count
+                    if not count:
+                        break
+                    time.sleep(self.pause_s)
+
+            # Pages libérées rendues au disque, quelques centaines à la fois
+            pages_released = 0
+            if before['incremental_vacuum']:
+                while not self._stop.is_set():
+                    released = self.store.reclaim_pages(self.reclaim_pages)
+                    pages_released += released
+                    if released < self.reclaim_pages:
+                        break
+                    time.sleep(self.pause_s)
+            self.store.checkpoint()
+            after = self.store.storage_info()
+        finally:
+            self.running_pass = False
+
+        report = {
+            'finished_at': time.time(),
+            'duration_s': time.perf_counter() - started,
+            'retention_days': self.retention_days,
+            'deleted': deleted,
+            'sealed': sealed,
+            'pages_released': pages_released,
+            'bytes_reclaimed': pages_released * before['page_size'],
+            'file_bytes_before': before['file_bytes'] + before['wal_bytes'],
+            'file_bytes_after': after['file_bytes'] + after['wal_bytes'],
+            'free_pages': after['freelist_count']
+        }
+        self.last_report = report
+        logger.info(
+            f"Compaction: {sum(deleted.values())} lignes supprimées, "
+            f"{report['bytes_reclaimed'] / 1e6:.1f} Mo récupérés en {report['duration_s']:.2f} s"
+        )
+        return report
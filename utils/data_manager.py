@@ -1,177 +1,39 @@
 import pandas as pd
 from datetime import datetime, timedelta
 import random
-import streamlit as st
 import logging
-from utils.direct_simulator import get_direct_simulator, initialize_direct_simulator
+from utils.ingestion_service import get_ingestion_handle
+from utils.fleet_registry import get_fleet_registry
+from utils.synthetic_history import DEFAULT_TIMEFRAME, TIMEFRAMES, get_synthetic_history
+from utils.timeseries import to_epoch_ns
 
 def get_sensors_data():
     """
-    Returns sensor data, combining MQTT data for mattress 1 and simulated data for others
+    Returns the sensor table of the fleet registry, combining live data for mattress 1
+    and registry data for the others
 
-    For sensors on mattress 1 (MAT-101), data is sourced from MQTT broker when available
-    For other mattresses, data is simulated
+    Sensors on mattress 1 (MAT-101) are flagged 'is_mqtt_updated' and get their live
+    'value' once the MQTT broker (or the direct simulator) delivers values for them. The
+    DataFrame is shared and only rebuilt when the registry or the live snapshot changes:
+    treat it as read-only.
     """
-    # Sensor types avec leurs unités et noms
-    sensor_types = [
-        ('temperature', 'Capteur de température', '°C'),
-        ('humidity', 'Capteur d\'humidité', '%'),
-        ('debit_urinaire', 'Débit urinaire', 'ml/h'),
-        ('poul', 'Pouls', 'bpm'),
-        ('creatine', 'Créatinine', 'mg/dL')
-    ]
-
-    # Status options
-    status_options = ['active', 'inactive', 'maintenance', 'error']
-    status_weights = [0.7, 0.1, 0.1, 0.1]  # Weights for random selection
-
-    # Initialize direct simulator if not already done
-    try:
-        # Try to initialize direct simulator if not already present
-        if 'direct_simulator' not in st.session_state:
-            direct_simulator = initialize_direct_simulator()
-        else:
-            direct_simulator = st.session_state['direct_simulator']
-    except Exception as e:
-        logging.error(f"Erreur lors de l'initialisation du simulateur direct: {e}")
-        direct_simulator = None
-
-    # Generate random sensor data
-    sensors = []
-
-    for i in range(1, 21):  # Generate 20 sensors
-        sensor_id = f"SEN-{200 + i}"
-        sensor_type = sensor_types[i % len(sensor_types)]
-        status = random.choices(status_options, weights=status_weights, k=1)[0]
-
-        # Power connection (all sensors are plugged in)
-        power_connection = True
-
-        # Signal strength based on status
-        if status == 'active':
-            signal_strength = random.randint(7, 10)
-        elif status == 'error':
-            signal_strength = random.randint(1, 4)
-        else:
-            signal_strength = random.randint(4, 8)
-
-        # Firmware version
-        firmware_version = f"v{random.choice(['1.5', '1.8', '2.0', '2.1'])}"
-
-        # Installation date (between 1 and 2 years ago)
-        days_ago = random.randint(365, 730)
-        installation_date = (datetime.now() - timedelta(days=days_ago)).strftime('%Y-%m-%d')
-
-        # Last maintenance (between 1 and 180 days ago)
-        maintenance_days_ago = random.randint(1, 180)
-        last_maintenance = (datetime.now() - timedelta(days=maintenance_days_ago)).strftime('%Y-%m-%d')
-
-        # Assign to a mattress (some may be unassigned)
-        if random.random() < 0.9:  # 90% chance of being assigned
-            mattress_id = f"MAT-{101 + (i // 3)}"  # Distribute sensors across mattresses
-        else:
-            mattress_id = None
-
-        # Check if we have MQTT data for any mattress
-        is_mqtt_updated = False
-        if mattress_id:  # If sensor is assigned to a mattress
-            # 1. First try to get data from MQTT broker (highest priority)
-            if 'mqtt_integration' in st.session_state:
-                mqtt_integration = st.session_state['mqtt_integration']
-                if mqtt_integration and hasattr(mqtt_integration, 'connected') and mqtt_integration.connected:
-                    mqtt_data = mqtt_integration.get_latest_data(sensor_id)
-
-                    if mqtt_data and isinstance(mqtt_data, dict) and 'value' in mqtt_data:
-                        # Update with MQTT data
-                        is_mqtt_updated = True
-                        # Force the sensor to be active when receiving MQTT data
-                        status = 'active'
-                        # Ensure signal strength is good
-                        signal_strength = random.randint(8, 10)
-
-                        # Add a log to show we're using MQTT data
-                        logging.info(f"Using MQTT data for sensor {sensor_id} on mattress {mattress_id}")
-
-            # 2. If no MQTT data, try the direct simulator (fallback)
-            if not is_mqtt_updated:
-                direct_simulator = None
-                if 'direct_simulator' in st.session_state:
-                    direct_simulator = st.session_state['direct_simulator']
-
-                if direct_simulator:
-                    simulated_data = direct_simulator.get_latest_data(sensor_id)
-                    if simulated_data:
-                        # Update with simulated data 
-                        is_mqtt_updated = True
-                        # Force the sensor to be active when receiving simulated data
-                        status = 'active'
-                        # Ensure signal strength is good
-                        signal_strength = random.randint(8, 10)
-
-                        # Add a log to show we're using simulated data
-                        logging.info(f"Using simulated data for sensor {sensor_id} on mattress {mattress_id}")
-
-        sensors.append({
-            'id': sensor_id,
-            'name': f"{sensor_type[1]} {i}", # Corrected line: Accessing the sensor name from the tuple
-            'type': sensor_type[0], # Corrected line: Accessing the sensor type from the tuple
-            'status': status,
-            'power_connection': power_connection,
-            'signal_strength': signal_strength,
-            'firmware_version': firmware_version,
-            'installation_date': installation_date,
-            'last_maintenance': last_maintenance,
-            'mattress_id': mattress_id,
-            'is_mqtt_updated': is_mqtt_updated
-        })
-
-    return pd.DataFrame(sensors)
+    # Read handle to the process-wide ingestion service (no per-session client or thread)
+    ingestion = get_ingestion_handle()
+    registry = get_fleet_registry()
+    # One consistent view of every live value for the whole table
+    live_snapshot = ingestion.snapshot()
+    # Incremental: only looks at the live values when the snapshot version moved
+    registry.observe(live_snapshot)
+    # One vectorized join of the fleet table against the live values, cached per snapshot version
+    return registry.live_frame(live_snapshot)
 
 def get_mattresses_data():
     """
-    Returns sample mattress data for demonstration
+    Returns the mattress table of the fleet registry (shared DataFrame, treat as read-only)
 
-    In a real application, this would fetch data from a database
+    In a real application, the registry would be loaded from a database
     """
-    # Status options
-    status_options = ['active', 'maintenance', 'inactive']
-    status_weights = [0.8, 0.1, 0.1]  # Weights for random selection
-
-    # Locations
-    locations = ['Ward A', 'Ward B', 'ICU', 'Recovery']
-
-    # Generate random mattress data
-    mattresses = []
-
-    for i in range(1, 8):  # Generate 7 mattresses
-        mattress_id = f"MAT-{100 + i}"
-        status = random.choices(status_options, weights=status_weights, k=1)[0]
-
-        # Patient ID
-        patient_id = f"P-{1000 + i}"
-
-        # Location
-        location = random.choice(locations)
-
-        # Installation date (between 1 and 3 years ago)
-        days_ago = random.randint(365, 1095)
-        installation_date = (datetime.now() - timedelta(days=days_ago)).strftime('%Y-%m-%d')
-
-        # Last maintenance (between 1 and 180 days ago)
-        maintenance_days_ago = random.randint(1, 180)
-        last_maintenance = (datetime.now() - timedelta(days=maintenance_days_ago)).strftime('%Y-%m-%d')
-
-        mattresses.append({
-            'id': mattress_id,
-            'name': f"Mattress {i}",
-            'status': status,
-            'patient_id': patient_id,
-            'location': location,
-            'installation_date': installation_date,
-            'last_maintenance': last_maintenance
-        })
-
-    return pd.DataFrame(mattresses)
+    return get_fleet_registry().mattresses_frame()
 
 def get_alerts_data():
     """
@@ -278,29 +140,6 @@ def get_sensor_types():
     """
     return ['pressure', 'temperature', 'humidity', 'movement']
 
-# Stockage temporaire des données MQTT
-mqtt_data_store = {
-    'sensors': {},
-    'last_update': None
-}
-
-def update_mqtt_data(sensor_id, value, timestamp, unit):
-    """Mettre à jour le stockage temporaire avec les nouvelles données MQTT"""
-    if sensor_id not in mqtt_data_store['sensors']:
-        mqtt_data_store['sensors'][sensor_id] = []
-    
-    mqtt_data_store['sensors'][sensor_id].append({
-        'value': value,
-        'timestamp': timestamp,
-        'unit': unit
-    })
-    
-    # Garder seulement les 100 dernières valeurs
-    if len(mqtt_data_store['sensors'][sensor_id]) > 100:
-        mqtt_data_store['sensors'][sensor_id] = mqtt_data_store['sensors'][sensor_id][-100:]
-    
-    mqtt_data_store['last_update'] = timestamp
-
 def get_sensor_readings(sensor_id, sensor_type, timeframe='day'):
     """
     Get sensor readings for a specific sensor, using MQTT data when available
@@ -313,94 +152,65 @@ def get_sensor_readings(sensor_id, sensor_type, timeframe='day'):
     Returns:
     - DataFrame with timestamp and value columns
     """
-    from utils.sensor_utils import generate_sample_data
-    from datetime import datetime, timedelta
-
-    # Define the time range based on the timeframe
+    # Define the time range based on the timeframe ('day' for unknown values)
+    span_seconds, interval_seconds = TIMEFRAMES.get(timeframe, TIMEFRAMES[DEFAULT_TIMEFRAME])
     end_time = datetime.now()
-    if timeframe == 'hour':
-        start_time = end_time - timedelta(hours=1)
-        interval_seconds = 60  # 1 reading per minute
-    elif timeframe == 'day':
-        start_time = end_time - timedelta(days=1)
-        interval_seconds = 300  # 5 minutes
-    elif timeframe == 'week':
-        start_time = end_time - timedelta(weeks=1)
-        interval_seconds = 3600  # 1 hour
-    elif timeframe == 'month':
-        start_time = end_time - timedelta(days=30)
-        interval_seconds = 7200  # 2 hours
-    else:
-        start_time = end_time - timedelta(days=1)
-        interval_seconds = 300
-
-    # Check if sensor is on mattress 1 and using MQTT
-    mattress_id = None
-    sensors_df = get_sensors_data()
-    if not sensors_df.empty:
-        sensor_row = sensors_df[sensors_df['id'] == sensor_id]
-        if not sensor_row.empty:
-            mattress_id = sensor_row.iloc[0]['mattress_id']
-            is_mqtt_updated = sensor_row.iloc[0].get('is_mqtt_updated', False)
-
-            # For Mattress 1 sensors with MQTT or simulated data, use the real-time values
-            if mattress_id == "MAT-101" and is_mqtt_updated:
-                # 1. First try to get MQTT data (highest priority)
-                try:
-                    if 'mqtt_integration' in st.session_state:
-                        mqtt_integration = st.session_state['mqtt_integration']
-                        if mqtt_integration and mqtt_integration.connected:
-                            # Get the historical data from MQTT if available
-                            mqtt_history = mqtt_integration.get_latest_data(sensor_id, history=True)
-
-                            if mqtt_history and isinstance(mqtt_history, list) and len(mqtt_history) > 0:
-                                # Convert MQTT history to DataFrame
-                                history_data = []
-                                for entry in mqtt_history:
-                                    try:
-                                        # Parse timestamp string to datetime object if it's a string
-                                        timestamp = entry.get('timestamp')
-                                        if isinstance(timestamp, str):
-                                            timestamp = datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S")
-
-                                        # Add to history data
-                                        history_data.append({
-                                            'timestamp': timestamp,
-                                            'value': entry.get('value', 0)
-                                        })
-                                    except Exception as e:
-                                        logging.error(f"Error parsing MQTT history entry: {e}")
-
-                                if history_data:
-                                    # Create DataFrame from MQTT history and sort by timestamp
-                                    mqtt_df = pd.DataFrame(history_data)
-                                    mqtt_df = mqtt_df.sort_values('timestamp')
-                                    logging.info(f"Using MQTT history data for sensor {sensor_id} with {len(mqtt_df)} values")
-                                    return mqtt_df
-                except Exception as e:
-                    logging.error(f"Error getting MQTT data for sensor {sensor_id}: {e}")
-
-                # 2. Fallback to simulated data if MQTT data is not available
-                try:
-                    if 'direct_simulator' in st.session_state:
-                        direct_simulator = st.session_state['direct_simulator']
-                        simulated_data = direct_simulator.get_latest_data(sensor_id)
-                        if simulated_data:
-                            value = simulated_data.get('value')
-                            logging.info(f"Using simulated data for sensor {sensor_id}: {value}")
+    start_time = end_time - timedelta(seconds=span_seconds)
+    # Synthetic history: seeded per sensor and extended with the new points only, so charts stay stable
+    synthetic_history = get_synthetic_history()
+
+    # Persisted history first: real readings over the whole window, averaged per display
+    # interval (raw readings for the last hour)
+    history_store = get_ingestion_handle().history_store
+    if history_store is not None:
+        try:
+            bucket_ns = None if timeframe == 'hour' else interval_seconds * 1_000_000_000
+            stored_df = history_store.query_frame(sensor_id, start_ns=to_epoch_ns(start_time), bucket_ns=bucket_ns,
+                                                  agg='mean' if bucket_ns else None)
+            if not stored_df.empty:
+                return stored_df
+        except Exception as e:
+            logging.error(f"Error reading stored history for sensor {sensor_id}: {e}")
+
+    # Check if sensor is on mattress 1 and using MQTT: indexed registry lookup, no table rebuild
+    ingestion = get_ingestion_handle()
+    live_data = ingestion.snapshot().get(sensor_id)
+    sensor = get_fleet_registry().get_sensor(sensor_id)
+    if sensor is not None:
+        # For Mattress 1 sensors with MQTT or simulated data, use the real-time values
+        if sensor['mattress_id'] == "MAT-101" and live_data and 'value' in live_data:
+            # 1. First try to get MQTT data (highest priority)
+            try:
+                mqtt_integration = ingestion.mqtt_integration
+                if mqtt_integration:
+                    # Get the historical data from MQTT if available, straight from the ring buffer
+                    mqtt_df = mqtt_integration.get_history_frame(sensor_id, start_ns=to_epoch_ns(start_time))
+                    if not mqtt_df.empty:
+                        logging.info(f"Using MQTT history data for sensor {sensor_id} with {len(mqtt_df)} values")
+                        return mqtt_df
+            except Exception as e:
+                logging.error(f"Error getting MQTT data for sensor {sensor_id}: {e}")
+
+            # 2. Fallback to simulated data if MQTT data is not available
+            try:
+                direct_simulator = ingestion.direct_simulator
+                if direct_simulator:
+                    simulated_data = direct_simulator.get_latest_data(sensor_id)
+                    if simulated_data:
+                        value = simulated_data.get('value')
+                        logging.info(f"Using simulated data for sensor {sensor_id}: {value}")
 
-                            # Generate sample data for historical values, but incorporate simulated value for latest
-                            df = generate_sample_data(sensor_type, start_time, end_time, interval_seconds)
+                        # Synthetic data for historical values, but incorporate simulated value for latest
+                        df = synthetic_history.get_frame(sensor_id, sensor_type, timeframe)
 
-                            # Replace the latest value with simulated data
-                            if not df.empty:
-                                # Add random variation to simulate slightly changing values
-                                factor = random.uniform(0.95, 1.05) 
-                                df.iloc[-1, df.columns.get_loc('value')] = value * factor
+                        # Replace the latest value with simulated data (on a copy: the cached frame is shared)
+                        if not df.empty:
+                            df = df.copy()
+                            df.iloc[-1, df.columns.get_loc('value')] = value
 
-                            return df
-                except Exception as e:
-                    logging.error(f"Error getting simulated data for sensor {sensor_id}: {e}")
+                        return df
+            except Exception as e:
+                logging.error(f"Error getting simulated data for sensor {sensor_id}: {e}")
 
-    # For all other sensors, generate sample data
-    return generate_sample_data(sensor_type, start_time, end_time, interval_seconds)
\ No newline at end of file
+    # For all other sensors, synthetic data
+    return synthetic_history.get_frame(sensor_id, sensor_type, timeframe)
\ No newline at end of file
@@ -9,7 +9,7 @@ import json
 import logging
 import threading
 from datetime import datetime
-import streamlit as st
+from utils.snapshot import SnapshotStore
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO, 
@@ -22,10 +22,16 @@ class DirectSimulator:
     Cette classe simule des capteurs de matelas médicaux et génère des données
     comme si elles venaient d'un broker MQTT
     """
-    def __init__(self):
-        """Initialise le simulateur de capteurs direct"""
+    def __init__(self, store=None):
+        """
+        Initialise le simulateur de capteurs direct
+
+        Parameters:
+        - store: HistoryStore recevant les valeurs simulées (historique persistant), optionnel
+        """
+        self.store = store
         self.mattress_id = "MAT-101"  # Matelas 1 (celui qui simule les données MQTT)
-        self.latest_data = {}
+        self.snapshots = SnapshotStore()  # Dernières valeurs, un instantané publié par cycle
         self.running = False
         self.thread = None
         
@@ -106,6 +112,7 @@ class DirectSimulator:
         try:
             while self.running:
                 current_time = time.time()
+                updates = {}
                 
                 for sensor_id, sensor_config in self.sensor_types.items():
                     # Vérifier si c'est le moment de mettre à jour ce capteur
@@ -118,10 +125,7 @@ class DirectSimulator:
                         topic = f"hospital/mattress/{self.mattress_id}/{sensor_id}"
                         
                         # Stocker les données
-                        if sensor_id not in self.latest_data:
-                            self.latest_data[sensor_id] = {}
-                        
-                        self.latest_data[sensor_id] = {
+                        updates[sensor_id] = {
                             'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                             'type': sensor_config["type"],
                             'value': value,
@@ -134,6 +138,12 @@ class DirectSimulator:
                         # Mettre à jour le timestamp
                         last_update[sensor_id] = current_time
                 
+                # Publier toutes les valeurs du cycle en un seul instantané
+                self.snapshots.publish(updates)
+                if self.store is not None and updates:
+                    ts_ns = int(current_time * 1_000_000_000)
+                    self.store.append_many([(sensor_id, ts_ns, data['value']) for sensor_id, data in updates.items()])
+                
                 # Attendre un peu pour ne pas surcharger le système
                 time.sleep(1)
                 
@@ -159,6 +169,12 @@ class DirectSimulator:
                 self.thread.join(timeout=2)
             logger.info("Simulation arrêtée")
     
+    def get_snapshot(self):
+        """
+        Retourne l'instantané courant des dernières valeurs simulées (O(1), sans verrou)
+        """
+        return self.snapshots.snapshot()
+    
     def get_latest_data(self, sensor_id=None):
         """
         Retourne les dernières données simulées
@@ -167,47 +183,35 @@ class DirectSimulator:
         - sensor_id: Optionnel, filtre par ID du capteur
         
         Returns:
-        - Dictionnaire des dernières données
+        - Dictionnaire des dernières données (lecture seule)
         """
+        snapshot = self.snapshots.snapshot()
         if sensor_id is None:
-            return self.latest_data
-        
-        if sensor_id not in self.latest_data:
-            return {}
+            return snapshot.data
         
-        return self.latest_data[sensor_id]
-
-# Création d'une instance globale pour le simulateur
-direct_simulator = None
+        return snapshot.get(sensor_id, {})
 
 def initialize_direct_simulator():
     """
-    Initialise le simulateur direct
+    Initialise le simulateur direct du service d'ingestion partagé
+    Le simulateur n'est démarré qu'une fois par processus serveur, et seulement si
+    aucune autre source (broker MQTT) n'est active
+
+    Returns:
+    - Le simulateur partagé, ou None si le service est connecté à un broker
     """
-    global direct_simulator
-    
-    if direct_simulator is None:
-        direct_simulator = DirectSimulator()
-        direct_simulator.start()
-        
-        # Stocker le simulateur dans le session state pour qu'il soit accessible partout
-        if 'direct_simulator' not in st.session_state:
-            st.session_state['direct_simulator'] = direct_simulator
-        
+    from utils.ingestion_service import get_ingestion_service, MODE_DIRECT
+
+    service = get_ingestion_service()
+    if not service.running:
+        service.start(MODE_DIRECT)
         logger.info("Simulateur direct initialisé et démarré")
-        return direct_simulator
-    
-    return direct_simulator
+    return service.direct_simulator
 
 def get_direct_simulator():
     """
-    Retourne l'instance du simulateur direct
+    Retourne le simulateur direct en cours d'exécution, ou None
     """
-    global direct_simulator
-    
-    # Si déjà dans session_state, utiliser celle-là
-    if 'direct_simulator' in st.session_state:
-        return st.session_state['direct_simulator']
-    
-    # Sinon, initialiser une nouvelle instance
-    return initialize_direct_simulator()
\ No newline at end of file
+    from utils.ingestion_service import get_ingestion_handle
+
+    return get_ingestion_handle().direct_simulator
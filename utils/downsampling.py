@@ -0,0 +1,163 @@
+"""
+Visual downsampling of time series before they are handed to plotly
+
+A line chart cannot show more than a couple of points per horizontal pixel,
+so anything beyond that only inflates the figure JSON and the browser work.
+Two reductions are provided, both vectorized with NumPy:
+
+- minmax: keeps the minimum and the maximum of each bucket, so every spike
+  survives; the cheapest option.
+- lttb: Largest-Triangle-Three-Buckets (Steinarsson, 2013), which keeps the
+  point forming the largest triangle with its neighbours and preserves the
+  visual shape. Large inputs are first reduced with minmax to a few
+  candidates per bucket (MinMaxLTTB, Van Der Donckt et al., 2023), so the
+  inherently sequential selection loop only looks at a handful of points per
+  bucket.
+"""
+
+import numpy as np
+
+# Typical width of a full-width chart; series are reduced to twice that many points
+DEFAULT_PIXEL_WIDTH = 1200
+METHODS = ('lttb', 'minmax')
+
+# MinMaxLTTB: candidates kept per output point before running LTTB
+PRESELECT_RATIO = 4
+
+
+def target_points(pixel_width=DEFAULT_PIXEL_WIDTH):
+    """Number of points worth drawing on a chart of this width (about 2 per pixel)"""
+    return 2 * int(pixel_width)
+
+
+def _as_numeric(x):
+    """int64/float64 view of an x axis (datetime64 values become epoch ns)"""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').view(np.int64)
+    return x
+
+
+def _bucket_matrix(start, stop, buckets):
+    """
+    Splits [start, stop) into equal-width buckets
+
+    Returns:
+    - Tuple (index matrix buckets x width, padded with each bucket's last index; bucket sizes)
+    """
+    edges = np.linspace(start, stop, buckets + 1).astype(np.int64)
+    sizes = np.diff(edges)
+    columns = np.arange(max(int(sizes.max()), 1))
+    matrix = edges[:-1, None] + np.minimum(columns, np.maximum(sizes, 1)[:, None] - 1)
+    return matrix, sizes
+
+
+def minmax_indices(y, n_out):
+    """
+    Indices of the minimum and maximum of n_out // 2 equal-count buckets, in order
+
+    The first and last points are always kept.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= n_out or n_out < 4:
+        return np.arange(n)
+    matrix, _ = _bucket_matrix(1, n - 1, (n_out - 2) // 2)
+    rows = np.arange(len(matrix))
+    values = y[matrix]
+    lows = matrix[rows, np.argmin(values, axis=1)]
+    highs = matrix[rows, np.argmax(values, axis=1)]
+    selected = np.concatenate(([0], np.sort(np.stack((lows, highs), axis=1), axis=1).ravel(), [n - 1]))
+    return np.unique(selected)
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Indices selected by Largest-Triangle-Three-Buckets
+
+    Parameters:
+    - x: Sorted x values (numeric or datetime64)
+    - y: Values, same length
+    - n_out: Number of points to keep (first and last included)
+
+    Returns:
+    - Sorted int64 index array of length min(n_out, len(y))
+    """
+    x = _as_numeric(x)
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    # Relative x keeps full float precision for epoch-ns timestamps
+    xf = (x - x[0]).astype(np.float64)
+    yf = np.asarray(y, dtype=np.float64)
+
+    matrix, sizes = _bucket_matrix(1, n - 1, n_out - 2)
+    bucket_x = xf[matrix]
+    bucket_y = yf[matrix]
+    # Average point of every bucket, then of the bucket that follows each one (last point for the last bucket)
+    rows = np.arange(len(matrix))
+    sums_x = np.add.reduceat(xf[1:n - 1], np.cumsum(sizes) - sizes)
+    sums_y = np.add.reduceat(yf[1:n - 1], np.cumsum(sizes) - sizes)
+    next_x = np.append(sums_x[1:] / sizes[1:], xf[-1])
+    next_y = np.append(sums_y[1:] / sizes[1:], yf[-1])
+
+    # The selected point of a bucket is the previous vertex of the next triangle: the loop is
+    # sequential, each step a vectorized argmax over one bucket
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    ax, ay = xf[0], yf[0]
+    for i in rows:
+        bx = bucket_x[i]
+        by = bucket_y[i]
+        cx = next_x[i]
+        cy = next_y[i]
+        j = int(np.argmax(np.abs((ax - cx) * (by - ay) - (ax - bx) * (cy - ay))))
+        selected[i + 1] = matrix[i, j]
+        ax, ay = bx[j], by[j]
+    return selected
+
+
+def downsample_indices(x, y, n_out, method='lttb'):
+    """
+    Indices of the points to draw
+
+    Parameters:
+    - x, y: Sorted series
+    - n_out: Target number of points
+    - method: 'lttb' (shape, via MinMaxLTTB on large inputs) or 'minmax' (extremes)
+
+    Returns:
+    - Sorted int64 index array
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown downsampling method: {method} (available: {METHODS})")
+    n = len(y)
+    if n <= n_out:
+        return np.arange(n)
+    if method == 'minmax':
+        return minmax_indices(y, n_out)
+    if n > PRESELECT_RATIO * n_out:
+        candidates = minmax_indices(y, PRESELECT_RATIO * n_out)
+        return candidates[lttb_indices(np.asarray(x)[candidates], np.asarray(y)[candidates], n_out)]
+    return lttb_indices(x, y, n_out)
+
+
+def downsample_frame(data, max_points=None, method='lttb', x='timestamp', y='value'):
+    """
+    Reduces a DataFrame to at most about max_points rows before plotting
+
+    Parameters:
+    - data: DataFrame sorted by x
+    - max_points: Target number of points (default: target_points())
+    - method: 'lttb' or 'minmax'
+    - x, y: Column names
+
+    Returns:
+    - The same DataFrame when it is already small enough, otherwise a row subset
+    """
+    max_points = target_points() if max_points is None else max_points
+    if len(data) <= max_points:
+        return data
+    indices = downsample_indices(data[x].to_numpy(), data[y].to_numpy(), max_points, method)
+    return data.iloc[indices]
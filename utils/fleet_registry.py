@@ -0,0 +1,351 @@
+"""
+Process-wide registry of the sensor fleet: sensors, mattresses and assignments
+
+The registry is built once per server process and indexed by sensor_id,
+mattress_id and sensor type. It changes incrementally: observe() registers
+the sensors first seen by the ingestion service (only when the live snapshot
+version moved), and assign()/unassign() apply configuration changes, which
+are persisted in the history store when one is available. Every change bumps
+`version`; the DataFrame views are rebuilt only when that version changed, so
+the pages that call get_sensors_data() several times per rerun share one frame.
+
+Live values are not copied into the records: live_frame() joins the sensor
+table against the columnar view of a snapshot in one vectorized merge
+(overlay_live), once per (registry version, snapshot version).
+"""
+
+import json
+import logging
+import random
+import threading
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.ingestion_service import get_ingestion_service
+
+logger = logging.getLogger(__name__)
+
+# Sensor types with their display names and units
+SENSOR_TYPES = [
+    ('temperature', 'Capteur de température', '°C'),
+    ('humidity', 'Capteur d\'humidité', '%'),
+    ('debit_urinaire', 'Débit urinaire', 'ml/h'),
+    ('poul', 'Pouls', 'bpm'),
+    ('creatine', 'Créatinine', 'mg/dL')
+]
+
+SENSOR_COLUMNS = ['id', 'name', 'type', 'status', 'power_connection', 'signal_strength', 'firmware_version',
+                  'installation_date', 'last_maintenance', 'mattress_id', 'is_mqtt_updated']
+MATTRESS_COLUMNS = ['id', 'name', 'status', 'patient_id', 'location', 'installation_date', 'last_maintenance']
+
+# History store setting holding the assignments changed from the configuration page
+ASSIGNMENTS_SETTING = "fleet_assignments"
+
+DEFAULT_SEED = 20240101
+
+
+def _demo_fleet(seed=DEFAULT_SEED, now=None):
+    """
+    Builds the demonstration fleet (20 sensors, 7 mattresses)
+
+    Seeded, so every process and every rerun sees the same fleet.
+
+    Returns:
+    - Tuple (list of sensor records, list of mattress records)
+    """
+    rng = random.Random(seed)
+    now = now or datetime.now()
+
+    def days_ago(low, high):
+        return (now - timedelta(days=rng.randint(low, high))).strftime('%Y-%m-%d')
+
+    sensors = []
+    for i in range(1, 21):
+        sensor_type = SENSOR_TYPES[i % len(SENSOR_TYPES)]
+        status = rng.choices(['active', 'inactive', 'maintenance', 'error'], weights=[0.7, 0.1, 0.1, 0.1], k=1)[0]
+        # Signal strength based on status
+        if status == 'active':
+            signal_strength = rng.randint(7, 10)
+        elif status == 'error':
+            signal_strength = rng.randint(1, 4)
+        else:
+            signal_strength = rng.randint(4, 8)
+        sensors.append({
+            'id': f"SEN-{200 + i}",
+            'name': f"{sensor_type[1]} {i}",
+            'type': sensor_type[0],
+            'status': status,
+            'power_connection': True,  # All sensors are plugged in
+            'signal_strength': signal_strength,
+            'firmware_version': f"v{rng.choice(['1.5', '1.8', '2.0', '2.1'])}",
+            'installation_date': days_ago(365, 730),
+            'last_maintenance': days_ago(1, 180),
+            # 90% of the sensors are distributed across mattresses
+            'mattress_id': f"MAT-{101 + (i // 3)}" if rng.random() < 0.9 else None,
+            'is_mqtt_updated': False
+        })
+
+    mattresses = []
+    for i in range(1, 8):
+        mattresses.append({
+            'id': f"MAT-{100 + i}",
+            'name': f"Mattress {i}",
+            'status': rng.choices(['active', 'maintenance', 'inactive'], weights=[0.8, 0.1, 0.1], k=1)[0],
+            'patient_id': f"P-{1000 + i}",
+            'location': rng.choice(['Ward A', 'Ward B', 'ICU', 'Recovery']),
+            'installation_date': days_ago(365, 1095),
+            'last_maintenance': days_ago(1, 180)
+        })
+    return sensors, mattresses
+
+
+class FleetRegistry:
+    """
+    Sensors, mattresses and assignments, indexed and versioned
+
+    Thread model: writers (observe, assign, update) serialize on a lock and
+    replace whole records; readers get the cached frames, which must be treated
+    as read-only since every session shares them.
+    """
+    def __init__(self, sensors=None, mattresses=None, store=None):
+        """
+        Parameters:
+        - sensors: Sensor records (default: the demonstration fleet)
+        - mattresses: Mattress records (default: the demonstration fleet)
+        - store: HistoryStore where assignment changes are persisted, optional
+        """
+        if sensors is None or mattresses is None:
+            demo_sensors, demo_mattresses = _demo_fleet()
+            sensors = demo_sensors if sensors is None else sensors
+            mattresses = demo_mattresses if mattresses is None else mattresses
+        self.store = store
+        self._lock = threading.RLock()
+        self._sensors = {}
+        self._by_mattress = {}
+        self._by_type = {}
+        self._mattresses = {record['id']: dict(record) for record in mattresses}
+        for record in sensors:
+            self._index(dict(record))
+        self._apply_saved_assignments()
+
+        self.version = 1
+        self.observed_version = None
+        self._sensors_frame = None
+        self._sensors_frame_version = None
+        self._mattresses_frame = None
+        self._mattresses_frame_version = None
+        self._live_frame = None
+        self._live_frame_key = None
+
+    # ------------------------------------------------------------------ indexes
+
+    def _index(self, record):
+        previous = self._sensors.get(record['id'])
+        if previous is not None:
+            self._by_mattress.get(previous['mattress_id'], set()).discard(previous['id'])
+            self._by_type.get(previous['type'], set()).discard(previous['id'])
+        self._sensors[record['id']] = record
+        self._by_mattress.setdefault(record['mattress_id'], set()).add(record['id'])
+        self._by_type.setdefault(record['type'], set()).add(record['id'])
+
+    def _apply_saved_assignments(self):
+        if self.store is None:
+            return
+        try:
+            saved = json.loads(self.store.get_setting(ASSIGNMENTS_SETTING, "{}"))
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Ignoring saved fleet assignments: {e}")
+            return
+        for sensor_id, mattress_id in saved.items():
+            record = self._sensors.get(sensor_id)
+            if record is not None:
+                self._index({**record, 'mattress_id': mattress_id})
+
+    # ------------------------------------------------------------------ reads
+
+    def get_sensor(self, sensor_id):
+        """Record of a sensor, or None"""
+        return self._sensors.get(sensor_id)
+
+    def get_mattress(self, mattress_id):
+        """Record of a mattress, or None"""
+        return self._mattresses.get(mattress_id)
+
+    def mattress_of(self, sensor_id):
+        """Mattress a sensor is assigned to (None if unassigned or unknown)"""
+        record = self._sensors.get(sensor_id)
+        return record['mattress_id'] if record is not None else None
+
+    def sensors_on(self, mattress_id):
+        """IDs of the sensors assigned to a mattress (None: unassigned sensors), sorted"""
+        return sorted(self._by_mattress.get(mattress_id, ()))
+
+    def sensors_of_type(self, sensor_type):
+        """IDs of the sensors of a type, sorted"""
+        return sorted(self._by_type.get(sensor_type, ()))
+
+    def sensors_frame(self):
+        """
+        DataFrame of every sensor, rebuilt only when the registry changed
+
+        Returns:
+        - Shared DataFrame (do not modify) with SENSOR_COLUMNS, without live values
+          (see live_frame); attrs hold 'fleet_version'
+        """
+        with self._lock:
+            if self._sensors_frame_version != self.version:
+                frame = pd.DataFrame(list(self._sensors.values()), columns=SENSOR_COLUMNS)
+                frame.attrs['fleet_version'] = self.version
+                self._sensors_frame = frame
+                self._sensors_frame_version = self.version
+            return self._sensors_frame
+
+    def mattresses_frame(self):
+        """Shared DataFrame (do not modify) of every mattress, rebuilt only when the registry changed"""
+        with self._lock:
+            if self._mattresses_frame_version != self.version:
+                self._mattresses_frame = pd.DataFrame(list(self._mattresses.values()), columns=MATTRESS_COLUMNS)
+                self._mattresses_frame_version = self.version
+            return self._mattresses_frame
+
+    # ------------------------------------------------------------------ writes
+
+    def observe(self, snapshot):
+        """
+        Registers the sensors the ingestion service reports but the registry does not know yet
+
+        O(1) when the snapshot version has not changed since the last call;
+        otherwise one set difference between the snapshot and registry IDs.
+
+        Parameters:
+        - snapshot: Snapshot of the ingestion service
+
+        Returns:
+        - True if the registry changed
+        """
+        if snapshot.version == self.observed_version:
+            return False
+        with self._lock:
+            unknown = snapshot.data.keys() - self._sensors.keys()
+            for sensor_id in sorted(unknown):
+                self._index(self._record_from_live(sensor_id, snapshot.data[sensor_id]))
+            self.observed_version = snapshot.version
+            if unknown:
+                self.version += 1
+        return bool(unknown)
+
+    @staticmethod
+    def _record_from_live(sensor_id, live):
+        today = datetime.now().strftime('%Y-%m-%d')
+        return {
+            'id': sensor_id,
+            'name': live.get('name', sensor_id),
+            'type': live.get('type', 'unknown'),
+            'status': 'active',
+            'power_connection': True,
+            'signal_strength': 10,
+            'firmware_version': 'v2.1',
+            'installation_date': today,
+            'last_maintenance': today,
+            'mattress_id': live.get('mattress_id'),
+            'is_mqtt_updated': False
+        }
+
+    def live_frame(self, snapshot):
+        """
+        Sensor table with the live values of a snapshot overlaid (see overlay_live)
+
+        Cached per (registry version, snapshot version): one merge per new snapshot,
+        shared by every caller.
+
+        Returns:
+        - Shared DataFrame (do not modify): SENSOR_COLUMNS + 'value'
+        """
+        with self._lock:
+            key = (self.version, snapshot.version)
+            if self._live_frame_key != key:
+                self._live_frame = overlay_live(self.sensors_frame(), snapshot)
+                self._live_frame_key = key
+            return self._live_frame
+
+    def update_sensor(self, sensor_id, **fields):
+        """
+        Changes fields of a sensor record
+
+        Returns:
+        - True if the sensor exists
+        """
+        with self._lock:
+            record = self._sensors.get(sensor_id)
+            if record is None:
+                return False
+            self._index({**record, **fields})
+            self.version += 1
+            return True
+
+    def assign(self, sensor_id, mattress_id):
+        """
+        Assigns a sensor to a mattress (None unassigns it) and persists the change
+
+        Returns:
+        - True if the sensor exists
+        """
+        with self._lock:
+            if not self.update_sensor(sensor_id, mattress_id=mattress_id):
+                return False
+            if self.store is not None:
+                try:
+                    saved = json.loads(self.store.get_setting(ASSIGNMENTS_SETTING, "{}"))
+                    saved[sensor_id] = mattress_id
+                    self.store.set_setting(ASSIGNMENTS_SETTING, json.dumps(saved))
+                except Exception as e:
+                    logger.error(f"Could not persist the assignment of {sensor_id}: {e}")
+            return True
+
+    def unassign(self, sensor_id):
+        """Removes a sensor from its mattress"""
+        return self.assign(sensor_id, None)
+
+
+def overlay_live(fleet, snapshot):
+    """
+    Joins a sensor table against the columnar view of a snapshot in one vectorized pass
+
+    Assigned sensors with a live value are marked live ('is_mqtt_updated'), active,
+    with a signal strength of at least 8; every sensor gets its live 'value' (NaN if none).
+
+    Parameters:
+    - fleet: Sensor table (SENSOR_COLUMNS)
+    - snapshot: Snapshot of the ingestion service
+
+    Returns:
+    - New DataFrame: fleet columns + 'value'; attrs hold 'fleet_version' and 'snapshot_version'
+    """
+    live = snapshot.frame()
+    positions = live.index.get_indexer(fleet['id'])
+    # Only found positions index the live values (-1 would wrap around, or fail on an empty snapshot)
+    found = positions >= 0
+    values = np.full(len(positions), np.nan)
+    values[found] = live['value'].to_numpy(dtype=np.float64)[positions[found]]
+    is_live = fleet['mattress_id'].notna().to_numpy() & ~np.isnan(values)
+
+    frame = fleet.copy(deep=False)  # Only the overlaid columns are replaced
+    frame['is_mqtt_updated'] = is_live
+    frame['status'] = np.where(is_live, 'active', fleet['status'].to_numpy())
+    frame['signal_strength'] = np.where(is_live, np.maximum(fleet['signal_strength'].to_numpy(), 8),
+                                        fleet['signal_strength'].to_numpy())
+    frame['value'] = values
+    frame.attrs['snapshot_version'] = snapshot.version
+    return frame
+
+
+@st.cache_resource
+def get_fleet_registry():
+    """
+    Returns the fleet registry of the server process
+    Created once (Streamlit resource cache), persisting assignments in the shared history store
+    """
+    return FleetRegistry(store=get_ingestion_service().history_store)
@@ -0,0 +1,273 @@
+"""
+Gorilla-style compressed chunks for float sensor series
+
+Timestamps are stored as delta-of-deltas (zero for regularly sampled series)
+and values as the XOR of each float64 with the previous one (mostly zero bits
+for slowly changing series), as in Facebook's Gorilla TSDB.
+
+Unlike Gorilla, the variable-length control bits are not written per point:
+points are grouped in blocks of BLOCK_SIZE, and each block stores one bit
+width for its delta-of-deltas and one (shift, width) window for its XORs.
+Every point of a block then takes exactly that many bits, so a whole chunk
+packs and unpacks with a handful of vectorized NumPy operations instead of a
+bit-by-bit Python loop. Blocks where many values repeat the previous one
+(the common case for slowly changing sensors) also carry a one-bit-per-point
+"changed" mask, and only the changed points pay for their XOR bits.
+
+Chunk layout (little endian):
+- header: version (u8), count (u32), first timestamp (i64), first delta (i64),
+  first value bits (u64)
+- one (dod width, xor shift | MASKED, xor width) u8 triple per block
+- bit streams, MSB first: delta-of-deltas (zigzag encoded), changed masks of
+  the MASKED blocks, XORs
+"""
+
+import struct
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+CHUNK_VERSION = 1
+BLOCK_SIZE = 128
+DEFAULT_CHUNK_SIZE = 1024
+
+CHUNK_HEADER = struct.Struct("<BIqqQ")
+
+# Flag set on the shift byte of blocks that carry a changed mask
+MASKED = 0x80
+
+_COLUMNS = np.arange(64)
+
+
+def _zigzag(values):
+    """Maps signed int64 to uint64 so that small magnitudes get few significant bits"""
+    return ((values << 1) ^ (values >> 63)).view(np.uint64)
+
+
+def _unzigzag(words):
+    return (words >> np.uint64(1)).view(np.int64) ^ -(words & np.uint64(1)).view(np.int64)
+
+
+def _block_or(words):
+    """Bitwise OR of the words of each block, as Python ints"""
+    return np.bitwise_or.reduceat(words, np.arange(0, len(words), BLOCK_SIZE)).tolist()
+
+
+def _point_widths(block_widths, count):
+    """Per-point bit width from the per-block widths"""
+    return np.repeat(np.asarray(block_widths, dtype=np.int64), BLOCK_SIZE)[:count]
+
+
+def _pack(words, widths):
+    """Concatenates the low widths[i] bits of each word (MSB first) into bytes"""
+    if not widths.any():
+        return b""
+    bits = np.unpackbits(words.astype('>u8').view(np.uint8).reshape(-1, 8), axis=1)
+    return np.packbits(bits[_COLUMNS >= (64 - widths)[:, None]]).tobytes()
+
+
+def _unpack(data, offset, widths):
+    """
+    Reads back words packed by _pack
+
+    Each word starts at a known bit offset and spans at most 9 bytes: those
+    bytes are gathered for all points at once and shifted into place.
+
+    Returns:
+    - Tuple (uint64 words, offset just past the bit stream)
+    """
+    total = int(widths.sum())
+    if total == 0:
+        return np.zeros(len(widths), dtype=np.uint64), offset
+    size = (total + 7) // 8
+    stream = np.zeros(size + 9, dtype=np.uint8)
+    stream[:size] = np.frombuffer(data, dtype=np.uint8, count=size, offset=offset)
+    starts = np.cumsum(widths) - widths
+    windows = sliding_window_view(stream, 9)[starts >> 3]
+    high = np.ascontiguousarray(windows[:, :8]).view('>u8').ravel().astype(np.uint64)
+    low = windows[:, 8].astype(np.uint64)
+    shift = (starts & 7).astype(np.uint64)
+    words = (high << shift) | (low >> (np.uint64(8) - shift))
+    words >>= np.minimum(64 - widths, 63).astype(np.uint64)
+    words[widths == 0] = 0
+    return words, offset + size
+
+
+def encode_chunk(timestamps_ns, values):
+    """
+    Compresses one series segment
+
+    Parameters:
+    - timestamps_ns: int64 epoch-ns timestamps, in append order
+    - values: float64 values, same length (at least one point)
+
+    Returns:
+    - bytes
+    """
+    timestamps_ns = np.asarray(timestamps_ns, dtype=np.int64)
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    count = len(timestamps_ns)
+    if count == 0 or len(values) != count:
+        raise ValueError("a chunk needs at least one point and as many values as timestamps")
+
+    # delta_0 is taken equal to delta_1 so that a regular series has only zero delta-of-deltas
+    deltas = np.diff(timestamps_ns, prepend=timestamps_ns[0])
+    first_delta = int(deltas[1]) if count > 1 else 0
+    deltas[0] = first_delta
+    dods = _zigzag(np.diff(deltas, prepend=first_delta))
+
+    bits = values.view(np.uint64)
+    xors = bits ^ np.concatenate((bits[:1], bits[:-1]))
+
+    dod_widths = [word.bit_length() for word in _block_or(dods)]
+    unchanged = np.add.reduceat(xors == 0, np.arange(0, count, BLOCK_SIZE)).tolist()
+    xor_shifts = []
+    xor_widths = []
+    for word, repeats in zip(_block_or(xors), unchanged):
+        shift = (word & -word).bit_length() - 1 if word else 0
+        width = (word >> shift).bit_length()
+        xor_widths.append(width)
+        # The mask costs one bit per point and saves `width` bits per repeated value
+        xor_shifts.append(shift | MASKED if repeats * width > BLOCK_SIZE else shift)
+
+    flags = _point_widths(xor_shifts, count)
+    masked = (flags & MASKED) != 0
+    changed = xors[masked] != 0
+    xor_point_widths = _point_widths(xor_widths, count)
+    xor_point_widths[masked] *= changed
+    descriptors = np.array([dod_widths, xor_shifts, xor_widths], dtype=np.uint8).T
+    return b"".join((
+        CHUNK_HEADER.pack(CHUNK_VERSION, count, int(timestamps_ns[0]), first_delta, int(bits[0])),
+        descriptors.tobytes(),
+        _pack(dods, _point_widths(dod_widths, count)),
+        np.packbits(changed).tobytes(),
+        _pack(xors >> (flags & ~MASKED).astype(np.uint64), xor_point_widths)
+    ))
+
+
+def chunk_count(data):
+    """Number of points in an encoded chunk, read from its header"""
+    return CHUNK_HEADER.unpack_from(data)[1]
+
+
+def decode_chunk(data):
+    """
+    Decompresses a chunk produced by encode_chunk
+
+    Returns:
+    - Tuple (timestamps_ns int64 array, values float64 array)
+    """
+    version, count, first_ts, first_delta, first_bits = CHUNK_HEADER.unpack_from(data)
+    if version != CHUNK_VERSION:
+        raise ValueError(f"Unsupported chunk version: {version}")
+    blocks = -(-count // BLOCK_SIZE)
+    offset = CHUNK_HEADER.size
+    descriptors = np.frombuffer(data, dtype=np.uint8, count=3 * blocks, offset=offset).reshape(blocks, 3)
+    offset += 3 * blocks
+
+    dods, offset = _unpack(data, offset, _point_widths(descriptors[:, 0], count))
+    deltas = first_delta + np.cumsum(_unzigzag(dods))
+    timestamps_ns = (first_ts - first_delta) + np.cumsum(deltas)
+
+    flags = _point_widths(descriptors[:, 1], count)
+    masked = (flags & MASKED) != 0
+    xor_widths = _point_widths(descriptors[:, 2], count)
+    masked_count = int(masked.sum())
+    if masked_count:
+        changed = np.unpackbits(np.frombuffer(data, dtype=np.uint8, count=(masked_count + 7) // 8, offset=offset),
+                                count=masked_count)
+        xor_widths[masked] *= changed
+        offset += (masked_count + 7) // 8
+    xors, offset = _unpack(data, offset, xor_widths)
+    xors <<= (flags & ~MASKED).astype(np.uint64)
+    bits = np.bitwise_xor.accumulate(xors) ^ np.uint64(first_bits)
+    return timestamps_ns, bits.view(np.float64)
+
+
+class CompressedSeries:
+    """
+    Append-only compressed series: sealed chunks plus an uncompressed open tail
+
+    Appends go to the tail in O(1); every chunk_size points the tail is encoded
+    and sealed. Reads decode only the chunks overlapping the requested range.
+    """
+    __slots__ = ('chunk_size', 'chunks', '_tail_ts', '_tail_values', '_sealed_points')
+
+    def __init__(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Parameters:
+        - chunk_size: Points per sealed chunk
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+        self.chunk_size = chunk_size
+        self.chunks = []  # (first_ts, last_ts, bytes)
+        self._tail_ts = []
+        self._tail_values = []
+        self._sealed_points = 0
+
+    def __len__(self):
+        return self._sealed_points + len(self._tail_ts)
+
+    @property
+    def nbytes(self):
+        """Encoded size of the sealed chunks plus 16 bytes per tail point"""
+        return sum(len(chunk[2]) for chunk in self.chunks) + 16 * len(self._tail_ts)
+
+    def append(self, timestamp_ns, value):
+        """Appends one sample"""
+        self._tail_ts.append(int(timestamp_ns))
+        self._tail_values.append(float(value))
+        if len(self._tail_ts) >= self.chunk_size:
+            self.seal()
+
+    def extend(self, timestamps_ns, values):
+        """Appends many samples; whole chunks are encoded straight from the input arrays"""
+        timestamps_ns = np.asarray(timestamps_ns, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64)
+        position = 0
+        if self._tail_ts:
+            position = min(len(timestamps_ns), self.chunk_size - len(self._tail_ts))
+            self._tail_ts.extend(timestamps_ns[:position].tolist())
+            self._tail_values.extend(values[:position].tolist())
+            if len(self._tail_ts) >= self.chunk_size:
+                self.seal()
+        while len(timestamps_ns) - position >= self.chunk_size:
+            end = position + self.chunk_size
+            self._seal_arrays(timestamps_ns[position:end], values[position:end])
+            position = end
+        self._tail_ts.extend(timestamps_ns[position:].tolist())
+        self._tail_values.extend(values[position:].tolist())
+
+    def seal(self):
+        """Encodes the open tail into a chunk (no-op when the tail is empty)"""
+        if self._tail_ts:
+            self._seal_arrays(np.array(self._tail_ts, dtype=np.int64),
+                              np.array(self._tail_values, dtype=np.float64))
+            self._tail_ts = []
+            self._tail_values = []
+
+    def _seal_arrays(self, timestamps_ns, values):
+        self.chunks.append((int(timestamps_ns.min()), int(timestamps_ns.max()), encode_chunk(timestamps_ns, values)))
+        self._sealed_points += len(timestamps_ns)
+
+    def decode(self, start_ns=None, end_ns=None):
+        """
+        Returns the samples with start_ns <= timestamp < end_ns
+
+        Returns:
+        - Tuple (timestamps_ns int64 array, values float64 array), in append order
+        """
+        start_ns = -(1 << 63) if start_ns is None else int(start_ns)
+        end_ns = (1 << 63) - 1 if end_ns is None else int(end_ns)
+        parts = [decode_chunk(data) for first, last, data in self.chunks if last >= start_ns and first < end_ns]
+        if self._tail_ts:
+            parts.append((np.array(self._tail_ts, dtype=np.int64), np.array(self._tail_values, dtype=np.float64)))
+        if not parts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        timestamps_ns = np.concatenate([part[0] for part in parts])
+        values = np.concatenate([part[1] for part in parts])
+        if timestamps_ns[0] < start_ns or timestamps_ns[-1] >= end_ns:
+            keep = (timestamps_ns >= start_ns) & (timestamps_ns < end_ns)
+            timestamps_ns, values = timestamps_ns[keep], values[keep]
+        return timestamps_ns, values
@@ -0,0 +1,878 @@
+"""
+Durable sensor history backed by SQLite in WAL mode
+
+The ingest path hands readings to HistoryStore.append_many(); a single writer
+thread group-commits them every `commit_rows` readings or `commit_interval_ms`
+milliseconds, whichever comes first, so the cost of a transaction is shared by
+thousands of rows. Readings are clustered by (sensor, timestamp) in a
+WITHOUT ROWID table: a window query for one sensor is a single range scan.
+Readers use their own connections and never block the writer (WAL).
+
+Each commit also folds its readings into rollup tiers (1 min, 5 min, 1 h, 2 h
+buckets holding count/min/max/sum/last), in the same transaction, so a day,
+week or month view reads O(buckets) rows instead of every raw reading.
+
+Once readings are old enough not to receive late arrivals, the compaction
+thread seals them into Gorilla-compressed chunks (see utils.gorilla) of
+DEFAULT_CHUNK_SIZE points: about 6 bytes per noisy reading, under 1 byte for
+slowly changing ones, instead of a ~30 byte B-tree row. Raw queries read the
+overlapping chunks and the unsealed readings in one snapshot.
+
+Expiry and space reclamation (see utils.compaction) run in small transactions
+on a separate maintenance connection; new databases use incremental
+auto-vacuum so freed pages can be returned to the file system a few at a time.
+
+Readings waiting for a commit only live in RAM; with `wal_path` set they are
+also logged to an append-only write-ahead log (see utils.ingest_wal) that is
+fsynced by group commit every `wal_sync_interval_ms` and truncated once the
+readings are committed. On open, whatever the log still holds is replayed
+into the database and kept in `recovered` for the in-memory buffers.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.gorilla import DEFAULT_CHUNK_SIZE, encode_chunk, decode_chunk
+from utils.ingest_wal import IngestWAL, encode_record, replay_segments
+from utils.timeseries import epoch_ns_to_datetime64
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "history.db")
+DEFAULT_WAL_PATH = os.path.join(os.path.dirname(DEFAULT_DB_PATH), "ingest.wal")
+
+# Rollup bucket widths in seconds, matching the get_sensor_readings display intervals
+ROLLUP_TIERS = (60, 300, 3600, 7200)
+
+# Aggregates computed by query() inside the store
+AGGREGATES = ('mean', 'min', 'max', 'sum', 'count', 'last')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sensors (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS readings (
+    sensor INTEGER NOT NULL,
+    ts INTEGER NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (sensor, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS chunks (
+    sensor INTEGER NOT NULL,
+    start_ts INTEGER NOT NULL,
+    end_ts INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    min REAL NOT NULL,
+    max REAL NOT NULL,
+    sum REAL NOT NULL,
+    last REAL NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS chunks_by_end ON chunks(sensor, end_ts);
+CREATE TABLE IF NOT EXISTS rollups (
+    tier INTEGER NOT NULL,
+    sensor INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    min REAL NOT NULL,
+    max REAL NOT NULL,
+    sum REAL NOT NULL,
+    last REAL NOT NULL,
+    last_ts INTEGER NOT NULL,
+    PRIMARY KEY (tier, sensor, bucket)
+) WITHOUT ROWID;
+"""
+
+# Merges a partial bucket into the stored one; 'last' keeps the most recent reading
+ROLLUP_UPSERT = """
+INSERT INTO rollups(tier, sensor, bucket, count, min, max, sum, last, last_ts)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(tier, sensor, bucket) DO UPDATE SET
+    count = count + excluded.count,
+    min = min(min, excluded.min),
+    max = max(max, excluded.max),
+    sum = sum + excluded.sum,
+    last = CASE WHEN excluded.last_ts >= last_ts THEN excluded.last ELSE last END,
+    last_ts = max(last_ts, excluded.last_ts)
+"""
+
+
+def aggregate_buckets(sensors, timestamps_ns, values, width_ns):
+    """
+    Aggregates readings per (sensor, bucket) in one vectorized pass
+
+    Parameters:
+    - sensors, timestamps_ns, values: Arrays sorted by (sensor, timestamp)
+    - width_ns: Bucket width in nanoseconds
+
+    Returns:
+    - Tuple of arrays (sensor, bucket, count, min, max, sum, last, last_ts), one entry per bucket
+    """
+    buckets = timestamps_ns // width_ns * width_ns
+    change = np.empty(len(values), dtype=bool)
+    change[0] = True
+    change[1:] = (sensors[1:] != sensors[:-1]) | (buckets[1:] != buckets[:-1])
+    starts = np.flatnonzero(change)
+    ends = np.append(starts[1:], len(values))
+    return (sensors[starts], buckets[starts], ends - starts,
+            np.minimum.reduceat(values, starts), np.maximum.reduceat(values, starts),
+            np.add.reduceat(values, starts), values[ends - 1], timestamps_ns[ends - 1])
+
+
+def _merge_partials(partials):
+    """
+    Combines partial aggregates that may share buckets
+
+    Parameters:
+    - partials: List of tuples of arrays (bucket, count, min, max, sum, last, last_ts)
+
+    Returns:
+    - One such tuple with a single entry per bucket, sorted by bucket
+    """
+    if not partials:
+        empty_int, empty_float = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        return empty_int, empty_int, empty_float, empty_float, empty_float, empty_float, empty_int
+    bucket, count, minimum, maximum, total, last, last_ts = (np.concatenate(column) for column in zip(*partials))
+    if len(partials) > 1 or (len(bucket) > 1 and (np.diff(bucket) <= 0).any()):
+        order = np.lexsort((last_ts, bucket))
+        bucket, count, minimum, maximum, total, last, last_ts = (
+            column[order] for column in (bucket, count, minimum, maximum, total, last, last_ts))
+    change = np.empty(len(bucket), dtype=bool)
+    change[0] = True
+    change[1:] = bucket[1:] != bucket[:-1]
+    starts = np.flatnonzero(change)
+    ends = np.append(starts[1:], len(bucket)) - 1
+    return (bucket[starts], np.add.reduceat(count, starts).astype(np.int64), np.minimum.reduceat(minimum, starts),
+            np.maximum.reduceat(maximum, starts), np.add.reduceat(total, starts), last[ends], last_ts[ends])
+
+
+def _empty_frame():
+    return pd.DataFrame({'timestamp': pd.Series(dtype='datetime64[ns]'),
+                         'value': pd.Series(dtype='float64')})
+
+
+class HistoryStore:
+    """
+    Append-mostly time-series store with group commits
+
+    Thread model: any number of producer threads call append_many(); one
+    background writer owns the write connection; each reader thread lazily
+    opens its own read connection.
+    """
+    def __init__(self, path=DEFAULT_DB_PATH, commit_rows=5000, commit_interval_ms=250, max_pending=1_000_000,
+                 wal_path=None, wal_sync_interval_ms=50, wal_fsync=True):
+        """
+        Opens (or creates) the database and starts the writer thread
+
+        Parameters:
+        - path: SQLite database file (':memory:' is not supported: readers need their own connections)
+        - commit_rows: Commit as soon as this many readings are pending
+        - commit_interval_ms: Commit pending readings at least this often
+        - max_pending: Readings buffered while the disk is slow; beyond that the oldest are dropped
+        - wal_path: Write-ahead log for the readings not yet committed (None: no log)
+        - wal_sync_interval_ms: Group-commit interval of the log (see IngestWAL)
+        - wal_fsync: fsync the log (False: process crashes only)
+        """
+        self.path = path
+        self.commit_rows = commit_rows
+        self.commit_interval = commit_interval_ms / 1000.0
+        self.max_pending = max_pending
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # auto_vacuum must be set before the first page is written (WAL switch included),
+        # so it only takes effect on a new database
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.close()
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        self._sensor_keys = {name: key for key, name in conn.execute("SELECT id, name FROM sensors")}
+        if conn.execute("SELECT 1 FROM rollups LIMIT 1").fetchone() is None and \
+                conn.execute("SELECT 1 FROM readings LIMIT 1").fetchone() is not None:
+            self._rebuild_rollups(conn)
+
+        self._cond = threading.Condition()
+        self._pending = []
+        self._enqueued = 0
+        self._committed = 0
+        self._flush_requested = False
+        self._stopping = False
+        self._local = threading.local()
+        self._maintenance_conn = None
+
+        self.rows_written = 0
+        self.commits = 0
+        self.dropped = 0
+        self.failed_commits = 0
+        self.last_error = None
+        self.last_commit_rows = 0
+        self.last_commit_ms = 0.0
+
+        # Readings of the previous process that never reached a commit; the log restarts empty
+        self.recovered = []
+        self.wal = None
+        if wal_path is not None:
+            self.recovered = self._replay_wal(conn, wal_path)
+            self.wal = IngestWAL(wal_path, wal_sync_interval_ms, wal_fsync)
+        conn.close()
+
+        self._writer = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self._writer.start()
+        logger.info(f"History store opened at {path} ({len(self._sensor_keys)} sensors)")
+
+    def _replay_wal(self, conn, wal_path, batch=50_000):
+        rows, segments = replay_segments(wal_path)
+        # A segment can outlive the commit of some of its readings: skip those, their rollups are counted
+        keys = self._sensor_keys
+        missing = [row for row in rows if row[0] not in keys or conn.execute(
+            "SELECT 1 FROM readings WHERE sensor = ? AND ts = ?", (keys[row[0]], int(row[1]))).fetchone() is None]
+        for start in range(0, len(missing), batch):
+            self._commit(conn, missing[start:start + batch])
+        for segment in segments:
+            os.remove(segment)
+        if rows:
+            logger.warning(f"Replayed {len(missing)} of {len(rows)} logged readings from {wal_path}")
+        return rows
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL: a commit survives an application crash; only an OS crash can lose the last commits
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # ------------------------------------------------------------------ writes
+
+    def append(self, sensor_id, timestamp_ns, value):
+        """Queues one reading"""
+        self.append_many([(sensor_id, timestamp_ns, value)])
+
+    def append_many(self, rows):
+        """
+        Queues readings for the next group commit
+
+        Parameters:
+        - rows: List of (sensor_id, timestamp_ns, value)
+        """
+        if not rows:
+            return
+        # Encoded outside the lock; logged under it so the log and the queue number readings alike
+        record = encode_record(rows) if self.wal is not None else None
+        with self._cond:
+            if record is not None:
+                self.wal.append_record(record, len(rows))
+            self._pending.extend(rows)
+            self._enqueued += len(rows)
+            overflow = len(self._pending) - self.max_pending
+            if overflow > 0:
+                del self._pending[:overflow]
+                self.dropped += overflow
+            if len(self._pending) >= self.commit_rows:
+                self._cond.notify_all()
+
+    def flush(self, timeout=10.0):
+        """
+        Waits until every reading queued so far is committed
+
+        Returns:
+        - True if everything was committed before the timeout; False on timeout, when a commit
+          fails in the meantime (see last_error; the readings stay queued for a retry unless the
+          batch itself cannot be stored) or when the store stops first
+        """
+        with self._cond:
+            target = self._enqueued
+            failures = self.failed_commits
+            self._flush_requested = True
+            self._cond.notify_all()
+            self._cond.wait_for(lambda: (self._committed >= target or self._stopping
+                                         or self.failed_commits > failures), timeout)
+            return self._committed >= target and self.failed_commits == failures
+
+    def _run(self):
+        """Writer loop: collects pending readings and commits them in one transaction"""
+        conn = self._connect()
+        try:
+            while True:
+                with self._cond:
+                    deadline = time.monotonic() + self.commit_interval
+                    while (not self._stopping and not self._flush_requested
+                           and len(self._pending) < self.commit_rows):
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                    rows, self._pending = self._pending, []
+                    target = self._enqueued
+                    stopping = self._stopping
+                    self._flush_requested = False
+
+                if rows:
+                    try:
+                        self._commit(conn, rows)
+                    except sqlite3.OperationalError as e:
+                        # Locked database, I/O error, full disk: the batch is retried
+                        conn.rollback()
+                        self._requeue(rows, e, stopping)
+                        if stopping:
+                            break
+                        # Retried with the next batch, after a pause so a persistent error does not spin
+                        with self._cond:
+                            self._cond.wait_for(lambda: self._stopping, self.commit_interval)
+                        continue
+                    except sqlite3.Error as e:
+                        # The batch itself cannot be stored (constraint, bad value): retrying would block the queue
+                        conn.rollback()
+                        with self._cond:
+                            self.failed_commits += 1
+                            self.last_error = str(e)
+                            self.dropped += len(rows)
+                        logger.error(f"History commit failed ({len(rows)} readings dropped): {e}")
+
+                # Only what is committed may leave the log and count as flushed
+                if self.wal is not None:
+                    try:
+                        self.wal.checkpoint(target)
+                    except OSError as e:
+                        logger.error(f"Write-ahead log checkpoint failed: {e}")
+
+                with self._cond:
+                    self._committed = target
+                    self._cond.notify_all()
+                if stopping:
+                    break
+        finally:
+            conn.close()
+
+    def _requeue(self, rows, error, stopping):
+        """
+        Puts the readings of a failed commit back at the head of the queue (the log still holds
+        them) and wakes up flush() waiters so they can report the failure
+        """
+        with self._cond:
+            self.failed_commits += 1
+            self.last_error = str(error)
+            if stopping:
+                logger.error(f"History commit failed on close ({len(rows)} readings left to the log replay): {error}")
+            else:
+                self._pending[:0] = rows
+                overflow = len(self._pending) - self.max_pending
+                if overflow > 0:
+                    del self._pending[:overflow]
+                    self.dropped += overflow
+                logger.error(f"History commit failed ({len(rows)} readings queued for retry): {error}")
+            self._cond.notify_all()
+
+    def _commit(self, conn, rows):
+        start = time.perf_counter()
+        known = self._sensor_keys
+        # Keys of new sensors are only published once their rows are committed (a rollback drops them)
+        new_keys = {}
+        with conn:
+            for sensor_id in {row[0] for row in rows} - known.keys():
+                cursor = conn.execute("INSERT OR IGNORE INTO sensors(name) VALUES (?)", (sensor_id,))
+                key = cursor.lastrowid if cursor.rowcount else \
+                    conn.execute("SELECT id FROM sensors WHERE name = ?", (sensor_id,)).fetchone()[0]
+                new_keys[sensor_id] = key
+            keys = {**known, **new_keys} if new_keys else known
+            records = self._insert_readings(
+                conn, [(keys[sensor_id], int(ts_ns), float(value)) for sensor_id, ts_ns, value in rows])
+            if records:
+                sensors, timestamps_ns, values = (np.array(column) for column in zip(*records))
+                self._update_rollups(conn, sensors.astype(np.int64), timestamps_ns.astype(np.int64),
+                                     values.astype(np.float64))
+        known.update(new_keys)
+        self.rows_written += len(records)
+        self.commits += 1
+        self.last_commit_rows = len(rows)
+        self.last_commit_ms = (time.perf_counter() - start) * 1000
+
+    @staticmethod
+    def _insert_readings(conn, records):
+        """
+        Inserts raw readings, keeping the stored value of a (sensor, ts) already present
+
+        A duplicate (write-ahead log replay, QoS 1 redelivery) must not be counted again by
+        the rollups, so only the readings actually inserted are returned. Batches without
+        duplicates go through one executemany; otherwise the batch is redone row by row.
+
+        Returns:
+        - List of the (sensor, ts, value) records inserted
+        """
+        conn.execute("SAVEPOINT insert_readings")
+        before = conn.total_changes
+        conn.executemany("INSERT OR IGNORE INTO readings(sensor, ts, value) VALUES (?, ?, ?)", records)
+        if conn.total_changes - before != len(records):
+            conn.execute("ROLLBACK TO insert_readings")
+            insert = "INSERT OR IGNORE INTO readings(sensor, ts, value) VALUES (?, ?, ?)"
+            records = [record for record in records if conn.execute(insert, record).rowcount]
+        conn.execute("RELEASE insert_readings")
+        return records
+
+    def _update_rollups(self, conn, sensors, timestamps_ns, values):
+        """Folds readings into every rollup tier (inside the caller's transaction)"""
+        order = np.lexsort((timestamps_ns, sensors))
+        sensors, timestamps_ns, values = sensors[order], timestamps_ns[order], values[order]
+        for tier in ROLLUP_TIERS:
+            columns = aggregate_buckets(sensors, timestamps_ns, values, tier * 1_000_000_000)
+            conn.executemany(ROLLUP_UPSERT, ((tier, *row) for row in zip(*(c.tolist() for c in columns))))
+
+    def _rebuild_rollups(self, conn, chunk=1_000_000):
+        """Builds the rollup tiers from raw readings (database written before rollups existed)"""
+        logger.info("Building rollup tiers from stored readings")
+        with conn:
+            conn.execute("DELETE FROM rollups")
+            cursor = conn.execute("SELECT sensor, ts, value FROM readings ORDER BY sensor, ts")
+            while True:
+                rows = cursor.fetchmany(chunk)
+                if not rows:
+                    break
+                sensors, timestamps_ns, values = (np.array(column) for column in zip(*rows))
+                self._update_rollups(conn, sensors.astype(np.int64), timestamps_ns.astype(np.int64),
+                                     values.astype(np.float64))
+
+    # ------------------------------------------------------------- maintenance
+
+    def _maintenance(self):
+        """Connection used by the compaction thread only"""
+        if self._maintenance_conn is None:
+            self._maintenance_conn = self._connect()
+        return self._maintenance_conn
+
+    def get_setting(self, key, default=None):
+        """Reads a persisted setting (string), or default"""
+        row = self._reader().execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
+        return default if row is None else row[0]
+
+    def set_setting(self, key, value):
+        """Persists a setting"""
+        conn = self._reader()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO settings(key, value) VALUES (?, ?)", (key, str(value)))
+
+    def sensor_keys(self):
+        """Internal integer keys of every stored sensor"""
+        return [row[0] for row in self._maintenance().execute("SELECT id FROM sensors")]
+
+    def expire_readings(self, sensor_key, cutoff_ns, limit):
+        """
+        Deletes at most `limit` of the oldest raw readings older than cutoff_ns for one sensor
+
+        Returns:
+        - Number of readings deleted (0 once nothing older than the cutoff remains)
+        """
+        conn = self._maintenance()
+        with conn:
+            cursor = conn.execute(
+                "DELETE FROM readings WHERE sensor = ?1 AND ts < min(?2, coalesce("
+                "(SELECT ts FROM readings WHERE sensor = ?1 ORDER BY ts LIMIT 1 OFFSET ?3), ?2))",
+                (sensor_key, int(cutoff_ns), int(limit))
+            )
+        return cursor.rowcount
+
+    def seal_chunk(self, sensor_key, cutoff_ns, chunk_points=DEFAULT_CHUNK_SIZE):
+        """
+        Moves the oldest chunk_points raw readings older than cutoff_ns of one sensor into a compressed chunk
+
+        Nothing is sealed while fewer than chunk_points readings are eligible, so chunks are always full.
+
+        Returns:
+        - Number of readings sealed (0 or chunk_points)
+        """
+        conn = self._maintenance()
+        with conn:
+            # Immediate: no commit can slip in between reading the rows and deleting them
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                "SELECT ts, value FROM readings WHERE sensor = ? AND ts < ? ORDER BY ts LIMIT ?",
+                (sensor_key, int(cutoff_ns), int(chunk_points))
+            ).fetchall()
+            if len(rows) < chunk_points:
+                return 0
+            timestamps_ns, values = (np.array(column) for column in zip(*rows))
+            values = values.astype(np.float64)
+            # Per-chunk statistics let aggregate queries skip decoding chunks that fall inside one bucket
+            conn.execute(
+                "INSERT INTO chunks(sensor, start_ts, end_ts, count, min, max, sum, last, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (sensor_key, rows[0][0], rows[-1][0], len(rows), float(values.min()), float(values.max()),
+                 float(values.sum()), rows[-1][1], encode_chunk(timestamps_ns.astype(np.int64), values))
+            )
+            conn.execute("DELETE FROM readings WHERE sensor = ? AND ts >= ? AND ts <= ?",
+                         (sensor_key, rows[0][0], rows[-1][0]))
+        return len(rows)
+
+    def expire_chunks(self, sensor_key, cutoff_ns, limit):
+        """
+        Deletes at most `limit` of one sensor's compressed chunks whose newest reading is older than cutoff_ns
+
+        A chunk straddling the cutoff is kept whole until all of its readings have expired.
+
+        Returns:
+        - Number of readings deleted
+        """
+        conn = self._maintenance()
+        with conn:
+            expired = conn.execute(
+                "SELECT rowid, count FROM chunks WHERE sensor = ? AND end_ts < ? ORDER BY end_ts LIMIT ?",
+                (sensor_key, int(cutoff_ns), int(limit))
+            ).fetchall()
+            conn.executemany("DELETE FROM chunks WHERE rowid = ?", ((rowid,) for rowid, _ in expired))
+        return sum(count for _, count in expired)
+
+    def expire_rollups(self, tier, sensor_key, cutoff_ns, limit):
+        """
+        Deletes at most `limit` of the oldest buckets of one tier older than cutoff_ns for one sensor
+
+        Returns:
+        - Number of buckets deleted
+        """
+        conn = self._maintenance()
+        with conn:
+            cursor = conn.execute(
+                "DELETE FROM rollups WHERE tier = ?1 AND sensor = ?2 AND bucket < min(?3, coalesce("
+                "(SELECT bucket FROM rollups WHERE tier = ?1 AND sensor = ?2 ORDER BY bucket LIMIT 1 OFFSET ?4), ?3))",
+                (tier, sensor_key, int(cutoff_ns), int(limit))
+            )
+        return cursor.rowcount
+
+    def storage_info(self):
+        """
+        Returns the database size figures
+
+        Returns:
+        - Dictionary: page_size, page_count, freelist_count, file_bytes, wal_bytes, incremental_vacuum
+        """
+        conn = self._maintenance()
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        wal_path = self.path + "-wal"
+        return {
+            'page_size': page_size,
+            'page_count': conn.execute("PRAGMA page_count").fetchone()[0],
+            'freelist_count': conn.execute("PRAGMA freelist_count").fetchone()[0],
+            'file_bytes': os.path.getsize(self.path),
+            'wal_bytes': os.path.getsize(wal_path) if os.path.exists(wal_path) else 0,
+            'incremental_vacuum': conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        }
+
+    def reclaim_pages(self, max_pages):
+        """
+        Returns up to max_pages free pages to the file system (incremental auto-vacuum)
+
+        Returns:
+        - Number of pages released (0 when the free list is empty or auto-vacuum is off)
+        """
+        conn = self._maintenance()
+        before = conn.execute("PRAGMA page_count").fetchone()[0]
+        # executescript steps the pragma to completion (execute() frees a single page)
+        conn.executescript(f"PRAGMA incremental_vacuum({int(max_pages)});")
+        return before - conn.execute("PRAGMA page_count").fetchone()[0]
+
+    def checkpoint(self):
+        """Checkpoints and truncates the WAL file so reclaimed space shows up on disk"""
+        self._maintenance().execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+
+    # ------------------------------------------------------------------- reads
+
+    def _reader(self):
+        """Read connection of the calling thread"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._local.conn = conn
+        return conn
+
+    def _sensor_key(self, sensor_id):
+        key = self._sensor_keys.get(sensor_id)
+        if key is None:
+            row = self._reader().execute("SELECT id FROM sensors WHERE name = ?", (sensor_id,)).fetchone()
+            key = row[0] if row else None
+        return key
+
+    def query(self, sensor_ids, start_ns=None, end_ns=None, agg=None, bucket_ns=None, use_rollups=True):
+        """
+        Returns the readings, or aggregates computed inside the store, of one or more sensors in [start_ns, end_ns)
+
+        Parameters:
+        - sensor_ids: One sensor ID, or a list of IDs
+        - start_ns, end_ns: Epoch-ns bounds (None: unbounded)
+        - agg: None for raw readings, one of AGGREGATES, or a tuple of them; defaults to 'mean' when bucket_ns is set
+        - bucket_ns: Bucket width for agg (timestamp = bucket start); None aggregates the whole range
+          into a single point stamped with its latest reading
+        - use_rollups: False forces aggregation over the raw readings instead of the rollup tiers
+
+        Returns:
+        - For one ID: tuple (timestamps_ns int64 array, values) oldest first, where values is a float64
+          array, or a dictionary aggregate -> array when agg is a tuple ('count' is int64)
+        - For a list: dictionary ID -> that tuple
+        """
+        if isinstance(sensor_ids, str):
+            return self._query_one(sensor_ids, start_ns, end_ns, agg, bucket_ns, use_rollups)
+        return {sensor_id: self._query_one(sensor_id, start_ns, end_ns, agg, bucket_ns, use_rollups)
+                for sensor_id in sensor_ids}
+
+    def _query_one(self, sensor_id, start_ns, end_ns, agg, bucket_ns, use_rollups):
+        if bucket_ns and agg is None:
+            agg = 'mean'
+        names = (agg,) if isinstance(agg, str) else agg
+        for name in names or ():
+            if name not in AGGREGATES:
+                raise ValueError(f"Unknown aggregate: {name} (available: {AGGREGATES})")
+        start_ns = -(1 << 63) if start_ns is None else int(start_ns)
+        end_ns = (1 << 63) - 1 if end_ns is None else int(end_ns)
+        bucket_ns = int(bucket_ns) if bucket_ns else None
+
+        key = self._sensor_key(sensor_id)
+        if key is None and names is None:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        if key is None:
+            buckets = counts = np.empty(0, dtype=np.int64)
+            mins = maxs = sums = lasts = np.empty(0, dtype=np.float64)
+            last_ts = buckets
+        elif names is None:
+            return self._read_raw(key, start_ns, end_ns)
+        else:
+            tier = self._rollup_tier(bucket_ns) if use_rollups else None
+            if tier:
+                partials = self._rollup_partials(key, tier, start_ns, end_ns, bucket_ns)
+            else:
+                partials = self._raw_partials(key, start_ns, end_ns, bucket_ns)
+            buckets, counts, mins, maxs, sums, lasts, last_ts = _merge_partials(partials)
+
+        columns = {
+            'mean': sums / np.maximum(counts, 1),
+            'min': mins,
+            'max': maxs,
+            'sum': sums,
+            'count': counts,
+            'last': lasts
+        }
+        timestamps_ns = buckets if bucket_ns else last_ts
+        if isinstance(agg, str):
+            return timestamps_ns, columns[agg]
+        return timestamps_ns, {name: columns[name] for name in names}
+
+    @staticmethod
+    def _rollup_tier(bucket_ns):
+        """Widest rollup tier that the bucket width is a multiple of, or None"""
+        if not bucket_ns:
+            return None
+        for tier in sorted(ROLLUP_TIERS, reverse=True):
+            if bucket_ns % (tier * 1_000_000_000) == 0:
+                return tier
+        return None
+
+    def _rollup_partials(self, key, tier, start_ns, end_ns, bucket_ns):
+        """Partial aggregates from one rollup tier, regrouped to bucket_ns (a multiple of the tier width)"""
+        width_ns = tier * 1_000_000_000
+        rows = self._reader().execute(
+            "SELECT bucket, count, min, max, sum, last, last_ts FROM rollups "
+            "WHERE tier = ? AND sensor = ? AND bucket >= ? AND bucket < ? ORDER BY bucket",
+            (tier, key, max(start_ns // width_ns * width_ns, -(1 << 63)), end_ns)
+        ).fetchall()
+        if not rows:
+            return []
+        bucket, count, minimum, maximum, total, last, last_ts = (np.array(column) for column in zip(*rows))
+        return [(bucket // bucket_ns * bucket_ns, count, minimum.astype(np.float64), maximum.astype(np.float64),
+                 total.astype(np.float64), last.astype(np.float64), last_ts)]
+
+    def _raw_partials(self, key, start_ns, end_ns, bucket_ns):
+        """
+        Partial aggregates over the raw readings
+
+        Chunks entirely inside the range and inside a single bucket contribute their stored
+        statistics without being decoded; only the chunks straddling a bound or a bucket
+        edge, and the unsealed readings, are aggregated point by point.
+        """
+        conn = self._reader()
+        partials = []
+        conn.execute("BEGIN")
+        try:
+            to_decode = []
+            stats = []
+            for rowid, first, last, count, minimum, maximum, total, last_value in conn.execute(
+                    "SELECT rowid, start_ts, end_ts, count, min, max, sum, last FROM chunks "
+                    "WHERE sensor = ? AND end_ts >= ? AND start_ts < ?", (key, start_ns, end_ns)):
+                inside = first >= start_ns and last < end_ns
+                if inside and (bucket_ns is None or first // bucket_ns == last // bucket_ns):
+                    stats.append((0 if bucket_ns is None else first // bucket_ns * bucket_ns,
+                                  count, minimum, maximum, total, last_value, last))
+                else:
+                    to_decode.append(rowid)
+            pieces = [decode_chunk(data) for (data,) in conn.execute(
+                f"SELECT data FROM chunks WHERE rowid IN ({','.join('?' * len(to_decode))})", to_decode
+            )] if to_decode else []
+            rows = conn.execute(
+                "SELECT ts, value FROM readings WHERE sensor = ? AND ts >= ? AND ts < ? ORDER BY ts",
+                (key, start_ns, end_ns)
+            ).fetchall()
+        finally:
+            conn.rollback()
+
+        if stats:
+            bucket, count, minimum, maximum, total, last, last_ts = (np.array(column) for column in zip(*stats))
+            partials.append((bucket.astype(np.int64), count, minimum.astype(np.float64), maximum.astype(np.float64),
+                             total.astype(np.float64), last.astype(np.float64), last_ts.astype(np.int64)))
+        if rows:
+            timestamps, values = zip(*rows)
+            pieces.append((np.array(timestamps, dtype=np.int64), np.array(values, dtype=np.float64)))
+        if pieces:
+            timestamps_ns = np.concatenate([piece[0] for piece in pieces])
+            values = np.concatenate([piece[1] for piece in pieces])
+            keep = (timestamps_ns >= start_ns) & (timestamps_ns < end_ns)
+            timestamps_ns, values = timestamps_ns[keep], values[keep]
+            if len(values):
+                order = np.argsort(timestamps_ns, kind='stable')
+                timestamps_ns, values = timestamps_ns[order], values[order]
+                if bucket_ns is None:
+                    partials.append((np.zeros(1, dtype=np.int64), np.array([len(values)]), values.min(keepdims=True),
+                                     values.max(keepdims=True), values.sum(keepdims=True), values[-1:],
+                                     timestamps_ns[-1:]))
+                else:
+                    partials.append(aggregate_buckets(np.zeros(len(values), dtype=np.int64), timestamps_ns,
+                                                      values, bucket_ns)[1:])
+        return partials
+
+    def _read_raw(self, key, start_ns, end_ns):
+        """Readings of one sensor in [start_ns, end_ns) from the compressed chunks and the raw table"""
+        conn = self._reader()
+        # One read transaction: a chunk sealed between the two queries would otherwise be missed
+        conn.execute("BEGIN")
+        try:
+            parts = [decode_chunk(data) for (data,) in conn.execute(
+                "SELECT data FROM chunks WHERE sensor = ? AND end_ts >= ? AND start_ts < ? ORDER BY start_ts",
+                (key, start_ns, end_ns)
+            )]
+            rows = conn.execute(
+                "SELECT ts, value FROM readings WHERE sensor = ? AND ts >= ? AND ts < ? ORDER BY ts",
+                (key, start_ns, end_ns)
+            ).fetchall()
+        finally:
+            conn.rollback()
+        if rows:
+            timestamps, values = zip(*rows)
+            raw = (np.array(timestamps, dtype=np.int64), np.array(values, dtype=np.float64))
+        else:
+            raw = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64))
+        if not parts:
+            return raw
+        parts.append(raw)
+        timestamps_ns = np.concatenate([part[0] for part in parts])
+        values = np.concatenate([part[1] for part in parts])
+        keep = (timestamps_ns >= start_ns) & (timestamps_ns < end_ns)
+        timestamps_ns, values = timestamps_ns[keep], values[keep]
+        # Late readings sealed after a newer chunk can leave the pieces out of order
+        if len(timestamps_ns) > 1 and (np.diff(timestamps_ns) < 0).any():
+            order = np.argsort(timestamps_ns, kind='stable')
+            timestamps_ns, values = timestamps_ns[order], values[order]
+        return timestamps_ns, values
+
+    def query_rollup(self, sensor_id, tier, start_ns=None, end_ns=None):
+        """
+        Returns the rollup buckets of one sensor
+
+        Parameters:
+        - sensor_id: Sensor ID
+        - tier: Bucket width in seconds, one of ROLLUP_TIERS
+        - start_ns, end_ns: Epoch-ns bounds; the bucket containing start_ns is included
+
+        Returns:
+        - Dictionary of arrays: bucket (epoch ns), count, min, max, mean, last
+        """
+        if tier not in ROLLUP_TIERS:
+            raise ValueError(f"Unknown rollup tier: {tier}s (available: {ROLLUP_TIERS})")
+        width_ns = tier * 1_000_000_000
+        key = self._sensor_key(sensor_id)
+        rows = []
+        if key is not None:
+            start_ns = -(1 << 63) if start_ns is None else int(start_ns) // width_ns * width_ns
+            end_ns = (1 << 63) - 1 if end_ns is None else int(end_ns)
+            rows = self._reader().execute(
+                "SELECT bucket, count, min, max, sum / count, last FROM rollups "
+                "WHERE tier = ? AND sensor = ? AND bucket >= ? AND bucket < ? ORDER BY bucket",
+                (tier, key, start_ns, end_ns)
+            ).fetchall()
+        columns = list(zip(*rows)) if rows else [()] * 6
+        return {
+            'bucket': np.array(columns[0], dtype=np.int64),
+            'count': np.array(columns[1], dtype=np.int64),
+            'min': np.array(columns[2], dtype=np.float64),
+            'max': np.array(columns[3], dtype=np.float64),
+            'mean': np.array(columns[4], dtype=np.float64),
+            'last': np.array(columns[5], dtype=np.float64)
+        }
+
+    def query_frame(self, sensor_id, start_ns=None, end_ns=None, bucket_ns=None, agg=None):
+        """
+        Same as query() for one sensor and a single aggregate, as a DataFrame with
+        'timestamp' (local datetime64) and 'value' columns
+        """
+        timestamps, values = self.query(sensor_id, start_ns, end_ns, agg=agg, bucket_ns=bucket_ns)
+        if len(timestamps) == 0:
+            return _empty_frame()
+        return pd.DataFrame({'timestamp': epoch_ns_to_datetime64(timestamps), 'value': values})
+
+    def count(self, sensor_id=None):
+        """Number of committed readings (for one sensor, or in total)"""
+        if sensor_id is None:
+            return self._reader().execute(
+                "SELECT (SELECT count(*) FROM readings) + (SELECT coalesce(sum(count), 0) FROM chunks)"
+            ).fetchone()[0]
+        key = self._sensor_key(sensor_id)
+        if key is None:
+            return 0
+        return self._reader().execute(
+            "SELECT (SELECT count(*) FROM readings WHERE sensor = ?1) + "
+            "(SELECT coalesce(sum(count), 0) FROM chunks WHERE sensor = ?1)", (key,)
+        ).fetchone()[0]
+
+    def get_stats(self):
+        """
+        Returns writer statistics
+
+        Returns:
+        - Dictionary: pending, rows_written, commits, dropped, failed_commits, last_error,
+          last_commit_rows, last_commit_ms, and 'wal' (IngestWAL.get_stats(), None without a log)
+        """
+        with self._cond:
+            pending = len(self._pending)
+        return {
+            'pending': pending,
+            'rows_written': self.rows_written,
+            'commits': self.commits,
+            'dropped': self.dropped,
+            'failed_commits': self.failed_commits,
+            'last_error': self.last_error,
+            'last_commit_rows': self.last_commit_rows,
+            'last_commit_ms': self.last_commit_ms,
+            'wal': self.wal.get_stats() if self.wal is not None else None
+        }
+
+    def close(self, timeout=10.0):
+        """Commits pending readings and stops the writer"""
+        self.flush(timeout)
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._writer.join(timeout)
+        if self.wal is not None:
+            self.wal.close()
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+        if self._maintenance_conn is not None:
+            self._maintenance_conn.close()
+            self._maintenance_conn = None
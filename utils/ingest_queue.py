@@ -0,0 +1,183 @@
+"""
+File d'ingestion bornée entre le thread réseau paho et le décodage des messages
+Le callback MQTT se contente d'empiler (topic, payload, recv_ts) ; un thread dédié
+vide la file par lots et applique les lectures en une seule prise de verrou
+"""
+
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class IngestQueue:
+    """
+    Tampon circulaire borné, thread-safe
+    Lorsque la file est pleine, l'élément le plus ancien est écrasé : pour du monitoring
+    temps réel la valeur la plus récente prime. Les pertes sont comptabilisées.
+    """
+    def __init__(self, capacity=10000):
+        """
+        Initialise la file
+
+        Parameters:
+        - capacity: Nombre maximal de messages en attente
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = capacity
+        self._items = [None] * capacity
+        self._head = 0   # Prochain élément à lire
+        self._size = 0
+        self._cond = threading.Condition(threading.Lock())
+        self._waiting = 0
+
+        # Statistiques
+        self.enqueued = 0
+        self.dropped = 0
+
+    def put(self, topic, payload, recv_ts):
+        """
+        Empile un message brut ; ne bloque jamais l'appelant
+
+        Returns:
+        - False si un message plus ancien a dû être écrasé
+        """
+        with self._cond:
+            tail = (self._head + self._size) % self.capacity
+            self._items[tail] = (topic, payload, recv_ts)
+            self.enqueued += 1
+            if self._size == self.capacity:
+                # File pleine : on écrase le plus ancien
+                self._head = (self._head + 1) % self.capacity
+                self.dropped += 1
+                overflow = True
+            else:
+                self._size += 1
+                overflow = False
+            # notify() est coûteux : uniquement si un consommateur dort
+            if self._waiting:
+                self._cond.notify()
+        return not overflow
+
+    def drain(self, max_items, timeout=None):
+        """
+        Retire jusqu'à max_items messages, en attendant au plus timeout secondes si la file est vide
+
+        Returns:
+        - Liste de tuples (topic, payload, recv_ts), éventuellement vide
+        """
+        with self._cond:
+            if self._size == 0:
+                self._waiting += 1
+                try:
+                    self._cond.wait(timeout)
+                finally:
+                    self._waiting -= 1
+            count = min(max_items, self._size)
+            if count == 0:
+                return []
+            head = self._head
+            end = head + count
+            if end <= self.capacity:
+                batch = self._items[head:end]
+                self._items[head:end] = [None] * count
+            else:
+                wrap = end - self.capacity
+                batch = self._items[head:] + self._items[:wrap]
+                self._items[head:] = [None] * (self.capacity - head)
+                self._items[:wrap] = [None] * wrap
+            self._head = end % self.capacity
+            self._size -= count
+            return batch
+
+    def wake(self):
+        """Réveille un consommateur en attente (utilisé à l'arrêt)"""
+        with self._cond:
+            self._cond.notify_all()
+
+    def __len__(self):
+        return self._size
+
+
+class BatchWorker:
+    """
+    Thread consommateur qui vide une IngestQueue par lots
+    """
+    def __init__(self, queue, handler, max_batch=500, idle_timeout=0.5, name="ingest-worker"):
+        """
+        Initialise le worker
+
+        Parameters:
+        - queue: IngestQueue à consommer
+        - handler: Fonction appelée avec la liste des messages d'un lot
+        - max_batch: Taille maximale d'un lot
+        - idle_timeout: Attente maximale (s) lorsque la file est vide
+        - name: Nom du thread
+        """
+        self.queue = queue
+        self.handler = handler
+        self.max_batch = max_batch
+        self.idle_timeout = idle_timeout
+        self.name = name
+        self.running = False
+        self.thread = None
+
+        # Statistiques des lots
+        self.batches = 0
+        self.processed = 0
+        self.last_batch_size = 0
+        self.max_batch_size = 0
+
+    def _run(self):
+        """Boucle principale du worker"""
+        while self.running or len(self.queue):
+            batch = self.queue.drain(self.max_batch, timeout=self.idle_timeout)
+            if not batch:
+                continue
+            try:
+                self.handler(batch)
+            except Exception as e:
+                logger.error(f"Erreur lors du traitement d'un lot de {len(batch)} messages: {e}")
+            size = len(batch)
+            self.batches += 1
+            self.processed += size
+            self.last_batch_size = size
+            if size > self.max_batch_size:
+                self.max_batch_size = size
+
+    def start(self):
+        """Démarre le thread consommateur"""
+        if not self.running:
+            self.running = True
+            self.thread = threading.Thread(target=self._run, name=self.name)
+            self.thread.daemon = True
+            self.thread.start()
+
+    def stop(self, timeout=2):
+        """Arrête le thread après avoir vidé la file"""
+        if self.running:
+            self.running = False
+            self.queue.wake()
+            if self.thread:
+                self.thread.join(timeout=timeout)
+
+    def get_stats(self):
+        """
+        Retourne les statistiques de la file et des lots
+
+        Returns:
+        - Dictionnaire: queue_depth, capacity, enqueued, dropped, batches, processed,
+          avg_batch_size, last_batch_size, max_batch_size
+        """
+        return {
+            'queue_depth': len(self.queue),
+            'capacity': self.queue.capacity,
+            'enqueued': self.queue.enqueued,
+            'dropped': self.queue.dropped,
+            'batches': self.batches,
+            'processed': self.processed,
+            'avg_batch_size': self.processed / self.batches if self.batches else 0.0,
+            'last_batch_size': self.last_batch_size,
+            'max_batch_size': self.max_batch_size
+        }
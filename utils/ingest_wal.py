@@ -0,0 +1,280 @@
+"""
+Append-only write-ahead log for readings waiting for a history commit
+
+HistoryStore keeps readings in RAM for up to `commit_interval_ms` (longer
+when the disk falls behind) before committing them to SQLite; a crash in
+that window used to lose them. With a WAL, append_many() also encodes the
+readings into an in-memory buffer, and a flusher thread writes and fsyncs
+that buffer every `sync_interval_ms` (group commit: one fsync for all
+readings of the interval, never one per reading).
+
+Records are length-prefixed and CRC32-checked, so a record torn by a crash
+is detected and ignored on replay. The log is split into segments: once
+the store has committed every reading of a segment it is deleted (or
+truncated, for the active segment), so the log only ever holds the
+readings that are not yet in SQLite.
+
+Record layout (little endian): payload length (u32), CRC32 of the payload
+(u32), then per reading: sensor ID length (u8), sensor ID (UTF-8),
+timestamp ns (i64), value (f64).
+"""
+
+import glob
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+
+logger = logging.getLogger(__name__)
+
+RECORD_HEADER = struct.Struct("<II")
+READING = struct.Struct("<qd")
+
+
+def encode_rows(rows):
+    """Encodes (sensor_id, timestamp_ns, value) rows as one record payload"""
+    pack = READING.pack
+    parts = []
+    for sensor_id, ts_ns, value in rows:
+        name = sensor_id.encode()
+        parts.append(bytes((len(name),)))
+        parts.append(name)
+        parts.append(pack(int(ts_ns), float(value)))
+    return b"".join(parts)
+
+
+def encode_record(rows):
+    """Encodes rows as one framed record (header + payload), ready for IngestWAL.append_record"""
+    payload = encode_rows(rows)
+    return RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def decode_rows(payload):
+    """Decodes a record payload back to a list of (sensor_id, timestamp_ns, value)"""
+    rows = []
+    position = 0
+    unpack = READING.unpack_from
+    while position < len(payload):
+        length = payload[position]
+        name = payload[position + 1:position + 1 + length].decode()
+        position += 1 + length
+        ts_ns, value = unpack(payload, position)
+        position += READING.size
+        rows.append((name, ts_ns, value))
+    return rows
+
+
+def read_segment(path):
+    """
+    Reads the valid records of one segment file
+
+    Returns:
+    - List of rows; reading stops at the first truncated or corrupted record
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    rows = []
+    position = 0
+    while position + RECORD_HEADER.size <= len(data):
+        length, crc = RECORD_HEADER.unpack_from(data, position)
+        payload = data[position + RECORD_HEADER.size:position + RECORD_HEADER.size + length]
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            logger.warning(f"WAL {path}: torn record at offset {position}, ignoring the rest of the segment")
+            break
+        rows.extend(decode_rows(payload))
+        position += RECORD_HEADER.size + length
+    return rows
+
+
+class IngestWAL:
+    """
+    Group-committed write-ahead log
+
+    Thread model: producers call append() (memory only, O(readings)); a flusher
+    thread writes and fsyncs; the history writer calls checkpoint() after each
+    SQLite commit. Readings are numbered by a running sequence number that the
+    caller keeps in step with its own (HistoryStore's enqueued count).
+    """
+    def __init__(self, path, sync_interval_ms=50, fsync=True):
+        """
+        Opens the log; segments left by a previous process must have been
+        replayed (see replay_segments) before
+
+        Parameters:
+        - path: Log path prefix; segments are named <path>.<number>
+        - sync_interval_ms: Group-commit interval: readings are on disk at most this long after append()
+        - fsync: False only writes to the OS cache (survives a process crash, not a power loss)
+        """
+        self.path = path
+        self.sync_interval = sync_interval_ms / 1000.0
+        self.fsync = fsync
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        existing = [_segment_number(name) for name in glob.glob(f"{glob.escape(path)}.*")]
+        self._next_segment = max(existing, default=0) + 1
+        self._closed_segments = []  # (path, last sequence number)
+        self._file = None
+        self._file_path = None
+        self._file_last_seq = 0
+        self._file_bytes = 0
+        self._open_segment()
+
+        self._lock = threading.Lock()  # Guards the in-memory buffer
+        self._io_lock = threading.Lock()  # Guards the segment files
+        self._buffer = []  # (record, sequence number of its last reading)
+        self._seq = 0
+        self._checkpointed = 0
+        self._stopping = threading.Event()
+        self._wake = threading.Event()
+
+        self.syncs = 0
+        self.bytes_written = 0
+        self.last_sync_ms = 0.0
+        self.durable_seq = 0
+
+        self._thread = threading.Thread(target=self._run, name="ingest-wal", daemon=True)
+        self._thread.start()
+
+    def _open_segment(self):
+        self._file_path = f"{self.path}.{self._next_segment:06d}"
+        self._next_segment += 1
+        self._file = open(self._file_path, "ab")
+        self._file_last_seq = 0
+        self._file_bytes = 0
+
+    def append(self, rows):
+        """
+        Logs readings (buffered; durable after the next group commit)
+
+        Returns:
+        - Sequence number of the last reading
+        """
+        return self.append_record(encode_record(rows), len(rows))
+
+    def append_record(self, record, count):
+        """
+        Logs a record built by encode_record()
+
+        Parameters:
+        - record: Framed record
+        - count: Number of readings in the record
+
+        Returns:
+        - Sequence number of the last reading
+        """
+        with self._lock:
+            self._seq += count
+            self._buffer.append((record, self._seq))
+            return self._seq
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wake.wait(self.sync_interval)
+            self._wake.clear()
+            try:
+                self.sync()
+            except OSError as e:
+                logger.error(f"WAL write failed: {e}")
+
+    def sync(self):
+        """Writes and fsyncs everything appended so far (group commit)"""
+        with self._lock:
+            records, self._buffer = self._buffer, []
+        if not records:
+            return
+        start = time.perf_counter()
+        last_seq = records[-1][1]
+        with self._io_lock:
+            # Records the store committed before they reached the disk need no logging
+            data = b"".join(record for record, seq in records if seq > self._checkpointed)
+            if data:
+                self._file.write(data)
+                self._file.flush()
+                if self.fsync:
+                    os.fsync(self._file.fileno())
+                self._file_last_seq = last_seq
+                self._file_bytes += len(data)
+        self.durable_seq = last_seq
+        self.syncs += 1
+        self.bytes_written += len(data)
+        self.last_sync_ms = (time.perf_counter() - start) * 1000
+
+    def checkpoint(self, committed_seq):
+        """
+        Drops the log entries that are now committed to the store
+
+        Parameters:
+        - committed_seq: Every reading up to this sequence number is in SQLite
+        """
+        with self._io_lock:
+            self._checkpointed = max(self._checkpointed, committed_seq)
+            for path, last_seq in list(self._closed_segments):
+                if last_seq <= committed_seq:
+                    os.remove(path)
+                    self._closed_segments.remove((path, last_seq))
+            if not self._file_bytes:
+                return
+            if self._file_last_seq <= committed_seq:
+                self._file.truncate(0)
+                self._file_bytes = 0
+            else:
+                # Partially committed: later writes go to a new segment, this one goes once committed
+                self._file.close()
+                self._closed_segments.append((self._file_path, self._file_last_seq))
+                self._open_segment()
+
+    @property
+    def size_bytes(self):
+        """Bytes currently held on disk by the log"""
+        with self._io_lock:
+            closed = sum(os.path.getsize(path) for path, _ in self._closed_segments if os.path.exists(path))
+            return closed + self._file_bytes
+
+    def get_stats(self):
+        """
+        Returns:
+        - Dictionary: syncs, bytes_written, last_sync_ms, appended, durable, size_bytes
+        """
+        return {
+            'syncs': self.syncs,
+            'bytes_written': self.bytes_written,
+            'last_sync_ms': self.last_sync_ms,
+            'appended': self._seq,
+            'durable': self.durable_seq,
+            'size_bytes': self.size_bytes
+        }
+
+    def close(self):
+        """Syncs the remaining readings and stops the flusher; the files are kept for replay"""
+        self._stopping.set()
+        self._wake.set()
+        self._thread.join()
+        self.sync()
+        with self._io_lock:
+            self._file.close()
+
+
+def _segment_number(path):
+    try:
+        return int(path.rsplit(".", 1)[1])
+    except (IndexError, ValueError):
+        return 0
+
+
+def replay_segments(path):
+    """
+    Reads every segment left by a previous process, oldest first
+
+    Returns:
+    - Tuple (rows, segment paths); delete the paths once the rows are safely stored
+    """
+    paths = sorted(glob.glob(f"{glob.escape(path)}.*"), key=_segment_number)
+    paths = [segment for segment in paths if _segment_number(segment)]
+    rows = []
+    for segment in paths:
+        rows.extend(read_segment(segment))
+    return rows, paths
@@ -0,0 +1,426 @@
+"""
+Service d'ingestion partagé par toutes les sessions Streamlit d'un même processus
+Une seule connexion au broker MQTT (ou un seul simulateur) alimente toutes les pages ;
+chaque session ne conserve qu'un handle de lecture léger vers ce service
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import streamlit as st
+from utils.direct_simulator import DirectSimulator
+from utils.mqtt_integration import MQTTIntegration
+from utils.sharded_ingest import ShardedIngestion, SHARD_BY_TOPIC
+from utils.snapshot import EMPTY_SNAPSHOT
+from utils.history_store import DEFAULT_WAL_PATH, HistoryStore
+from utils.compaction import CompactionService
+from utils.warm_start import WarmStartWriter, load_warm_snapshot
+
+logger = logging.getLogger(__name__)
+
+MODE_DIRECT = "direct"
+MODE_MQTT = "mqtt"
+MODE_SHARDED = "sharded"
+
+# Délai après lequel les dernières valeurs restaurées au démarrage à chaud et jamais rafraîchies
+# par la nouvelle source sont retirées (capteurs disparus entre-temps)
+DEFAULT_SEED_GRACE_S = 600
+
+# Dernière source démarrée, rétablie au démarrage du processus (le mot de passe n'est jamais écrit :
+# il est relu dans la variable d'environnement PASSWORD_ENV)
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                   "data", "ingestion.json")
+PASSWORD_ENV = "MEDIMAT_MQTT_PASSWORD"
+
+
+class IngestionService:
+    """
+    Propriétaire unique des sources de données (simulateur direct ou intégration MQTT)
+    Toutes les transitions d'état passent par start / stop / reconfigure, sous verrou
+    """
+    def __init__(self, history_store=None, compaction=None, warm_state=None, config_path=None):
+        """
+        Initialise le service sans démarrer de source
+
+        Parameters:
+        - history_store: HistoryStore alimenté par toutes les sources (historique persistant), optionnel
+        - compaction: CompactionService appliquant la durée de conservation à history_store, optionnel
+        - warm_state: WarmState de l'instance précédente, servi par la prochaine source démarrée qui
+          possède des tampons d'historique (intégration MQTT), jusqu'à ce que ses propres données le remplacent
+        - config_path: Fichier où la dernière source démarrée est enregistrée pour restore(), optionnel
+        """
+        self._lock = threading.RLock()
+        self.config_path = config_path
+        self.history_store = history_store
+        self.compaction = compaction
+        self.warm_state = warm_state
+        self.warm_start = None
+        self.seeded = {}  # ID du capteur -> (enregistrement restauré, epoch de réception d'origine)
+        self.seed_grace_s = DEFAULT_SEED_GRACE_S
+        self._seeded_at = 0.0
+        self.mode = None
+        self.direct_simulator = None
+        self.mqtt_integration = None
+        self.broker_info = {}
+
+    def start(self, mode=MODE_DIRECT, host="localhost", port=1883, username=None, password=None, topics=None,
+              workers=4, shard_mode=SHARD_BY_TOPIC, remember=True):
+        """
+        Démarre la source de données demandée, en arrêtant la précédente si besoin
+
+        Parameters:
+        - mode: MODE_DIRECT (simulateur intégré), MODE_MQTT (broker externe) ou
+          MODE_SHARDED (broker externe consommé par plusieurs processus)
+        - host, port, username, password, topics: Paramètres du broker en mode MQTT
+        - workers, shard_mode: Nombre de processus et stratégie de partition en mode MODE_SHARDED
+        - remember: Enregistre la source démarrée pour la rétablir au prochain démarrage (restore)
+
+        Returns:
+        - True si la source est démarrée
+        """
+        with self._lock:
+            self._stop_locked()
+
+            if mode == MODE_DIRECT:
+                # Le simulateur n'a pas de tampons : instantané et journal restent en attente d'une source MQTT
+                self.direct_simulator = DirectSimulator(store=self.history_store)
+                self.direct_simulator.start()
+                self.mode = MODE_DIRECT
+                if remember:
+                    self._remember({'mode': MODE_DIRECT})
+                logger.info("Service d'ingestion démarré en mode simulateur")
+                return True
+
+            if mode in (MODE_MQTT, MODE_SHARDED):
+                if mode == MODE_SHARDED:
+                    # Les workers n'écrivent que la table des dernières valeurs : pas d'historique persistant
+                    if self.history_store is not None:
+                        logger.warning("Mode multi-processus: l'historique persistant n'est pas alimenté")
+                    integration = ShardedIngestion(
+                        host=host,
+                        port=port,
+                        username=username,
+                        password=password,
+                        topics=topics,
+                        workers=workers,
+                        shard_mode=shard_mode
+                    )
+                else:
+                    integration = MQTTIntegration(
+                        host=host,
+                        port=port,
+                        username=username,
+                        password=password,
+                        topics=topics,
+                        store=self.history_store
+                    )
+                seed = self._seed(integration)
+                if not integration.connect():
+                    logger.error(f"Échec de l'initialisation de l'intégration MQTT avec {host}:{port}")
+                    return False
+                self._consume_seed(seed)
+                self.mqtt_integration = integration
+                self.broker_info = {'host': host, 'port': port, 'username': username}
+                self.mode = mode
+                if remember:
+                    self._remember({'mode': mode, 'host': host, 'port': port, 'username': username,
+                                    'topics': topics, 'workers': workers, 'shard_mode': shard_mode})
+                logger.info(f"Service d'ingestion connecté au broker MQTT {host}:{port}")
+                return True
+
+            raise ValueError(f"Mode d'ingestion inconnu: {mode}")
+
+    def restore(self):
+        """
+        Rétablit la dernière source enregistrée (broker MQTT compris, donc avec l'instantané de
+        démarrage à chaud dès le démarrage), ou le simulateur direct si aucune n'est enregistrée
+        ou si le broker est injoignable
+
+        Returns:
+        - Mode démarré
+        """
+        config = load_ingestion_config(self.config_path) if self.config_path else None
+        mode = config.get('mode') if config else None
+        if mode in (MODE_MQTT, MODE_SHARDED):
+            options = {name: config[name] for name in ('host', 'port', 'username', 'topics', 'workers', 'shard_mode')
+                       if config.get(name) is not None}
+            if self.start(mode, password=os.environ.get(PASSWORD_ENV), remember=False, **options):
+                return mode
+            logger.warning("Dernier broker MQTT injoignable, démarrage en mode simulateur")
+        # Le broker enregistré reste la configuration à rétablir au prochain démarrage
+        self.start(MODE_DIRECT, remember=config is None)
+        return MODE_DIRECT
+
+    def _remember(self, config):
+        """Enregistre la source démarrée pour restore() ; une erreur d'écriture est seulement journalisée"""
+        if self.config_path is None:
+            return
+        try:
+            directory = os.path.dirname(self.config_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.config_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(config, f)
+            os.replace(tmp_path, self.config_path)
+        except OSError as e:
+            logger.warning(f"Configuration d'ingestion non enregistrée: {e}")
+
+    def _seed(self, source):
+        """
+        Amorce une source avec l'instantané de démarrage : dernières valeurs dans son magasin
+        d'instantanés, historiques récents dans ses tampons, puis les lectures rejouées depuis
+        le journal d'écriture anticipée de l'historique
+
+        Rien n'est consommé ici : une source sans tampons d'historique n'est pas amorcée, et
+        l'état amorcé n'est consommé (_consume_seed) qu'une fois la source connectée.
+
+        Returns:
+        - (warm_state, lectures rejouées, enregistrements restaurés) appliqués, ou None
+        """
+        pool = getattr(source, 'history', None)
+        if pool is None:
+            return None
+        state = self.warm_state
+        recovered = self.history_store.recovered if self.history_store is not None else []
+        seeded = {}
+        if state is not None:
+            source.snapshots.replace(state.latest)
+            seeded = {sensor_id: (record, state.latest_at[sensor_id]) for sensor_id, record in state.latest.items()}
+            for sensor_id, (timestamps_ns, values) in state.history.items():
+                pool.extend(sensor_id, timestamps_ns, values)
+        if recovered:
+            self._replay_into(pool, recovered)
+        return state, recovered, seeded
+
+    def _consume_seed(self, seed):
+        """Marque l'état amorcé par _seed comme consommé, une fois la source connectée"""
+        if seed is None:
+            return
+        state, recovered, seeded = seed
+        if state is not None:
+            self.warm_state = None
+            self.seeded = seeded
+            self._seeded_at = time.time()
+            logger.info(f"Démarrage à chaud: {len(state.latest)} capteurs restaurés (instantané de {state.age:.0f} s)")
+        if recovered:
+            self.history_store.recovered = []
+
+    def drop_stale_seeded(self):
+        """
+        Retire les dernières valeurs restaurées au démarrage à chaud que la source active n'a pas
+        rafraîchies dans le délai seed_grace_s : elles ne sont pas présentées indéfiniment comme courantes
+
+        Returns:
+        - Nombre de capteurs retirés
+        """
+        with self._lock:
+            if not self.seeded or time.time() - self._seeded_at < self.seed_grace_s:
+                return 0
+            stale, self.seeded = self.seeded, {}
+            integration = self.mqtt_integration
+            if integration is None:
+                return 0
+            removed = integration.snapshots.discard({sensor_id: record for sensor_id, (record, _) in stale.items()})
+        if removed:
+            logger.info(f"Démarrage à chaud: {removed} capteurs restaurés jamais rafraîchis retirés")
+        return removed
+
+    @staticmethod
+    def _replay_into(pool, rows):
+        """
+        Ajoute aux tampons les lectures rejouées depuis le journal d'écriture anticipée,
+        postérieures à ce qu'ils contiennent déjà (instantané de démarrage)
+        """
+        by_sensor = {}
+        for sensor_id, ts_ns, value in rows:
+            by_sensor.setdefault(sensor_id, []).append((ts_ns, value))
+        for sensor_id, samples in by_sensor.items():
+            buffer = pool.get(sensor_id)
+            latest = buffer.latest() if buffer is not None else None
+            samples.sort()
+            if latest is not None:
+                samples = [sample for sample in samples if sample[0] > latest[0]]
+            if samples:
+                timestamps_ns, values = zip(*samples)
+                pool.extend(sensor_id, timestamps_ns, values)
+        logger.info(f"Journal d'écriture anticipée: {len(rows)} lectures rejouées dans les tampons")
+
+    def stop(self):
+        """Arrête la source de données active ; le prochain démarrage se fera en mode simulateur"""
+        with self._lock:
+            self._stop_locked()
+            self._remember({'mode': None})
+
+    def _stop_locked(self):
+        """Arrête la source active ; le verrou doit être détenu"""
+        if self.direct_simulator is not None:
+            self.direct_simulator.stop()
+            self.direct_simulator = None
+        if self.mqtt_integration is not None:
+            try:
+                self.mqtt_integration.disconnect()
+            except Exception as e:
+                logger.warning(f"Erreur lors de la déconnexion MQTT: {e}")
+            self.mqtt_integration = None
+        self.seeded = {}
+        self.broker_info = {}
+        self.mode = None
+
+    def reconfigure(self, host="localhost", port=1883, username=None, password=None, topics=None,
+                    workers=None, shard_mode=SHARD_BY_TOPIC):
+        """
+        Bascule (ou reconnecte) le service sur un broker MQTT avec de nouveaux paramètres
+
+        Parameters:
+        - workers: Si > 1, l'ingestion est répartie sur autant de processus (MODE_SHARDED)
+
+        Returns:
+        - True si la connexion a été établie
+        """
+        if workers and workers > 1:
+            return self.start(MODE_SHARDED, host=host, port=port, username=username, password=password,
+                              topics=topics, workers=workers, shard_mode=shard_mode)
+        return self.start(MODE_MQTT, host=host, port=port, username=username,
+                          password=password, topics=topics)
+
+    @property
+    def running(self):
+        """Indique si une source de données est active"""
+        return self.mode is not None
+
+    def snapshot(self):
+        """
+        Retourne l'instantané des dernières valeurs de la source active (O(1), sans verrou)
+
+        Returns:
+        - Snapshot ; EMPTY_SNAPSHOT (version 0) si aucune source n'est active
+        """
+        integration = self.mqtt_integration
+        if integration is not None and integration.connected:
+            return integration.get_snapshot()
+        simulator = self.direct_simulator
+        if simulator is not None and simulator.running:
+            return simulator.get_snapshot()
+        return EMPTY_SNAPSHOT
+
+    def status(self):
+        """
+        Retourne l'état du service pour l'affichage
+
+        Returns:
+        - Dictionnaire: mode, running, connected, broker_info, persistent_history
+          (la source active alimente l'historique persistant)
+        """
+        integration = self.mqtt_integration
+        return {
+            'mode': self.mode,
+            'running': self.running,
+            'connected': bool(integration and integration.connected),
+            'broker_info': dict(self.broker_info),
+            'persistent_history': self.history_store is not None and self.mode not in (None, MODE_SHARDED)
+        }
+
+
+class IngestionHandle:
+    """
+    Handle de lecture conservé dans le session state
+    Il ne possède aucune ressource : il lit toujours la source courante du service partagé
+    """
+    __slots__ = ('service',)
+
+    def __init__(self, service):
+        self.service = service
+
+    @property
+    def mqtt_integration(self):
+        """Intégration MQTT connectée, ou None"""
+        integration = self.service.mqtt_integration
+        if integration is not None and integration.connected:
+            return integration
+        return None
+
+    @property
+    def direct_simulator(self):
+        """Simulateur direct en cours d'exécution, ou None"""
+        simulator = self.service.direct_simulator
+        if simulator is not None and simulator.running:
+            return simulator
+        return None
+
+    @property
+    def mode(self):
+        return self.service.mode
+
+    @property
+    def history_store(self):
+        """Historique persistant partagé, ou None s'il n'a pas pu être ouvert"""
+        return self.service.history_store
+
+    @property
+    def compaction(self):
+        """Service de compaction de l'historique, ou None"""
+        return self.service.compaction
+
+    def status(self):
+        return self.service.status()
+
+    def snapshot(self):
+        """Instantané des dernières valeurs de la source active"""
+        return self.service.snapshot()
+
+
+def load_ingestion_config(path=DEFAULT_CONFIG_PATH):
+    """
+    Lit la dernière source enregistrée par IngestionService
+
+    Returns:
+    - Dictionnaire (mode et paramètres du broker), ou None si le fichier est absent ou invalide
+    """
+    try:
+        with open(path) as f:
+            config = json.load(f)
+    except (OSError, ValueError) as e:
+        if not isinstance(e, FileNotFoundError):
+            logger.warning(f"Configuration d'ingestion ignorée ({path}): {e}")
+        return None
+    return config if isinstance(config, dict) else None
+
+
+@st.cache_resource
+def get_ingestion_service():
+    """
+    Retourne le service d'ingestion unique du processus serveur
+    Créé une seule fois (cache de ressources Streamlit) et démarré sur la dernière source enregistrée :
+    si c'était un broker MQTT, l'instantané de démarrage et le journal rejoué sont servis dès le démarrage ;
+    sinon (simulateur), ils attendent la première source MQTT
+    """
+    try:
+        history_store = HistoryStore(wal_path=DEFAULT_WAL_PATH)
+    except (sqlite3.Error, OSError) as e:
+        logger.error(f"Historique persistant indisponible, historique en mémoire uniquement: {e}")
+        history_store = None
+    compaction = None
+    if history_store is not None:
+        compaction = CompactionService(history_store)
+        compaction.start()
+    service = IngestionService(history_store=history_store, compaction=compaction, warm_state=load_warm_snapshot(),
+                               config_path=DEFAULT_CONFIG_PATH)
+    service.restore()
+    service.warm_start = WarmStartWriter(service)
+    service.warm_start.start()
+    return service
+
+
+def get_ingestion_handle():
+    """
+    Retourne le handle de lecture de la session courante vers le service partagé
+    """
+    handle = st.session_state.get('ingestion')
+    if handle is None:
+        handle = IngestionHandle(get_ingestion_service())
+        st.session_state['ingestion'] = handle
+    return handle
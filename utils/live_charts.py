@@ -0,0 +1,251 @@
+"""
+Live charts: plotly figures that keep their identity in the browser across reruns
+
+st.plotly_chart sends the whole figure on every rerun, and a changing key makes the
+browser tear the chart down and rebuild it. live_chart() instead mounts one small
+component per key that owns a plotly.js chart, and on each rerun sends only what
+changed since the figure the browser already has:
+- ['extend', update, [trace], max_points] when the arrays of a trace continue the
+  previous ones (new points appended, oldest points dropped): Plotly.extendTraces
+- ['restyle', update, [trace]] for changed trace attributes (bar heights, colors,
+  gauge value): Plotly.restyle
+- ['relayout', update] for changed layout attributes: Plotly.relayout
+The whole figure is sent only the first time, when the traces change type or count,
+or when the browser lost its chart (page change, reconnection): the component then
+asks for a resync and the next rerun sends the full figure again.
+
+Each payload carries a revision and the revision it applies to, so a delta is never
+applied twice or on top of the wrong figure.
+"""
+
+import base64
+import itertools
+import json
+
+import numpy as np
+import plotly.io as pio
+import streamlit as st
+from plotly.offline import get_plotlyjs_version
+
+# plotly.js build matching the plotly package (same source as to_html(include_plotlyjs='cdn'))
+PLOTLY_JS_URL = f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"
+
+# Height of a figure without layout.height (plotly's default)
+DEFAULT_HEIGHT = 450
+
+# Revisions are unique in the process: a chart rebuilt after a resync never reuses a revision
+_revisions = itertools.count(1)
+
+LIVE_CHART_JS = """
+function loadPlotly() {
+    if (window.Plotly) {
+        return Promise.resolve(window.Plotly);
+    }
+    if (!window.liveChartPlotly) {
+        window.liveChartPlotly = new Promise((resolve, reject) => {
+            const script = document.createElement("script");
+            script.src = "%(plotly_url)s";
+            script.onload = () => resolve(window.Plotly);
+            script.onerror = reject;
+            document.head.appendChild(script);
+        });
+    }
+    return window.liveChartPlotly;
+}
+
+async function apply(Plotly, chart, data, setTriggerValue) {
+    if (chart.liveRevision === data.revision) {
+        return;
+    }
+    if (data.figure) {
+        chart.style.height = data.height + "px";
+        await Plotly.react(chart, data.figure.data, data.figure.layout, {responsive: true, displaylogo: false});
+    } else if (chart.liveRevision !== data.base) {
+        // Not the figure this delta was computed against: ask for the whole figure
+        setTriggerValue("resync", true);
+        return;
+    } else {
+        for (const op of data.ops) {
+            if (op[0] === "extend") {
+                await Plotly.extendTraces(chart, op[1], op[2], op[3]);
+            } else if (op[0] === "restyle") {
+                await Plotly.restyle(chart, op[1], op[2]);
+            } else {
+                await Plotly.relayout(chart, op[1]);
+            }
+        }
+    }
+    chart.liveRevision = data.revision;
+}
+
+export default function (component) {
+    const { data, parentElement, setTriggerValue } = component;
+    let chart = parentElement.querySelector(".live-chart");
+    if (!chart) {
+        chart = document.createElement("div");
+        chart.className = "live-chart";
+        parentElement.appendChild(chart);
+    }
+    // Payloads are applied in order, each once the previous one is drawn
+    chart.livePending = (chart.livePending || Promise.resolve())
+        .then(loadPlotly)
+        .then((Plotly) => apply(Plotly, chart, data, setTriggerValue))
+        .catch((error) => console.error("live chart", error));
+}
+""" % {'plotly_url': PLOTLY_JS_URL}
+
+
+def _plain(value):
+    """Decodes plotly's typed arrays ({'dtype', 'bdata'[, 'shape']}) into lists, recursively"""
+    if isinstance(value, dict):
+        if 'bdata' in value and 'dtype' in value:
+            array = np.frombuffer(base64.b64decode(value['bdata']), dtype=value['dtype'])
+            if 'shape' in value:
+                array = array.reshape([int(size) for size in str(value['shape']).split(',')])
+            return array.tolist()
+        return {name: _plain(item) for name, item in value.items()}
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return value
+
+
+def figure_json(figure):
+    """
+    Plain JSON structure of a figure (dictionaries, lists, strings and numbers only)
+
+    Numeric arrays are lists rather than plotly's base64 typed arrays, so that they
+    can be compared and sliced point by point.
+    """
+    figure = json.loads(pio.to_json(figure, validate=False))
+    return {'data': [_plain(trace) for trace in figure.get('data', [])], 'layout': _plain(figure.get('layout', {}))}
+
+
+def _diff(old, new, prefix=""):
+    """
+    Changed leaves between two JSON structures, as plotly attribute paths
+
+    Dictionaries are compared key by key; lists and scalars are leaves. A key missing
+    from new maps to None (plotly removes the attribute).
+    """
+    changes = {}
+    for name in old.keys() | new.keys():
+        before, after = old.get(name), new.get(name)
+        if before == after:
+            continue
+        path = prefix + name
+        if isinstance(before, dict) and isinstance(after, dict):
+            changes.update(_diff(before, after, path + "."))
+        else:
+            changes[path] = after
+    return changes
+
+
+def _extension(old, new, changes):
+    """
+    Points appended to a trace, when every changed array continues the previous one
+
+    Parameters:
+    - old, new: Trace dictionaries
+    - changes: _diff of the two traces
+
+    Returns:
+    - (update, max_points) for Plotly.extendTraces, or None
+    """
+    arrays = {}
+    for path, after in changes.items():
+        before = old
+        for name in path.split("."):
+            before = before.get(name) if isinstance(before, dict) else None
+        if not isinstance(before, list) or not isinstance(after, list) or not before:
+            return None
+        arrays[path] = (before, after)
+    # Arrays of a trace are point-aligned: they must all have the same length, before and after
+    if len({len(before) for before, _ in arrays.values()}) != 1:
+        return None
+    if len({len(after) for _, after in arrays.values()}) != 1:
+        return None
+
+    # Number of points dropped at the front, found from the last known point of the reference array
+    before, after = arrays['x'] if 'x' in arrays else next(iter(arrays.values()))
+    try:
+        kept = after.index(before[-1]) + 1
+    except ValueError:
+        return None
+    dropped = len(before) - kept
+    if dropped < 0 or kept == len(after):
+        return None
+    if any(after[:kept] != before[dropped:] for before, after in arrays.values()):
+        return None
+    update = {path: [after[kept:]] for path, (_, after) in arrays.items()}
+    return update, len(after)
+
+
+def figure_delta(old, new):
+    """
+    Operations turning the figure old into the figure new in the browser
+
+    Parameters:
+    - old, new: Figures as returned by figure_json
+
+    Returns:
+    - List of ['extend' | 'restyle' | 'relayout', ...] operations (empty if nothing changed),
+      or None when the whole figure has to be sent
+    """
+    old_traces, new_traces = old.get('data', []), new.get('data', [])
+    if len(old_traces) != len(new_traces):
+        return None
+    operations = []
+    for index, (before, after) in enumerate(zip(old_traces, new_traces)):
+        if before == after:
+            continue
+        changes = _diff(before, after)
+        if 'type' in changes:
+            return None
+        extension = _extension(before, after, changes)
+        if extension is not None:
+            operations.append(['extend', extension[0], [index], extension[1]])
+        else:
+            operations.append(['restyle', {path: [value] for path, value in changes.items()}, [index]])
+    layout = _diff(old.get('layout', {}), new.get('layout', {}))
+    if layout:
+        operations.append(['relayout', layout])
+    return operations
+
+
+def live_chart(figure, key):
+    """
+    Draws a plotly figure that is updated in place on the following reruns
+
+    Parameters:
+    - figure: Plotly figure (or the dictionary of figure_json)
+    - key: Stable key of the chart in the page (one chart per key)
+
+    Returns:
+    - Payload sent to the browser (full figure or delta)
+    """
+    state_key = f"live_chart_state_{key}"
+    current = figure if isinstance(figure, dict) else figure_json(figure)
+    state = st.session_state.get(state_key)
+
+    operations = figure_delta(state['figure'], current) if state is not None else None
+    if operations is None:
+        revision = next(_revisions)
+        payload = {'revision': revision, 'figure': current,
+                   'height': current.get('layout', {}).get('height') or DEFAULT_HEIGHT}
+    elif operations:
+        revision = next(_revisions)
+        payload = {'revision': revision, 'base': state['revision'], 'ops': operations}
+    else:
+        # Nothing changed: the browser keeps its chart
+        revision = state['revision']
+        payload = {'revision': revision, 'base': revision, 'ops': []}
+    st.session_state[state_key] = {'revision': revision, 'figure': current}
+
+    def resync():
+        st.session_state.pop(state_key, None)
+
+    # Registered with the running Streamlit runtime at each call (registering the same definition again
+    # is a no-op), so the component also exists in a runtime started after this module was imported
+    component = st.components.v2.component("live_chart", js=LIVE_CHART_JS, isolate_styles=False)
+    component(key=f"live_chart_{key}", data=payload, on_resync_change=resync)
+    return payload
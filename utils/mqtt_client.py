@@ -4,13 +4,14 @@ import time
 import logging
 import threading
 import streamlit as st
+from utils.payload_decoders import create_default_registry, DecodeError
 
 class MQTTClient:
     """
     MQTT Client for connecting to a broker and handling sensor data
     """
     def __init__(self, client_id, host="localhost", port=1883, 
-                 username=None, password=None, topic_prefix="hospital/mattress/"):
+                 username=None, password=None, topic_prefix="hospital/mattress/", decoders=None):
         """
         Initialize MQTT client
         
@@ -21,6 +22,7 @@ class MQTTClient:
         - username: Username for broker authentication (optional)
         - password: Password for broker authentication (optional)
         - topic_prefix: Prefix for MQTT topics to subscribe to
+        - decoders: DecoderRegistry selecting the payload decoder per topic/content type
         """
         self.client_id = client_id
         self.host = host
@@ -32,6 +34,7 @@ class MQTTClient:
         self.connected = False
         self.latest_data = {}
         self.callbacks = []
+        self.decoders = decoders or create_default_registry()
         
         # Configure logging
         logging.basicConfig(level=logging.INFO)
@@ -104,26 +107,38 @@ class MQTTClient:
                 mattress_id = topic_parts[-2]
                 sensor_id = topic_parts[-1]
                 
-                # Parse the message payload as JSON
-                payload = json.loads(msg.payload.decode())
+                # Decode the payload with the decoder registered for this topic/content type
+                properties = getattr(msg, 'properties', None)
+                content_type = getattr(properties, 'ContentType', None)
+                payload = self.decoders.for_topic(msg.topic, content_type).loads(msg.payload)
+                
+                # A batch message carries every reading of one mattress cycle
+                if sensor_id == "batch" and isinstance(payload, dict) and isinstance(payload.get("readings"), list):
+                    readings = [(reading.get("sensor_id"), reading) for reading in payload["readings"]
+                                if isinstance(reading, dict) and reading.get("sensor_id")]
+                else:
+                    readings = [(sensor_id, payload)]
                 
                 # Store the latest data
                 if mattress_id not in self.latest_data:
                     self.latest_data[mattress_id] = {}
                 
-                self.latest_data[mattress_id][sensor_id] = {
-                    'timestamp': time.time(),
-                    'data': payload
-                }
+                received_at = time.time()
+                for reading_sensor_id, reading in readings:
+                    self.latest_data[mattress_id][reading_sensor_id] = {
+                        'timestamp': received_at,
+                        'data': reading
+                    }
                 
                 # Call registered callbacks
-                for callback in self.callbacks:
-                    callback(mattress_id, sensor_id, payload)
+                for reading_sensor_id, reading in readings:
+                    for callback in self.callbacks:
+                        callback(mattress_id, reading_sensor_id, reading)
                 
                 self.logger.debug(f"Received data for mattress {mattress_id}, sensor {sensor_id}")
             
-        except json.JSONDecodeError:
-            self.logger.warning(f"Received invalid JSON: {msg.payload}")
+        except DecodeError:
+            self.logger.warning(f"Received invalid payload: {msg.payload}")
         except Exception as e:
             self.logger.error(f"Error processing message: {e}")
     
@@ -1,11 +1,14 @@
 import paho.mqtt.client as mqtt
-import json
 import time
 import threading
 import logging
 from datetime import datetime
-import streamlit as st
-from datetime import datetime
+import pandas as pd
+from utils.topic_router import TopicRouter
+from utils.ingest_queue import IngestQueue, BatchWorker
+from utils.timeseries import BufferPool, DEFAULT_CAPACITY, parse_epoch
+from utils.payload_decoders import create_default_registry, DecodeError, FORMAT_TOPICS
+from utils.snapshot import SnapshotStore
 
 # Configuration du client MQTT pour l'intégration avec le broker externe
 class MQTTIntegration:
@@ -14,7 +17,12 @@ class MQTTIntegration:
                  port=1883,
                  username=None,
                  password=None,
-                 topics=None):
+                 topics=None,
+                 queue_capacity=10000,
+                 max_batch=500,
+                 history_capacity=DEFAULT_CAPACITY,
+                 decoders=None,
+                 store=None):
         """
         Initialise le client MQTT pour l'intégration avec le broker externe
 
@@ -24,6 +32,11 @@ class MQTTIntegration:
         - username: Nom d'utilisateur pour l'authentification (optionnel)
         - password: Mot de passe pour l'authentification (optionnel)
         - topics: Liste des topics à écouter
+        - queue_capacity: Taille de la file d'ingestion (au-delà, les plus anciens messages sont perdus)
+        - max_batch: Nombre maximal de messages décodés par lot
+        - history_capacity: Nombre de points conservés en mémoire par capteur
+        - decoders: DecoderRegistry choisissant le décodeur de chaque topic (par défaut JSON rapide + formats binaires)
+        - store: HistoryStore recevant toutes les lectures (historique persistant), optionnel
         """
         self.host = host
         self.port = port
@@ -33,7 +46,10 @@ class MQTTIntegration:
         self.client = mqtt.Client(client_id=self.client_id)
         self.client.reconnect_delay_set(min_delay=1, max_delay=60)
         self.connected = False
-        self.latest_data = {}
+        # Dernières valeurs : instantanés immuables publiés une fois par lot, lus sans verrou
+        self.snapshots = SnapshotStore()
+        self.history = BufferPool(capacity=history_capacity)
+        self.store = store
 
         # Configurer l'authentification si nécessaire
         if username and password:
@@ -45,26 +61,21 @@ class MQTTIntegration:
             "capteur/humidite",
             "capteur/debit_urinaire", 
             "capteur/poul",
-            "capteur/creatine"
+            "capteur/creatine",
+            *FORMAT_TOPICS
         ]
 
-        # Map des topics vers les types de capteurs
-        self.topic_type_map = {
-            "capteur/temperature": "temperature",
-            "capteur/humidite": "humidity",
-            "capteur/debit_urinaire": "debit",
-            "capteur/poul": "poul",
-            "capteur/creatine": "creatine"
-        }
+        # Table de routage (topic, uid) -> descripteur de capteur, compilée une seule fois
+        self.router = TopicRouter()
+        self.decoders = decoders or create_default_registry()
+        self._last_ts_second = None
+        self._last_ts_string = None
 
-        # Map des types de capteurs pour la compatibilité
-        self.sensor_type_map = {
-            "temperature": "temperature",
-            "humidity": "humidity",
-            "debit": "flow",
-            "poul": "pulse",
-            "creatine": "creatinine"
-        }
+        # File d'ingestion : le thread paho empile, le worker décode et applique par lots
+        self._lock = threading.Lock()
+        self.ingest_queue = IngestQueue(capacity=queue_capacity)
+        self.ingest_worker = BatchWorker(self.ingest_queue, self._process_batch,
+                                         max_batch=max_batch, name="mqtt-ingest")
 
         # Configure logging
         logging.basicConfig(level=logging.INFO)
@@ -81,11 +92,13 @@ class MQTTIntegration:
         """
         try:
             self.logger.info(f"Connexion au broker MQTT {self.host}:{self.port}")
+            self.ingest_worker.start()
             self.client.connect(self.host, self.port, 60)
             self.client.loop_start()
             return True
         except Exception as e:
             self.logger.error(f"Échec de connexion au broker MQTT: {e}")
+            self.ingest_worker.stop()
             return False
 
     def disconnect(self):
@@ -94,6 +107,7 @@ class MQTTIntegration:
         """
         self.client.loop_stop()
         self.client.disconnect()
+        self.ingest_worker.stop()
         self.connected = False
         self.logger.info("Déconnecté du broker MQTT")
 
@@ -126,150 +140,166 @@ class MQTTIntegration:
     def on_message(self, client, userdata, msg):
         """
         Callback appelé lorsqu'un message est reçu du broker
+        Exécuté sur le thread réseau de paho : on se contente d'empiler le message brut,
+        le décodage est fait par le worker d'ingestion
         """
-        from utils.data_manager import update_mqtt_data
+        self.ingest_queue.put(msg.topic, msg.payload, time.time())
+
+    def _decode_message(self, topic, payload_bytes, recv_ts):
+        """
+        Décode un message brut en données de capteur
+        Le décodeur est choisi par topic ; un message peut contenir plusieurs lectures
+
+        Returns:
+        - Liste de tuples (SensorRoute, valeur, timestamp epoch en secondes), vide si le message doit être ignoré
+        """
+        decoder = self.decoders.for_topic(topic)
+        if decoder is None:
+            self.logger.warning(f"Aucun décodeur pour le topic: {topic}")
+            return []
+
         try:
-            # Afficher le message reçu pour le débogage
-            self.logger.info(f"Message reçu sur le topic {msg.topic}")
-
-            # Pour les nouveaux topics comme capteur/temperature
-            topic = msg.topic
-            if topic not in self.topic_type_map:
-                self.logger.warning(f"Topic non reconnu: {topic}")
-                return
-
-            sensor_type = self.topic_type_map[topic]
-
-            # Map des topics vers les types de capteurs
-            self.topic_type_map = {
-                "capteur/temperature": "temperature",
-                "capteur/humidite": "humidity",
-                "capteur/debit_urinaire": "debit",
-                "capteur/poul": "poul",
-                "capteur/creatine": "creatine"
-            }
-
-            # Map des types de capteurs pour la compatibilité
-            self.sensor_type_map = {
-                "temperature": "temperature",
-                "humidity": "humidity",
-                "debit": "flow",
-                "poul": "pulse",
-                "creatine": "creatinine"
-            }
-
-            # Map des types de capteurs aux IDs par matelas
-            def get_sensor_id(sensor_type, mattress_id):
-                base_ids = {
-                    "temperature": 202,
-                    "humidity": 203,
-                    "debit": 204,
-                    "poul": 205,
-                    "creatine": 206
-                }
-                try:
-                    mat_num = int(mattress_id.split('-')[1])
-                    offset = (mat_num - 101) * 10
-                    return base_ids[sensor_type] + offset
-                except (ValueError, KeyError, IndexError):
-                    self.logger.error(f"Error getting sensor ID for mattress {mattress_id}, sensor {sensor_type}")
-                    return None
+            readings = decoder.decode(topic, payload_bytes)
+        except (DecodeError, AttributeError, TypeError, ValueError) as e:
+            self.logger.warning(f"Impossible de décoder le payload ({decoder.name}): {e}")
+            return []
+
+        decoded = []
+        for reading in readings:
+            # Le topic de routage vient de la lecture : les formats binaires portent le type dans la trame
+            if not self.router.knows_topic(reading.topic):
+                self.logger.warning(f"Topic non reconnu: {reading.topic}")
+                continue
+
+            # Descripteur précalculé : ID du capteur, type, unité et matelas
+            route = self.router.resolve(reading.topic, reading.uid)
+            if route is None:
+                continue
+
+            value = reading.value
+            if value is None:
+                self.logger.warning(f"Payload incomplet: {reading}")
+                continue
+
+            if not isinstance(value, (int, float)):
+                self.logger.warning(f"Valeur non numérique ignorée: {value!r}")
+                continue
+
+            # Un timestamp inutilisable (NaN, microsecondes, ...) n'écarte que cette lecture, pas le lot
+            epoch = recv_ts if reading.timestamp is None else parse_epoch(reading.timestamp)
+            if epoch is None:
+                self.logger.warning(f"Timestamp invalide: {reading.timestamp!r}")
+                continue
+
+            decoded.append((route, value, epoch))
+        return decoded
+
+    def _current_record(self, route, value, epoch):
+        """Construit l'enregistrement 'current' exposé par get_latest_data"""
+        return {
+            'id': route.sensor_id,
+            'name': route.name,
+            'type': route.mapped_type,
+            'value': value,
+            'unit': route.unit,
+            'timestamp': self._format_timestamp(epoch),
+            'topic': route.topic,
+            'mattress_id': route.mattress_id,
+            'status': "active"
+        }
 
-            try:
-                # Tenter de décoder le payload JSON
-                payload = json.loads(msg.payload.decode())
-                value = payload.get("value")
-                uid = payload.get("uid", "1234567890abcdef")  # Default to MAT-101
-                timestamp = datetime.fromtimestamp(payload.get("timestamp", time.time())).strftime("%Y-%m-%d %H:%M:%S")
-
-                # Extraire l'ID du matelas depuis l'UUID
-                mattress_map = {
-                    "1234567890abcdef": "MAT-101",
-                    "abcdef1234567890": "MAT-102", 
-                    "0abcdef123456789": "MAT-103",
-                    "def0123456789abc": "MAT-104",
-                    "789abcdef012345": "MAT-105"
-                }
-                mattress_id = mattress_map.get(uid, "MAT-101")  # Default to MAT-101
-
-                sensor_id = get_sensor_id(sensor_type, mattress_id)
-                if sensor_id is None:
-                    return
-
-                if value is None:
-                    self.logger.warning(f"Payload incomplet: {payload}")
-                    return
-
-                # Définir les unités selon le type de capteur
-                units = {
-                    "temperature": "°C",
-                    "humidity": "%",
-                    "debit": "L/h",
-                    "poul": "bpm",
-                    "creatine": "mg/dL"
-                }
-                unit = units.get(sensor_type, "")
-                status = "active"
-                sensor_name = f"Capteur {sensor_type.capitalize()}"
+    def _process_batch(self, batch):
+        """
+        Décode un lot de messages puis applique toutes les lectures sous un seul verrou
 
+        Parameters:
+        - batch: Liste de tuples (topic, payload_bytes, recv_ts)
+        """
+        readings = []
+        for topic, payload_bytes, recv_ts in batch:
+            try:
+                readings.extend(self._decode_message(topic, payload_bytes, recv_ts))
             except Exception as e:
                 self.logger.error(f"Erreur lors du traitement du message: {e}")
-                return
-
-                # Définir les unités selon le type de capteur
-                units = {
-                    "temperature": "°C",
-                    "humidity": "%",
-                    "debit": "L/h",
-                    "poul": "bpm",
-                    "creatine": "mg/dL"
-                }
-                unit = units.get(sensor_type, "")
-                status = "active"
-                sensor_name = f"Capteur {sensor_type.capitalize()}"
-
-            except (json.JSONDecodeError, AttributeError) as e:
-                self.logger.warning(f"Impossible de parser le payload JSON: {e}")
-                return
-
-            # Mapping du type de capteur si nécessaire
-            mapped_type = self.sensor_type_map.get(sensor_type, sensor_type)
-
-            # Stocker les données actuelles
-            current_data = {
-                'id': sensor_id,
-                'name': sensor_name or f"Capteur {sensor_id}",
-                'type': mapped_type,
-                'value': value,
-                'unit': unit,
-                'timestamp': timestamp,
-                'topic': msg.topic,
-                'mattress_id': mattress_id,
-                'status': status
-            }
-
-            # Créer ou mettre à jour l'historique des données pour ce capteur
-            if sensor_id not in self.latest_data:
-                self.latest_data[sensor_id] = {
-                    'current': current_data,
-                    'history': [current_data]
-                }
+
+        if not readings:
+            return
+
+        # Regroupement par capteur : une seule écriture (vectorisée) et un seul enregistrement
+        # courant par capteur, quel que soit le nombre de lectures du lot
+        by_sensor = {}
+        for route, value, epoch in readings:
+            entry = by_sensor.get(route.sensor_id)
+            if entry is None:
+                by_sensor[route.sensor_id] = [route, value, epoch, [int(epoch * 1_000_000_000)], [value]]
             else:
-                # Mettre à jour les données courantes
-                self.latest_data[sensor_id]['current'] = current_data
+                entry[1] = value
+                entry[2] = epoch
+                entry[3].append(int(epoch * 1_000_000_000))
+                entry[4].append(value)
+
+        updates = {}
+        with self._lock:
+            for sensor_id, (route, value, epoch, timestamps_ns, values) in by_sensor.items():
+                # Données courantes : la dernière lecture du lot
+                updates[sensor_id] = self._current_record(route, value, epoch)
+
+                # Ajouter à l'historique : anneau NumPy préalloué, sans copie de liste
+                if len(values) == 1:
+                    self.history.append(sensor_id, timestamps_ns[0], value)
+                else:
+                    self.history.extend(sensor_id, timestamps_ns, values)
+
+        # Un seul nouvel instantané pour tout le lot, publié après l'historique
+        self.snapshots.publish(updates)
+
+        # Historique persistant : le writer du store regroupe les commits
+        if self.store is not None:
+            self.store.append_many([
+                (sensor_id, ts_ns, sample)
+                for sensor_id, (_, _, _, timestamps_ns, values) in by_sensor.items()
+                for ts_ns, sample in zip(timestamps_ns, values)
+            ])
+
+        self.logger.debug("Lot appliqué: %d lectures sur %d messages", len(readings), len(batch))
+
+    def get_ingest_stats(self):
+        """
+        Retourne les statistiques de la file d'ingestion
+
+        Returns:
+        - Dictionnaire: profondeur de file, messages perdus, taille des lots, ...
+        """
+        return self.ingest_worker.get_stats()
+
+    def _format_timestamp(self, epoch):
+        """
+        Formate un timestamp epoch en chaîne, en réutilisant le résultat pour une même seconde
+        Les capteurs publient plusieurs valeurs par seconde : strftime n'est appelé qu'une fois
+        """
+        second = int(epoch)
+        if second != self._last_ts_second:
+            self._last_ts_string = datetime.fromtimestamp(second).strftime("%Y-%m-%d %H:%M:%S")
+            self._last_ts_second = second
+        return self._last_ts_string
 
-                # Ajouter à l'historique (limité à 20 entrées)
-                history = self.latest_data[sensor_id]['history']
-                history.append(current_data)
+    def reconfigure_routing(self, **kwargs):
+        """
+        Recompile la table de routage après un changement de configuration
 
-                # Garder seulement les 20 dernières entrées
-                if len(history) > 20:
-                    self.latest_data[sensor_id]['history'] = history[-20:]
+        Parameters:
+        - kwargs: Voir TopicRouter.reconfigure (topic_type_map, mattress_map, units, ...)
+        """
+        self.router.reconfigure(**kwargs)
 
-            self.logger.info(f"Données mises à jour pour le capteur {sensor_id} du matelas {mattress_id}: {value} {unit}")
+    def get_snapshot(self):
+        """
+        Retourne l'instantané courant des dernières valeurs (O(1), sans verrou)
 
-        except Exception as e:
-            self.logger.error(f"Erreur lors du traitement du message: {e}")
+        Returns:
+        - Snapshot: version + mapping en lecture seule ID du capteur -> données courantes
+        """
+        return self.snapshots.snapshot()
 
     def get_latest_data(self, sensor_id=None, history=False):
         """
@@ -281,37 +311,58 @@ class MQTTIntegration:
 
         Returns:
         - Dictionnaire des dernières données ou liste de l'historique
+          (pour l'historique, préférer get_history_frame qui évite la conversion en dictionnaires)
         """
+        # Toutes les lectures portent sur un même instantané cohérent
+        snapshot = self.snapshots.snapshot()
         if sensor_id is None:
             # Si on veut l'historique pour tous les capteurs
             if history:
-                result = {}
-                for sensor_id, data in self.latest_data.items():
-                    result[sensor_id] = data.get('history', [])
-                return result
-            else:
-                # Sinon, retourne seulement les données actuelles pour tous les capteurs
-                result = {}
-                for sensor_id, data in self.latest_data.items():
-                    result[sensor_id] = data.get('current', {})
-                return result
+                return {sid: self._history_records(sid) for sid in snapshot.data}
+            # Sinon, retourne seulement les données actuelles pour tous les capteurs
+            return dict(snapshot.data)
 
         # Si le capteur n'existe pas
-        if sensor_id not in self.latest_data:
-            return {}
+        if sensor_id not in snapshot:
+            return [] if history else {}
 
         # Si on veut l'historique pour un capteur spécifique
         if history:
-            return self.latest_data[sensor_id].get('history', [])
-        else:
-            return self.latest_data[sensor_id].get('current', {})
+            return self._history_records(sensor_id)
+        return snapshot.get(sensor_id)
+
+    def _history_records(self, sensor_id):
+        """Historique d'un capteur au format liste de dictionnaires {'timestamp', 'value'}"""
+        frame = self.get_history_frame(sensor_id)
+        return [
+            {'timestamp': ts.strftime("%Y-%m-%d %H:%M:%S"), 'value': value}
+            for ts, value in zip(frame['timestamp'], frame['value'])
+        ]
+
+    def get_history_frame(self, sensor_id, n=None, start_ns=None):
+        """
+        Retourne l'historique d'un capteur sous forme de DataFrame
 
-# Création d'une instance globale pour l'intégration MQTT
-mqtt_integration = None
+        Parameters:
+        - sensor_id: ID du capteur
+        - n: Nombre de points les plus récents (par défaut: tout le tampon)
+        - start_ns: Ne garder que les points postérieurs à ce timestamp epoch en nanosecondes
+
+        Returns:
+        - DataFrame avec les colonnes 'timestamp' et 'value' (vide si aucune donnée)
+        """
+        buffer = self.history.get(sensor_id)
+        if buffer is None:
+            return pd.DataFrame({'timestamp': pd.Series(dtype='datetime64[ns]'),
+                                 'value': pd.Series(dtype='float64')})
+        with self._lock:
+            return buffer.to_frame(n=n, start_ns=start_ns)
 
 def initialize_mqtt_integration(host="localhost", port=1883, username=None, password=None, topics=None):
     """
-    Initialise l'intégration MQTT
+    Initialise l'intégration MQTT du service d'ingestion partagé
+    Une seule connexion au broker est maintenue par processus serveur, quel que soit
+    le nombre de sessions ouvertes
 
     Parameters:
     - host: Adresse du broker MQTT
@@ -320,47 +371,20 @@ def initialize_mqtt_integration(host="localhost", port=1883, username=None, pass
     - password: Mot de passe pour l'authentification (optionnel)
     - topics: Liste des topics à écouter (optionnel)
     """
-    global mqtt_integration
-
-    # Si l'intégration existe déjà, la déconnecter d'abord
-    if mqtt_integration is not None:
-        try:
-            mqtt_integration.disconnect()
-        except:
-            pass
-        mqtt_integration = None
-
-    # Créer une nouvelle instance
-    mqtt_integration = MQTTIntegration(
-        host=host, 
-        port=port, 
-        username=username, 
-        password=password,
-        topics=topics
-    )
-
-    # Se connecter
-    success = mqtt_integration.connect()
-
-    if success:
-        # Stocker l'intégration dans le session state pour qu'elle soit accessible partout
-        st.session_state['mqtt_integration'] = mqtt_integration
+    from utils.ingestion_service import get_ingestion_service
 
+    service = get_ingestion_service()
+    if service.reconfigure(host=host, port=port, username=username, password=password, topics=topics):
         logging.info(f"Intégration MQTT initialisée et connectée à {host}:{port}")
-        return mqtt_integration
-    else:
-        logging.error(f"Échec de l'initialisation de l'intégration MQTT avec {host}:{port}")
-        return None
+        return service.mqtt_integration
+
+    logging.error(f"Échec de l'initialisation de l'intégration MQTT avec {host}:{port}")
+    return None
 
 def get_mqtt_integration():
     """
-    Retourne l'instance d'intégration MQTT
+    Retourne l'intégration MQTT connectée du service partagé, ou None
     """
-    global mqtt_integration
-
-    # Si déjà dans session_state, utiliser celle-là
-    if 'mqtt_integration' in st.session_state:
-        return st.session_state['mqtt_integration']
+    from utils.ingestion_service import get_ingestion_handle
 
-    # Sinon, initialiser une nouvelle instance
-    return initialize_mqtt_integration()
\ No newline at end of file
+    return get_ingestion_handle().mqtt_integration
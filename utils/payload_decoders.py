@@ -0,0 +1,426 @@
+"""
+Décodeurs de payloads MQTT interchangeables
+Un registre associe chaque topic (filtres MQTT avec + et #) ou content-type à un décodeur.
+Formats fournis : JSON rapide (msgspec > orjson > json), CBOR, MessagePack et trames
+binaires struct. Chaque format accepte aussi des lots : un message d'un UID de matelas
+portant plusieurs lectures, de types et d'horodatages différents. Les bibliothèques msgspec, orjson, cbor2 et msgpack sont
+optionnelles : un format dont la bibliothèque est absente n'est simplement pas enregistré.
+"""
+
+import json
+import logging
+import struct
+from collections import namedtuple
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+# Lecture décodée, indépendante du format de transport
+# topic : topic de routage (capteur/<type>), qui peut différer du topic de réception
+# timestamp : epoch en secondes, ou None si le capteur ne l'a pas fourni
+Reading = namedtuple("Reading", ["topic", "uid", "value", "timestamp"])
+
+# Codes de type utilisés par les formats binaires compacts
+TYPE_CODES = {
+    0: "capteur/temperature",
+    1: "capteur/humidite",
+    2: "capteur/debit_urinaire",
+    3: "capteur/poul",
+    4: "capteur/creatine"
+}
+TYPE_CODE_BY_TOPIC = {topic: code for code, topic in TYPE_CODES.items()}
+
+DEFAULT_UID = "1234567890abcdef"  # MAT-101
+
+# Topics réservés aux formats binaires
+FRAME_TOPIC = "capteur/frame"
+CBOR_TOPIC = "capteur/cbor"
+MSGPACK_TOPIC = "capteur/msgpack"
+BATCH_FRAME_TOPIC = "capteur/batch_frame"
+BINARY_TOPICS = (FRAME_TOPIC, CBOR_TOPIC, MSGPACK_TOPIC, BATCH_FRAME_TOPIC)
+
+# Lots JSON (ou CBOR / MessagePack) : {"uid": ..., "timestamp": ..., "readings": [{"type", "value", "timestamp"}, ...]}
+BATCH_TOPIC = "capteur/batch"
+
+# Topics dédiés à un format (en plus des topics capteur/<type>), à ajouter aux abonnements
+FORMAT_TOPICS = (BATCH_TOPIC,) + BINARY_TOPICS
+
+
+class DecodeError(ValueError):
+    """Payload illisible pour le décodeur sélectionné"""
+
+
+class PayloadDecoder:
+    """
+    Interface commune des décodeurs
+
+    - loads(payload) -> objet Python générique (dict, list, ...)
+    - decode(topic, payload) -> liste de Reading
+    """
+    name = "base"
+    content_type = None
+
+    def loads(self, payload):
+        raise NotImplementedError
+
+    def decode(self, topic, payload):
+        """Décode un message simple (type donné par le topic) ou un lot de lectures"""
+        return _readings_from_mapping(topic, self.loads(payload))
+
+
+def _reading_topic(topic, type_field, allow_names=True):
+    """
+    Topic de routage d'une lecture : code numérique, nom de topic ('poul' ou 'capteur/poul')
+    ou, à défaut, le topic de réception
+    Un message simple n'accepte que le code numérique : son champ 'type' texte est descriptif
+    """
+    if isinstance(type_field, int):
+        return TYPE_CODES.get(type_field, topic)
+    if allow_names and isinstance(type_field, str):
+        return type_field if type_field.startswith("capteur/") else f"capteur/{type_field}"
+    return topic
+
+
+def _readings_from_mapping(topic, data):
+    """
+    Construit les Reading d'un dictionnaire
+    - message simple : {uid, value, timestamp[, type]}
+    - lot : {uid, timestamp, readings: [{type, value[, timestamp]}, ...]} ; le timestamp du lot
+      s'applique aux lectures qui n'en ont pas
+    """
+    if not isinstance(data, dict):
+        raise DecodeError(f"Payload inattendu: {type(data).__name__}")
+    uid = data.get("uid")
+    if uid is None:
+        uid = DEFAULT_UID
+    entries = data.get("readings")
+    if entries is None:
+        return [Reading(_reading_topic(topic, data.get("type"), allow_names=False), uid,
+                        data.get("value"), data.get("timestamp"))]
+    if not isinstance(entries, list):
+        raise DecodeError("Champ 'readings' invalide")
+    batch_ts = data.get("timestamp")
+    readings = []
+    for entry in entries:
+        if not isinstance(entry, dict):
+            raise DecodeError(f"Lecture inattendue: {type(entry).__name__}")
+        readings.append(Reading(_reading_topic(topic, entry.get("type")), uid, entry.get("value"),
+                                entry.get("timestamp", batch_ts)))
+    return readings
+
+
+if msgspec is not None:
+    class BatchEntry(msgspec.Struct):
+        """Lecture d'un lot"""
+        type: int | str | None = None
+        value: object = None
+        timestamp: float | None = None
+
+    class SensorPayload(msgspec.Struct):
+        """Payload JSON d'un capteur (ou lot d'un matelas), décodé directement depuis les octets"""
+        value: object = None
+        uid: str | None = None  # absent ou null : DEFAULT_UID, comme les autres décodeurs
+        timestamp: float | None = None
+        type: int | str | None = None
+        readings: list[BatchEntry] | None = None
+
+
+class JsonDecoder(PayloadDecoder):
+    """
+    JSON décodé directement depuis les octets
+    msgspec décode en struct typée (pas de dict intermédiaire), sinon orjson, sinon json
+    """
+    content_type = "application/json"
+
+    def __init__(self, backend=None):
+        """
+        Parameters:
+        - backend: 'msgspec', 'orjson' ou 'json' ; par défaut le plus rapide disponible
+        """
+        if backend is None:
+            backend = "msgspec" if msgspec is not None else "orjson" if orjson is not None else "json"
+        if backend == "msgspec" and msgspec is None or backend == "orjson" and orjson is None:
+            raise ImportError(f"Backend JSON indisponible: {backend}")
+        self.backend = backend
+        self.name = f"json/{backend}"
+        if backend == "msgspec":
+            self._typed = msgspec.json.Decoder(SensorPayload)
+            self._generic = msgspec.json.Decoder()
+            self.loads = self._loads_msgspec
+            self.decode = self._decode_msgspec
+        elif backend == "orjson":
+            self.loads = self._loads_orjson
+        else:
+            self.loads = self._loads_json
+
+    def _loads_msgspec(self, payload):
+        try:
+            return self._generic.decode(payload)
+        except msgspec.DecodeError as e:
+            raise DecodeError(str(e)) from e
+
+    def _decode_msgspec(self, topic, payload):
+        try:
+            data = self._typed.decode(payload)
+        except (msgspec.DecodeError, msgspec.ValidationError) as e:
+            raise DecodeError(str(e)) from e
+        uid = DEFAULT_UID if data.uid is None else data.uid
+        if data.readings is None:
+            return [Reading(_reading_topic(topic, data.type, allow_names=False), uid, data.value, data.timestamp)]
+        batch_ts = data.timestamp
+        return [
+            Reading(_reading_topic(topic, entry.type), uid, entry.value,
+                    batch_ts if entry.timestamp is None else entry.timestamp)
+            for entry in data.readings
+        ]
+
+    def _loads_orjson(self, payload):
+        try:
+            return orjson.loads(payload)
+        except orjson.JSONDecodeError as e:
+            raise DecodeError(str(e)) from e
+
+    def _loads_json(self, payload):
+        try:
+            return json.loads(payload.decode() if isinstance(payload, (bytes, bytearray)) else payload)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise DecodeError(str(e)) from e
+
+
+class CborDecoder(PayloadDecoder):
+    """CBOR : même structure que le JSON, avec 'type' en code numérique"""
+    name = "cbor"
+    content_type = "application/cbor"
+
+    def loads(self, payload):
+        try:
+            return cbor2.loads(payload)
+        except (cbor2.CBORDecodeError, ValueError) as e:
+            raise DecodeError(str(e)) from e
+
+
+class MsgpackDecoder(PayloadDecoder):
+    """MessagePack : même structure que le JSON, avec 'type' en code numérique"""
+    name = "msgpack"
+    content_type = "application/msgpack"
+
+    def loads(self, payload):
+        try:
+            return msgpack.unpackb(payload, raw=False)
+        except (msgpack.UnpackException, ValueError) as e:
+            raise DecodeError(str(e)) from e
+
+
+class StructFrameDecoder(PayloadDecoder):
+    """
+    Trame binaire de taille fixe, little-endian :
+    uid (16 octets ASCII, complété par des NUL) | code type (uint8) | valeur (float64) | timestamp (float64)
+    """
+    name = "struct"
+    content_type = "application/x-medimat-frame"
+    FRAME = struct.Struct("<16sBdd")
+
+    def loads(self, payload):
+        reading = self.decode(None, payload)[0]
+        return {"uid": reading.uid, "type": TYPE_CODE_BY_TOPIC.get(reading.topic),
+                "value": reading.value, "timestamp": reading.timestamp}
+
+    def decode(self, topic, payload):
+        try:
+            uid, type_code, value, timestamp = self.FRAME.unpack(payload)
+        except struct.error as e:
+            raise DecodeError(str(e)) from e
+        routed_topic = TYPE_CODES.get(type_code)
+        if routed_topic is None:
+            raise DecodeError(f"Code de type inconnu: {type_code}")
+        return [Reading(routed_topic, uid.rstrip(b"\0").decode("ascii"), value, timestamp)]
+
+
+class BatchFrameDecoder(PayloadDecoder):
+    """
+    Lot binaire d'un matelas, little-endian :
+    en-tête  uid (16 octets ASCII) | timestamp de base (float64) | nombre de lectures (uint16)
+    lecture  code type (uint8) | décalage en ms depuis la base (int32) | valeur (float64)
+    Les lectures sont décodées par struct.iter_unpack, en une seule passe sur le buffer
+    """
+    name = "batch_frame"
+    content_type = "application/x-medimat-batch"
+    HEADER = struct.Struct("<16sdH")
+    ENTRY = struct.Struct("<Bid")
+
+    def loads(self, payload):
+        readings = self.decode(None, payload)
+        return {
+            "uid": readings[0].uid if readings else None,
+            "readings": [{"type": TYPE_CODE_BY_TOPIC[r.topic], "value": r.value, "timestamp": r.timestamp}
+                         for r in readings]
+        }
+
+    def decode(self, topic, payload):
+        try:
+            uid, base_ts, count = self.HEADER.unpack_from(payload)
+        except struct.error as e:
+            raise DecodeError(str(e)) from e
+        if len(payload) != self.HEADER.size + count * self.ENTRY.size:
+            raise DecodeError(f"Taille de lot incohérente: {len(payload)} octets pour {count} lectures")
+        uid = uid.rstrip(b"\0").decode("ascii")
+        readings = []
+        for code, offset_ms, value in self.ENTRY.iter_unpack(memoryview(payload)[self.HEADER.size:]):
+            routed_topic = TYPE_CODES.get(code)
+            if routed_topic is None:
+                raise DecodeError(f"Code de type inconnu: {code}")
+            readings.append(Reading(routed_topic, uid, value, base_ts + offset_ms / 1000.0))
+        return readings
+
+
+def encode_frame(uid, topic, value, timestamp):
+    """Encode une lecture au format StructFrameDecoder (utilisé par les simulateurs et benchmarks)"""
+    return StructFrameDecoder.FRAME.pack(uid.encode("ascii"), TYPE_CODE_BY_TOPIC[topic], float(value), float(timestamp))
+
+
+def make_batch(uid, readings, timestamp=None):
+    """
+    Construit un lot au format dictionnaire (JSON, CBOR ou MessagePack)
+
+    Parameters:
+    - uid: UID de l'ESP32 du matelas
+    - readings: Itérable de (topic, valeur, timestamp)
+    - timestamp: Timestamp commun ; les lectures qui ont ce timestamp ne le répètent pas
+    """
+    entries = []
+    for topic, value, reading_ts in readings:
+        entry = {"type": TYPE_CODE_BY_TOPIC[topic], "value": value}
+        if reading_ts != timestamp:
+            entry["timestamp"] = reading_ts
+        entries.append(entry)
+    batch = {"uid": uid, "readings": entries}
+    if timestamp is not None:
+        batch["timestamp"] = timestamp
+    return batch
+
+
+def encode_batch_frame(uid, readings):
+    """
+    Encode un lot au format BatchFrameDecoder
+
+    Parameters:
+    - uid: UID de l'ESP32 du matelas
+    - readings: Liste de (topic, valeur, timestamp), au plus 65535 lectures
+    """
+    base_ts = min(reading_ts for _, _, reading_ts in readings) if readings else 0.0
+    parts = [BatchFrameDecoder.HEADER.pack(uid.encode("ascii"), base_ts, len(readings))]
+    for topic, value, reading_ts in readings:
+        parts.append(BatchFrameDecoder.ENTRY.pack(TYPE_CODE_BY_TOPIC[topic],
+                                                  round((reading_ts - base_ts) * 1000), float(value)))
+    return b"".join(parts)
+
+
+def topic_matches(subscription, topic):
+    """Teste un topic contre un filtre MQTT (+ pour un niveau, # pour la suite)"""
+    sub_parts = subscription.split("/")
+    topic_parts = topic.split("/")
+    for i, part in enumerate(sub_parts):
+        if part == "#":
+            return True
+        if i >= len(topic_parts):
+            return False
+        if part != "+" and part != topic_parts[i]:
+            return False
+    return len(sub_parts) == len(topic_parts)
+
+
+class DecoderRegistry:
+    """
+    Sélection du décodeur par topic (premier filtre enregistré qui correspond) ou par content-type
+    La résolution d'un topic est mise en cache : le coût par message est une recherche dans un dict
+    """
+    def __init__(self, default=None):
+        """
+        Parameters:
+        - default: Décodeur utilisé si aucun filtre ne correspond (None: message rejeté)
+        """
+        self.default = default
+        self._by_filter = []
+        self._by_content_type = {}
+        self._cache = {}
+
+    def register(self, decoder, topics=(), content_type=None):
+        """
+        Enregistre un décodeur
+
+        Parameters:
+        - decoder: Instance de PayloadDecoder
+        - topics: Filtres de topics MQTT servis par ce décodeur
+        - content_type: Content-type MQTT v5 servi par ce décodeur (par défaut decoder.content_type)
+        """
+        for topic_filter in topics:
+            self._by_filter.append((topic_filter, decoder))
+        content_type = content_type or decoder.content_type
+        if content_type:
+            self._by_content_type.setdefault(content_type, decoder)
+        self._cache.clear()
+
+    def for_topic(self, topic, content_type=None):
+        """
+        Retourne le décodeur à utiliser
+
+        Parameters:
+        - topic: Topic du message
+        - content_type: Content-type MQTT v5 du message, prioritaire s'il est connu
+        """
+        if content_type:
+            decoder = self._by_content_type.get(content_type)
+            if decoder is not None:
+                return decoder
+        decoder = self._cache.get(topic)
+        if decoder is None:
+            decoder = self.default
+            for topic_filter, candidate in self._by_filter:
+                if topic_matches(topic_filter, topic):
+                    decoder = candidate
+                    break
+            self._cache[topic] = decoder
+        return decoder
+
+    def decoders(self):
+        """Liste des décodeurs enregistrés (sans doublon)"""
+        seen = []
+        for _, decoder in self._by_filter:
+            if decoder not in seen:
+                seen.append(decoder)
+        return seen
+
+
+def create_default_registry():
+    """
+    Registre par défaut : formats binaires sur leurs topics dédiés, JSON rapide pour le reste
+    """
+    json_decoder = JsonDecoder()
+    registry = DecoderRegistry(default=json_decoder)
+    registry.register(StructFrameDecoder(), topics=[FRAME_TOPIC])
+    registry.register(BatchFrameDecoder(), topics=[BATCH_FRAME_TOPIC])
+    if cbor2 is not None:
+        registry.register(CborDecoder(), topics=[CBOR_TOPIC])
+    if msgpack is not None:
+        registry.register(MsgpackDecoder(), topics=[MSGPACK_TOPIC])
+    registry.register(json_decoder, topics=["#"])
+    return registry
@@ -1,7 +1,5 @@
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import random
 
 def get_sensor_status_color(status):
     """
@@ -22,7 +20,45 @@ def get_sensor_status_color(status):
 
 # Battery level function removed as sensors are now plugged in, not battery-powered
 
-def generate_sample_data(sensor_type, start_time, end_time, interval_seconds=300):
+# Synthetic signal per sensor type: base + amplitude * sin(i / period) + uniform noise in [-noise, noise]
+SIGNAL_PROFILES = {
+    'pressure': (100, 20, 50, 5),       # mmHg, normal range around 80-120
+    'temperature': (37, 0.5, 100, 0.2), # Body temperature in Celsius, around 36-38
+    'humidity': (50, 10, 80, 3),        # Percentage, around 40-60%
+}
+DEFAULT_SIGNAL_PROFILE = (50, 25, 60, 10)  # Generic values between 0-100
+
+# Movement intensity (0-10): bursts of movement on 20 points out of every 100
+MOVEMENT_CYCLE = 100
+MOVEMENT_ACTIVE_POINTS = 20
+
+def _sample_timestamps(start_time, end_time, interval_seconds):
+    """Regular timestamps from start_time to end_time (included when it falls on the grid)"""
+    total_seconds = (end_time - start_time).total_seconds()
+    num_points = int(total_seconds / interval_seconds) + 1
+    return pd.date_range(start_time, periods=num_points, freq=pd.Timedelta(seconds=interval_seconds))
+
+def sample_values(sensor_type, num_sensors, num_points, rng, start_index=0):
+    """
+    Values of num_sensors sensors of one type, computed as one array
+
+    Parameters:
+    - start_index: Position of the first point in the wave (lets a series be generated piece by piece)
+
+    Returns:
+    - float64 array of shape (num_sensors, num_points)
+    """
+    i = np.arange(start_index, start_index + num_points)
+    if sensor_type == 'movement':
+        # Simulate periods of movement and rest
+        moving = (i % MOVEMENT_CYCLE) < MOVEMENT_ACTIVE_POINTS
+        # One uniform draw scaled to [3, 8) while moving, [0, 1) at rest
+        return rng.random((num_sensors, num_points)) * np.where(moving, 5, 1) + np.where(moving, 3, 0)
+    base_value, amplitude, period, noise = SIGNAL_PROFILES.get(sensor_type, DEFAULT_SIGNAL_PROFILE)
+    wave = base_value + amplitude * np.sin(i / period)
+    return wave + rng.uniform(-noise, noise, (num_sensors, num_points))
+
+def generate_sample_data(sensor_type, start_time, end_time, interval_seconds=300, seed=None):
     """
     Generates sample time series data for a specific sensor type.
     Used for demonstration purposes only.
@@ -32,56 +68,51 @@ def generate_sample_data(sensor_type, start_time, end_time, interval_seconds=300
     - start_time: Start time for the data
     - end_time: End time for the data
     - interval_seconds: Time interval between data points in seconds
+    - seed: Seed or np.random.Generator for reproducible data (default: fresh randomness)
     
     Returns:
     - DataFrame with timestamp and simulated sensor values
     """
-    # Calculate number of data points
-    total_seconds = (end_time - start_time).total_seconds()
-    num_points = int(total_seconds / interval_seconds) + 1
-    
-    # Generate timestamps
-    timestamps = [start_time + timedelta(seconds=i * interval_seconds) for i in range(num_points)]
-    
-    # Generate values based on sensor type
-    if sensor_type == 'pressure':
-        # Pressure in mmHg, normal range around 80-120
-        base_value = 100
-        amplitude = 20
-        values = [base_value + amplitude * np.sin(i/50) + random.uniform(-5, 5) for i in range(num_points)]
-    
-    elif sensor_type == 'temperature':
-        # Body temperature in Celsius, normal range around 36-38
-        base_value = 37
-        amplitude = 0.5
-        values = [base_value + amplitude * np.sin(i/100) + random.uniform(-0.2, 0.2) for i in range(num_points)]
-    
-    elif sensor_type == 'humidity':
-        # Humidity percentage, normal range around 40-60%
-        base_value = 50
-        amplitude = 10
-        values = [base_value + amplitude * np.sin(i/80) + random.uniform(-3, 3) for i in range(num_points)]
-    
-    elif sensor_type == 'movement':
-        # Movement intensity on a scale of 0-10
-        # Simulate periods of movement and rest
-        values = []
-        for i in range(num_points):
-            if i % 100 < 20:  # Simulate movement every ~8 hours (with 5-minute intervals)
-                values.append(random.uniform(3, 8))
-            else:
-                values.append(random.uniform(0, 1))
-    
-    else:
-        # Generic values between 0-100
-        base_value = 50
-        amplitude = 25
-        values = [base_value + amplitude * np.sin(i/60) + random.uniform(-10, 10) for i in range(num_points)]
-    
-    # Create DataFrame
-    data = {
-        'timestamp': timestamps,
-        'value': values
-    }
-    
-    return pd.DataFrame(data)
+    timestamps = _sample_timestamps(start_time, end_time, interval_seconds)
+    values = sample_values(sensor_type, 1, len(timestamps), np.random.default_rng(seed))[0]
+    return pd.DataFrame({'timestamp': timestamps, 'value': values})
+
+def generate_fleet_data(sensors, start_time, end_time, interval_seconds=300, seed=None, layout='long'):
+    """
+    Generates sample time series for many sensors in one call (load tests, demos)
+
+    Sensors of the same type are generated together as one (sensors x points) array.
+
+    Parameters:
+    - sensors: Mapping sensor_id -> sensor type (or a list of (sensor_id, sensor type))
+    - start_time: Start time for the data
+    - end_time: End time for the data
+    - interval_seconds: Time interval between data points in seconds
+    - seed: Seed or np.random.Generator for reproducible data
+    - layout: 'long' (timestamp, sensor_id, value rows, sensor-major) or 'wide' (timestamp index, one column per sensor)
+
+    Returns:
+    - DataFrame in the requested layout
+    """
+    if layout not in ('long', 'wide'):
+        raise ValueError(f"Unknown layout: {layout} (expected 'long' or 'wide')")
+    sensors = list(sensors.items()) if isinstance(sensors, dict) else list(sensors)
+    rng = np.random.default_rng(seed)
+    timestamps = _sample_timestamps(start_time, end_time, interval_seconds)
+    num_points = len(timestamps)
+
+    values = np.empty((len(sensors), num_points))
+    by_type = {}
+    for row, (_, sensor_type) in enumerate(sensors):
+        by_type.setdefault(sensor_type, []).append(row)
+    for sensor_type, rows in by_type.items():
+        values[rows] = sample_values(sensor_type, len(rows), num_points, rng)
+
+    sensor_ids = [sensor_id for sensor_id, _ in sensors]
+    if layout == 'wide':
+        return pd.DataFrame(values.T, index=pd.Index(timestamps, name='timestamp'), columns=sensor_ids)
+    return pd.DataFrame({
+        'timestamp': np.tile(timestamps.to_numpy(), len(sensors)),
+        'sensor_id': pd.Categorical.from_codes(np.repeat(np.arange(len(sensors)), num_points), sensor_ids),
+        'value': values.ravel()
+    })
@@ -0,0 +1,397 @@
+"""
+Ingestion MQTT multi-processus pour les déploiements à grande échelle
+N processus workers consomment chacun une partie du trafic (partition des topics ou
+abonnement partagé MQTT v5) et écrivent les valeurs décodées dans une table de
+dernières valeurs en mémoire partagée, lue sans copie par le processus Streamlit
+"""
+
+import logging
+import multiprocessing
+import threading
+import time
+from datetime import datetime
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from utils.topic_router import TopicRouter
+from utils.payload_decoders import create_default_registry, DecodeError, FORMAT_TOPICS
+from utils.snapshot import SnapshotStore
+from utils.timeseries import parse_epoch
+
+logger = logging.getLogger(__name__)
+
+SHARD_BY_TOPIC = "topics"
+SHARD_SHARED_SUBSCRIPTION = "shared"
+
+# Une ligne par capteur : compteur de séquence (seqlock), timestamp, valeur, nombre d'écritures
+SLOT_DTYPE = np.dtype([
+    ('seq', '<u8'),
+    ('ts_ns', '<i8'),
+    ('value', '<f8'),
+    ('count', '<u8')
+])
+
+# Nombre de verrous par bande protégeant l'écriture d'une ligne dès qu'il y a plusieurs workers :
+# en mode partition aussi, car les topics de format (lots, trames binaires) portent tous les types
+# de capteurs et un même capteur peut donc arriver sur deux workers
+LOCK_STRIPES = 64
+
+
+class SharedLatestTable:
+    """
+    Table des dernières valeurs par capteur en mémoire partagée
+    Chaque ligne est protégée par un seqlock : l'écrivain rend le compteur impair pendant
+    l'écriture, un lecteur recommence s'il observe un compteur impair ou modifié
+    """
+    def __init__(self, sensor_ids, name=None, create=True):
+        """
+        Crée ou ouvre la table
+
+        Parameters:
+        - sensor_ids: Liste ordonnée des IDs de capteurs ; l'index dans la liste est le slot
+        - name: Nom du segment de mémoire partagée (requis pour l'ouvrir depuis un worker)
+        - create: True pour créer le segment, False pour s'y attacher
+        """
+        self.sensor_ids = list(sensor_ids)
+        self.slots = {sensor_id: i for i, sensor_id in enumerate(self.sensor_ids)}
+        size = max(1, len(self.sensor_ids)) * SLOT_DTYPE.itemsize
+        # Seul le propriétaire libère le segment ; les workers partagent son resource_tracker
+        self.owner = create
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+        self.table = np.ndarray((len(self.sensor_ids),), dtype=SLOT_DTYPE, buffer=self.shm.buf)
+        if create:
+            self.table[:] = 0
+        # Vues par colonne, sans copie
+        self._seq = self.table['seq']
+        self._ts = self.table['ts_ns']
+        self._value = self.table['value']
+        self._count = self.table['count']
+        # Dernière lecture cohérente de chaque ligne (côté lecteur), servie si l'écrivain la monopolise
+        self._last_read = {}
+        self.contended_reads = 0
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def write(self, slot, ts_ns, value):
+        """Écrit une valeur dans une ligne (un seul écrivain à la fois : verrou de bande si plusieurs processus)"""
+        self._seq[slot] += 1
+        self._ts[slot] = ts_ns
+        self._value[slot] = value
+        self._count[slot] += 1
+        self._seq[slot] += 1
+
+    def read(self, slot, retries=100):
+        """
+        Lit une ligne de façon cohérente
+        Si aucune lecture cohérente n'aboutit en retries essais (écritures continues sur la ligne),
+        la dernière lecture cohérente de cette ligne est renvoyée et contended_reads est incrémenté
+
+        Returns:
+        - Tuple (ts_ns, value, count), ou None si la ligne n'a jamais été écrite (ni lue)
+        """
+        for _ in range(retries):
+            before = int(self._seq[slot])
+            if before & 1:
+                continue
+            ts_ns = int(self._ts[slot])
+            value = float(self._value[slot])
+            count = int(self._count[slot])
+            if int(self._seq[slot]) == before:
+                if count == 0:
+                    return None
+                row = self._last_read[slot] = (ts_ns, value, count)
+                return row
+        self.contended_reads += 1
+        return self._last_read.get(slot)
+
+    def view(self):
+        """Vue NumPy structurée sur toute la table, sans copie (lecture non synchronisée)"""
+        return self.table
+
+    def total_writes(self):
+        """Nombre total d'écritures, utilisable comme numéro de version de la table"""
+        return int(self._count.sum())
+
+    def close(self):
+        """Détache la table ; le propriétaire libère aussi le segment"""
+        self.table = self._seq = self._ts = self._value = self._count = None
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class ShardWriter:
+    """
+    Chemin de décodage d'un worker : payload -> lectures -> route -> écriture dans la table partagée
+    """
+    def __init__(self, table, router, locks=None, decoders=None):
+        """
+        Parameters:
+        - table: SharedLatestTable attachée
+        - router: TopicRouter
+        - locks: Verrous par bande dès que plusieurs workers écrivent dans la table, None pour un worker unique
+        - decoders: DecoderRegistry (par défaut celui de payload_decoders, reconstruit dans chaque processus)
+        """
+        self.table = table
+        self.router = router
+        self.locks = locks
+        self.decoders = decoders or create_default_registry()
+        self.processed = 0
+        self.rejected = 0
+
+    def handle(self, topic, payload_bytes, recv_ts):
+        """Décode un message et met à jour la ligne de chaque capteur qu'il contient"""
+        decoder = self.decoders.for_topic(topic)
+        try:
+            readings = decoder.decode(topic, payload_bytes)
+        except (DecodeError, AttributeError, TypeError, ValueError):
+            self.rejected += 1
+            return
+        for reading in readings:
+            route = self.router.resolve(reading.topic, reading.uid)
+            slot = self.table.slots.get(route.sensor_id) if route is not None else None
+            value = reading.value
+            if slot is None or not isinstance(value, (int, float)):
+                self.rejected += 1
+                continue
+            # Même règle que MQTTIntegration._decode_message : timestamp inutilisable, lecture écartée
+            epoch = recv_ts if reading.timestamp is None else parse_epoch(reading.timestamp)
+            if epoch is None:
+                self.rejected += 1
+                continue
+            ts_ns = int(epoch * 1_000_000_000)
+            if self.locks is None:
+                self.table.write(slot, ts_ns, value)
+            else:
+                with self.locks[slot % len(self.locks)]:
+                    self.table.write(slot, ts_ns, value)
+            self.processed += 1
+
+
+def shard_topics(topics, worker_count):
+    """
+    Répartit les topics entre les workers (tourniquet)
+
+    Returns:
+    - Liste de worker_count listes de topics
+    """
+    shards = [[] for _ in range(worker_count)]
+    for i, topic in enumerate(sorted(topics)):
+        shards[i % worker_count].append(topic)
+    return shards
+
+
+def _worker_main(worker_index, table_name, sensor_ids, router_config, topics, shard_mode, broker, locks,
+                 stop_event, counters, share_group):
+    """
+    Point d'entrée d'un processus worker : connexion au broker et écriture dans la table
+    """
+    import paho.mqtt.client as mqtt
+
+    logging.basicConfig(level=logging.INFO)
+    table = SharedLatestTable(sensor_ids, name=table_name, create=False)
+    writer = ShardWriter(table, TopicRouter(**router_config), locks)
+
+    if shard_mode == SHARD_SHARED_SUBSCRIPTION:
+        subscriptions = [f"$share/{share_group}/{topic}" for topic in topics]
+        client = mqtt.Client(client_id=f"medimat_shard_{worker_index}_{int(time.time())}",
+                             protocol=mqtt.MQTTv5)
+    else:
+        subscriptions = list(topics)
+        client = mqtt.Client(client_id=f"medimat_shard_{worker_index}_{int(time.time())}")
+
+    if broker.get('username') and broker.get('password'):
+        client.username_pw_set(broker['username'], broker['password'])
+
+    def on_connect(client, userdata, flags, rc, properties=None):
+        for topic in subscriptions:
+            client.subscribe(topic)
+
+    def on_message(client, userdata, msg):
+        writer.handle(msg.topic, msg.payload, time.time())
+        counters[worker_index] = writer.processed
+
+    client.on_connect = on_connect
+    client.on_message = on_message
+    try:
+        # Connexion asynchrone : la boucle paho se reconnecte seule si le broker est absent
+        client.reconnect_delay_set(min_delay=1, max_delay=60)
+        client.connect_async(broker.get('host', 'localhost'), broker.get('port', 1883), 60)
+        client.loop_start()
+        while not stop_event.is_set():
+            stop_event.wait(0.5)
+    except Exception as e:
+        logger.error(f"Worker {worker_index}: erreur d'ingestion: {e}")
+    finally:
+        client.loop_stop()
+        client.disconnect()
+        table.close()
+
+
+class ShardedIngestion:
+    """
+    Pilote des workers d'ingestion et lecteur de la table partagée
+    Expose la même interface de lecture que MQTTIntegration (connected, get_latest_data,
+    get_history_frame, disconnect) pour être utilisé par le service d'ingestion
+    Les workers n'écrivent que la table des dernières valeurs : ce mode n'alimente ni les tampons
+    d'historique ni l'historique persistant (HistoryStore)
+    """
+    def __init__(self, host="localhost", port=1883, username=None, password=None, topics=None,
+                 workers=4, shard_mode=SHARD_BY_TOPIC, share_group="medimat", router=None):
+        """
+        Parameters:
+        - host, port, username, password: Paramètres du broker
+        - topics: Topics à consommer (par défaut ceux du routeur et des formats dédiés)
+        - workers: Nombre de processus workers
+        - shard_mode: SHARD_BY_TOPIC (partition des topics) ou SHARD_SHARED_SUBSCRIPTION ($share MQTT v5)
+        - share_group: Nom du groupe d'abonnement partagé
+        - router: TopicRouter définissant l'ensemble des capteurs connus
+        """
+        self.host = host
+        self.port = port
+        self.router = router or TopicRouter()
+        self.topics = list(topics or [*self.router.topic_type_map, *FORMAT_TOPICS])
+        self.shard_mode = shard_mode
+        self.share_group = share_group
+        self.broker = {'host': host, 'port': port, 'username': username, 'password': password}
+        if shard_mode == SHARD_BY_TOPIC:
+            # Pas plus de workers que de topics en mode partition
+            workers = min(workers, len(self.topics))
+        self.worker_count = max(1, workers)
+
+        # Slots : tous les capteurs routables, dans un ordre stable
+        routes = list(self.router.routes.values()) + list(self.router.default_routes.values())
+        self.routes_by_sensor = {route.sensor_id: route for route in routes}
+        self.table = SharedLatestTable(sorted(self.routes_by_sensor))
+
+        self._ctx = multiprocessing.get_context("spawn")
+        self._stop_event = self._ctx.Event()
+        self._counters = self._ctx.Array('q', self.worker_count, lock=False)
+        self._locks = [self._ctx.Lock() for _ in range(LOCK_STRIPES)] if self.worker_count > 1 else None
+        self.processes = []
+        self.connected = False
+
+        # Instantané reconstruit uniquement quand le nombre total d'écritures de la table change
+        self.snapshots = SnapshotStore()
+        self._snapshot_writes = 0
+        self._snapshot_lock = threading.Lock()
+
+    def connect(self):
+        """Démarre les processus workers"""
+        if self.shard_mode == SHARD_BY_TOPIC:
+            shards = shard_topics(self.topics, self.worker_count)
+        else:
+            shards = [self.topics] * self.worker_count
+        self._stop_event.clear()
+        for index, topics in enumerate(shards):
+            process = self._ctx.Process(
+                target=_worker_main,
+                args=(index, self.table.name, self.table.sensor_ids, self.router.config(), topics, self.shard_mode,
+                      self.broker, self._locks, self._stop_event, self._counters, self.share_group),
+                name=f"medimat-shard-{index}",
+                daemon=True
+            )
+            process.start()
+            self.processes.append(process)
+        self.connected = True
+        logger.info(f"{len(self.processes)} workers d'ingestion démarrés ({self.shard_mode})")
+        return True
+
+    def disconnect(self):
+        """Arrête les workers et libère la mémoire partagée"""
+        self._stop_event.set()
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
+        self.connected = False
+        self.table.close()
+        logger.info("Workers d'ingestion arrêtés")
+
+    def get_snapshot(self):
+        """
+        Retourne l'instantané des dernières valeurs de la table partagée
+        La table n'est relue que si des workers ont écrit depuis le dernier instantané
+
+        Returns:
+        - Snapshot au format de MQTTIntegration.get_snapshot
+        """
+        writes = self.table.total_writes()
+        if writes == self._snapshot_writes:
+            return self.snapshots.snapshot()
+        with self._snapshot_lock:
+            if writes != self._snapshot_writes:
+                data = {}
+                for sid in self.table.sensor_ids:
+                    current = self._current(sid)
+                    if current:
+                        data[sid] = current
+                self.snapshots.replace(data)
+                self._snapshot_writes = writes
+        return self.snapshots.snapshot()
+
+    def get_latest_data(self, sensor_id=None, history=False):
+        """
+        Retourne les dernières valeurs lues dans la table partagée
+
+        Returns:
+        - Dictionnaire au format de MQTTIntegration.get_latest_data
+        """
+        if history:
+            # La table ne conserve que la dernière valeur
+            return {} if sensor_id is None else []
+        if sensor_id is None:
+            return dict(self.get_snapshot().data)
+        return self._current(sensor_id)
+
+    def _current(self, sensor_id):
+        """Construit le dictionnaire courant d'un capteur à partir de sa ligne"""
+        slot = self.table.slots.get(sensor_id)
+        if slot is None:
+            return {}
+        row = self.table.read(slot)
+        if row is None:
+            return {}
+        ts_ns, value, _ = row
+        route = self.routes_by_sensor[sensor_id]
+        return {
+            'id': sensor_id,
+            'name': route.name,
+            'type': route.mapped_type,
+            'value': value,
+            'unit': route.unit,
+            'timestamp': datetime.fromtimestamp(ts_ns / 1e9).strftime("%Y-%m-%d %H:%M:%S"),
+            'topic': route.topic,
+            'mattress_id': route.mattress_id,
+            'status': "active"
+        }
+
+    def get_history_frame(self, sensor_id, n=None, start_ns=None):
+        """L'historique n'est pas conservé en mode multi-processus : DataFrame vide"""
+        return pd.DataFrame({'timestamp': pd.Series(dtype='datetime64[ns]'),
+                             'value': pd.Series(dtype='float64')})
+
+    def get_ingest_stats(self):
+        """
+        Retourne les compteurs par worker
+
+        Returns:
+        - Dictionnaire: workers, processed_per_worker, processed, version,
+          contended_reads (lectures servies depuis la dernière valeur cohérente)
+        """
+        per_worker = list(self._counters)
+        return {
+            'workers': len(self.processes),
+            'processed_per_worker': per_worker,
+            'processed': sum(per_worker),
+            'version': self.table.total_writes(),
+            'contended_reads': self.table.contended_reads
+        }
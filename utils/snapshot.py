@@ -0,0 +1,209 @@
+"""
+Instantanés versionnés (copie sur écriture) des dernières valeurs des capteurs
+L'écrivain (worker d'ingestion ou simulateur) publie un nouvel instantané immuable par lot ;
+les lecteurs (scripts Streamlit) récupèrent la référence courante en O(1), sans verrou,
+et comparent les numéros de version pour ne rien recalculer quand rien n'a changé
+
+Un instantané ne recopie pas toute la flotte : ses données sont une base partagée
+(immuable) et un petit dictionnaire des enregistrements modifiés depuis cette base.
+Une publication ne copie que ce delta ; il est fusionné dans une nouvelle base quand
+il dépasse COMPACT_MIN_DELTA ou COMPACT_FACTOR × √(taille de la base), ce qui garde
+un coût amorti en O(lot × √flotte) au lieu de O(flotte) par lot.
+"""
+
+import itertools
+import math
+import threading
+import time
+from collections.abc import Mapping
+
+import pandas as pd
+
+# Colonnes de la vue en colonnes des dernières valeurs (Snapshot.frame)
+FRAME_COLUMNS = ['value', 'unit', 'timestamp', 'mattress_id']
+
+# Compteur partagé par tous les magasins : les versions restent croissantes
+# même lorsque le service d'ingestion change de source
+_versions = itertools.count(1)
+
+# Seuil de fusion du delta dans la base : max(COMPACT_MIN_DELTA, COMPACT_FACTOR * sqrt(len(base)))
+COMPACT_MIN_DELTA = 256
+COMPACT_FACTOR = 4
+
+
+class FleetData(Mapping):
+    """
+    Mapping en lecture seule ID du capteur -> enregistrement : base partagée + delta
+
+    Les deux dictionnaires ne sont jamais modifiés après construction.
+    """
+    __slots__ = ('_base', '_delta', '_length')
+
+    def __init__(self, base, delta=None, length=None):
+        self._base = base
+        self._delta = delta if delta is not None else {}
+        self._length = length if length is not None else len(base) + sum(1 for key in self._delta if key not in base)
+
+    def __getitem__(self, sensor_id):
+        try:
+            return self._delta[sensor_id]
+        except KeyError:
+            return self._base[sensor_id]
+
+    def get(self, sensor_id, default=None):
+        record = self._delta.get(sensor_id)
+        if record is None:
+            return self._base.get(sensor_id, default)
+        return record
+
+    def __contains__(self, sensor_id):
+        return sensor_id in self._delta or sensor_id in self._base
+
+    def __iter__(self):
+        yield from self._base
+        for sensor_id in self._delta:
+            if sensor_id not in self._base:
+                yield sensor_id
+
+    def __len__(self):
+        return self._length
+
+    def updated(self, updates):
+        """
+        Nouvelles données : celles-ci complétées par updates (copie du delta seulement,
+        ou fusion dans une nouvelle base quand le delta devient trop grand)
+        """
+        base = self._base
+        added = sum(1 for key in updates if key not in self._delta and key not in base)
+        delta = dict(self._delta)
+        delta.update(updates)
+        if len(delta) > max(COMPACT_MIN_DELTA, COMPACT_FACTOR * math.isqrt(len(base))):
+            merged = dict(base)
+            merged.update(delta)
+            return FleetData(merged, None, self._length + added)
+        return FleetData(base, delta, self._length + added)
+
+
+class Snapshot:
+    """
+    Vue immuable et cohérente de toute la flotte à un instant donné
+
+    - version: Numéro strictement croissant, 0 pour l'instantané vide
+    - data: Mapping en lecture seule (FleetData) ID du capteur -> enregistrement courant
+    - published_at: Epoch (secondes) de la publication
+
+    Les enregistrements ne sont jamais modifiés après publication : un écrivain
+    publie toujours de nouveaux dictionnaires. Les lecteurs ne doivent pas les modifier.
+    """
+    __slots__ = ('version', 'data', 'published_at', '_frame')
+
+    def __init__(self, version, data, published_at):
+        self.version = version
+        self.data = data
+        self.published_at = published_at
+        self._frame = None
+
+    def frame(self):
+        """
+        Vue en colonnes des dernières valeurs, construite au premier appel puis partagée
+        par tous les lecteurs de cet instantané (il est immuable)
+
+        Returns:
+        - DataFrame indexé par ID du capteur, colonnes FRAME_COLUMNS ; value est numérique
+          (NaN si absente ou invalide). Ne pas modifier.
+        """
+        frame = self._frame
+        if frame is None:
+            frame = pd.DataFrame.from_records(list(self.data.values()), index=list(self.data.keys()),
+                                              columns=FRAME_COLUMNS)
+            frame['value'] = pd.to_numeric(frame['value'], errors='coerce')
+            # Deux lecteurs simultanés peuvent la construire chacun : même résultat, la dernière est gardée
+            self._frame = frame
+        return frame
+
+    def get(self, sensor_id, default=None):
+        """Enregistrement courant d'un capteur, ou default"""
+        return self.data.get(sensor_id, default)
+
+    def __contains__(self, sensor_id):
+        return sensor_id in self.data
+
+    def __len__(self):
+        return len(self.data)
+
+    def __repr__(self):
+        return f"Snapshot(version={self.version}, sensors={len(self.data)})"
+
+
+EMPTY_SNAPSHOT = Snapshot(0, FleetData({}), 0.0)
+
+
+class SnapshotStore:
+    """
+    Référence atomique vers l'instantané courant
+
+    Les écritures sont sérialisées par un verrou côté écrivain uniquement ; la lecture
+    est une simple lecture d'attribut (atomique sous le GIL) et ne bloque jamais.
+    """
+    def __init__(self):
+        self._write_lock = threading.Lock()
+        self._snapshot = EMPTY_SNAPSHOT
+
+    def snapshot(self):
+        """Retourne l'instantané courant (O(1), sans verrou)"""
+        return self._snapshot
+
+    @property
+    def version(self):
+        """Version de l'instantané courant"""
+        return self._snapshot.version
+
+    def publish(self, updates):
+        """
+        Publie un nouvel instantané : l'instantané courant complété par les mises à jour
+
+        Parameters:
+        - updates: Dictionnaire ID du capteur -> nouvel enregistrement
+
+        Returns:
+        - L'instantané publié (l'instantané courant si updates est vide)
+
+        Coût en O(lot + delta courant), sans copie de toute la flotte (voir FleetData)
+        """
+        if not updates:
+            return self._snapshot
+        with self._write_lock:
+            snapshot = Snapshot(next(_versions), self._snapshot.data.updated(updates), time.time())
+            self._snapshot = snapshot
+        return snapshot
+
+    def discard(self, records):
+        """
+        Retire les capteurs dont l'enregistrement courant est encore exactement celui donné
+        (jamais rafraîchi depuis) ; les autres sont laissés intacts
+
+        Parameters:
+        - records: Dictionnaire ID du capteur -> enregistrement attendu
+
+        Returns:
+        - Nombre de capteurs retirés
+        """
+        with self._write_lock:
+            data = self._snapshot.data
+            stale = {sensor_id for sensor_id, record in records.items() if data.get(sensor_id) is record}
+            if stale:
+                kept = {sensor_id: record for sensor_id, record in data.items() if sensor_id not in stale}
+                self._snapshot = Snapshot(next(_versions), FleetData(kept), time.time())
+        return len(stale)
+
+    def replace(self, data):
+        """
+        Publie un instantané contenant exactement data
+
+        Returns:
+        - L'instantané publié
+        """
+        with self._write_lock:
+            snapshot = Snapshot(next(_versions), FleetData(dict(data)), time.time())
+            self._snapshot = snapshot
+        return snapshot
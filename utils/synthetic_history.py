@@ -0,0 +1,141 @@
+"""
+Deterministic synthetic history for the sensors that have no recorded data
+
+Points lie on a fixed grid: point k of a series is at epoch second
+k * interval_seconds. Its value depends only on (sensor_id, interval, k):
+the wave uses k as its position, and the noise comes from a generator seeded
+with (CRC32 of the sensor ID, interval, k // BLOCK_POINTS). So a chart shows
+the same curve on every rerun and in every session, and a series can be
+extended point by point without being regenerated.
+
+SyntheticHistoryCache keeps one ring buffer per (sensor, timeframe) sized to
+the window. A call only generates the grid points added since the previous
+call, and the oldest points fall out of the ring. The DataFrame is rebuilt
+only when new points arrived.
+"""
+
+import threading
+import time
+import zlib
+
+import numpy as np
+import streamlit as st
+
+from utils.sensor_utils import sample_values
+from utils.timeseries import TimeSeriesBuffer
+
+# Timeframe -> (window in seconds, interval between points in seconds)
+TIMEFRAMES = {
+    'hour': (3600, 60),           # 1 reading per minute
+    'day': (86400, 300),          # 5 minutes
+    'week': (7 * 86400, 3600),    # 1 hour
+    'month': (30 * 86400, 7200),  # 2 hours
+}
+DEFAULT_TIMEFRAME = 'day'
+
+# Noise is drawn per block of grid points, so any block can be generated on its own
+BLOCK_POINTS = 256
+
+
+def sensor_seed(sensor_id):
+    """Stable seed of a sensor (Python's hash() changes between processes)"""
+    return zlib.crc32(str(sensor_id).encode())
+
+
+def synthetic_values(sensor_id, sensor_type, interval_seconds, first_index, count):
+    """
+    Values of the grid points first_index .. first_index + count - 1
+
+    Parameters:
+    - sensor_id: Sensor ID (seeds the noise)
+    - sensor_type: Sensor type (selects the signal profile)
+    - interval_seconds: Grid interval
+    - first_index: Grid index of the first point (epoch seconds // interval_seconds)
+    - count: Number of points
+
+    Returns:
+    - float64 array of length count
+    """
+    if count <= 0:
+        return np.empty(0)
+    seed = sensor_seed(sensor_id)
+    first_block = first_index // BLOCK_POINTS
+    last_block = (first_index + count - 1) // BLOCK_POINTS
+    blocks = [
+        sample_values(sensor_type, 1, BLOCK_POINTS, np.random.default_rng([seed, interval_seconds, block]),
+                      start_index=block * BLOCK_POINTS)[0]
+        for block in range(first_block, last_block + 1)
+    ]
+    offset = first_index - first_block * BLOCK_POINTS
+    return np.concatenate(blocks)[offset:offset + count]
+
+
+class _Series:
+    __slots__ = ('sensor_type', 'buffer', 'last_index', 'frame')
+
+    def __init__(self, sensor_type, capacity):
+        self.sensor_type = sensor_type
+        self.buffer = TimeSeriesBuffer(capacity)
+        self.last_index = None
+        self.frame = None
+
+
+class SyntheticHistoryCache:
+    """
+    Synthetic series per (sensor, timeframe), extended incrementally
+
+    Thread-safe: the cache is shared by every session of the process.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {}
+        self.points_generated = 0
+
+    def get_frame(self, sensor_id, sensor_type, timeframe=DEFAULT_TIMEFRAME, now=None):
+        """
+        Synthetic history of a sensor over a timeframe
+
+        Parameters:
+        - sensor_id: Sensor ID
+        - sensor_type: Sensor type
+        - timeframe: 'hour', 'day', 'week' or 'month' (unknown values fall back to 'day')
+        - now: Epoch seconds of the end of the window (default: current time)
+
+        Returns:
+        - Shared DataFrame (do not modify) with 'timestamp' (datetime64[ns], local time) and 'value' columns
+        """
+        if timeframe not in TIMEFRAMES:
+            timeframe = DEFAULT_TIMEFRAME
+        span_seconds, interval_seconds = TIMEFRAMES[timeframe]
+        points = span_seconds // interval_seconds + 1
+        last_index = int((time.time() if now is None else now) // interval_seconds)
+
+        with self._lock:
+            series = self._series.get((sensor_id, timeframe))
+            if series is None or series.sensor_type != sensor_type:
+                series = _Series(sensor_type, points)
+                self._series[(sensor_id, timeframe)] = series
+            if series.last_index == last_index and series.frame is not None:
+                return series.frame
+
+            # Only the grid points added since the previous call (the whole window the first time,
+            # or after a gap longer than the window)
+            first_index = last_index - points + 1
+            if series.last_index is not None and series.last_index >= first_index:
+                first_index = series.last_index + 1
+            if first_index <= last_index:
+                indices = np.arange(first_index, last_index + 1, dtype=np.int64)
+                values = synthetic_values(sensor_id, sensor_type, interval_seconds, first_index, len(indices))
+                series.buffer.extend(indices * interval_seconds * 1_000_000_000, values)
+                self.points_generated += len(indices)
+            series.last_index = max(last_index, series.last_index or last_index)
+            series.frame = series.buffer.to_frame()
+            return series.frame
+
+
+@st.cache_resource
+def get_synthetic_history():
+    """
+    Returns the synthetic history cache of the server process
+    """
+    return SyntheticHistoryCache()
@@ -0,0 +1,282 @@
+"""
+Tampons circulaires de séries temporelles à capacité fixe, sur des tableaux NumPy
+
+Chaque tampon stocke des horodatages int64 (nanosecondes epoch) et des valeurs float64
+dans des tableaux préalloués. Chaque point est écrit deux fois (case i et case i + capacité)
+pour que la fenêtre la plus récente soit toujours une tranche contiguë : les lectures
+renvoient des vues sans copie et les ajouts ne réallouent jamais.
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CAPACITY = 3600  # Une heure de lectures à 1 Hz
+
+# Horodatages acceptés à l'ingestion : après l'epoch et représentables en nanosecondes int64 (jusqu'en 2262)
+MAX_EPOCH_S = (2 ** 63 - 1) // 1_000_000_000
+
+# Les décalages UTC des fuseaux ne changent qu'en début de quart d'heure
+OFFSET_STEP_NS = 15 * 60 * 1_000_000_000
+# Deux changements d'heure sont toujours séparés de bien plus d'un jour
+ONE_DAY_NS = 24 * 3600 * 1_000_000_000
+
+
+def to_epoch_ns(timestamp):
+    """
+    Convertit un horodatage en nanosecondes epoch (int64)
+
+    Parameters:
+    - timestamp: secondes epoch (int/float), datetime, Timestamp pandas ou chaîne
+      'YYYY-MM-DD HH:MM:SS' (heure locale, comme produite par l'intégration MQTT)
+
+    Returns:
+    - Entier en nanosecondes epoch
+    """
+    if isinstance(timestamp, (int, float, np.integer, np.floating)):
+        return int(timestamp * 1_000_000_000)
+    if isinstance(timestamp, str):
+        timestamp = datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S")
+    if isinstance(timestamp, pd.Timestamp):
+        timestamp = timestamp.to_pydatetime()
+    return int(timestamp.timestamp() * 1_000_000_000)
+
+
+def parse_epoch(timestamp):
+    """
+    Convertit l'horodatage d'une lecture reçue en secondes epoch, s'il est utilisable
+
+    Parameters:
+    - timestamp: Horodatage décodé du payload (nombre ou chaîne numérique)
+
+    Returns:
+    - float, ou None si l'horodatage n'est pas numérique, pas fini (NaN, infini) ou hors de
+      [0, MAX_EPOCH_S[ (par exemple des microsecondes au lieu de secondes)
+    """
+    try:
+        epoch = float(timestamp)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    # NaN échoue à toute comparaison
+    if not 0 <= epoch < MAX_EPOCH_S:
+        return None
+    return epoch
+
+
+def epoch_ns_to_datetime64(timestamps_ns):
+    """
+    Convertit un tableau de nanosecondes epoch en datetime64[ns] naïf en heure locale
+    Chaque horodatage reçoit le décalage UTC en vigueur à sa date (heure d'été comprise),
+    comme datetime.fromtimestamp()
+    """
+    timestamps_ns = np.asarray(timestamps_ns, dtype=np.int64)
+    return (timestamps_ns + _local_offsets_ns(timestamps_ns)).view('datetime64[ns]')
+
+
+def _local_offsets_ns(timestamps_ns):
+    """
+    Décalage UTC du fuseau local à chaque horodatage, en nanosecondes
+    Calculé une fois par quart d'heure distinct : quelques appels au fuseau, quelle que soit la taille
+    """
+    if len(timestamps_ns) == 0:
+        return np.zeros(0, dtype=np.int64)
+    # Cas courant : fenêtre de moins d'un jour sans changement d'heure, un seul décalage
+    first, last = int(timestamps_ns.min()), int(timestamps_ns.max())
+    if last - first < ONE_DAY_NS:
+        offset = _local_offset_ns(first)
+        if _local_offset_ns(last) == offset:
+            return offset
+    quarters, positions = np.unique(timestamps_ns // OFFSET_STEP_NS, return_inverse=True)
+    offsets = np.array([_local_offset_ns(int(quarter) * OFFSET_STEP_NS) for quarter in quarters], dtype=np.int64)
+    return offsets[positions]
+
+
+def _local_offset_ns(timestamp_ns):
+    """Décalage UTC du fuseau local à un instant donné, en nanosecondes"""
+    moment = datetime.fromtimestamp(timestamp_ns / 1_000_000_000, timezone.utc).astimezone()
+    return int(moment.utcoffset().total_seconds()) * 1_000_000_000
+
+
+class TimeSeriesBuffer:
+    """
+    Tampon circulaire de points (timestamp_ns, valeur) d'un capteur
+
+    Un seul écrivain (le worker d'ingestion), plusieurs lecteurs. Les vues renvoyées par
+    window() partagent le stockage interne et peuvent être écrasées par les ajouts
+    suivants ; utiliser to_frame() ou np.copy() pour une copie stable.
+    """
+    __slots__ = ('capacity', '_ts', '_values', '_count')
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        """
+        Initialise un tampon vide
+
+        Parameters:
+        - capacity: Nombre maximal de points conservés
+        """
+        if capacity < 1:
+            raise ValueError("capacity doit être >= 1")
+        self.capacity = capacity
+        self._ts = np.zeros(2 * capacity, dtype=np.int64)
+        self._values = np.zeros(2 * capacity, dtype=np.float64)
+        self._count = 0
+
+    def __len__(self):
+        return min(self._count, self.capacity)
+
+    @property
+    def total_appended(self):
+        """Nombre de points ajoutés depuis la création (y compris ceux écrasés depuis)"""
+        return self._count
+
+    def append(self, timestamp_ns, value):
+        """
+        Ajoute un point en O(1)
+
+        Parameters:
+        - timestamp_ns: Horodatage en nanosecondes epoch
+        - value: Valeur (float)
+        """
+        slot = self._count % self.capacity
+        self._ts[slot] = timestamp_ns
+        self._ts[slot + self.capacity] = timestamp_ns
+        self._values[slot] = value
+        self._values[slot + self.capacity] = value
+        self._count += 1
+
+    def extend(self, timestamps_ns, values):
+        """
+        Ajoute plusieurs points en une seule écriture
+
+        Parameters:
+        - timestamps_ns: Séquence ou tableau d'horodatages en nanosecondes epoch
+        - values: Séquence ou tableau de valeurs, de même longueur
+        """
+        timestamps_ns = np.asarray(timestamps_ns, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64)
+        n = len(timestamps_ns)
+        if n == 0:
+            return
+        if n > self.capacity:
+            # Seule la fin peut subsister : le reste est sauté sans être écrit
+            self._count += n - self.capacity
+            timestamps_ns = timestamps_ns[-self.capacity:]
+            values = values[-self.capacity:]
+            n = self.capacity
+        slots = (self._count + np.arange(n)) % self.capacity
+        self._ts[slots] = timestamps_ns
+        self._ts[slots + self.capacity] = timestamps_ns
+        self._values[slots] = values
+        self._values[slots + self.capacity] = values
+        self._count += n
+
+    def _bounds(self, n):
+        """Indices de début et de fin des n derniers points dans les tableaux doublés"""
+        size = len(self)
+        n = size if n is None else min(n, size)
+        if size == 0:
+            return 0, 0
+        last = (self._count - 1) % self.capacity + self.capacity
+        return last - n + 1, last + 1
+
+    def window(self, n=None):
+        """
+        Renvoie les n derniers points sous forme de vues en lecture seule, sans copie
+
+        Parameters:
+        - n: Nombre de points (par défaut : tout ce qui est conservé)
+
+        Returns:
+        - Tuple (timestamps_ns, values) de vues NumPy, du plus ancien au plus récent
+        """
+        start, end = self._bounds(n)
+        ts = self._ts[start:end]
+        values = self._values[start:end]
+        ts.flags.writeable = False
+        values.flags.writeable = False
+        return ts, values
+
+    def since(self, start_ns):
+        """
+        Renvoie les points d'horodatage >= start_ns sous forme de vues sans copie
+
+        Suppose que les points ont été ajoutés dans l'ordre chronologique.
+        """
+        ts, values = self.window()
+        first = int(np.searchsorted(ts, start_ns, side='left'))
+        return ts[first:], values[first:]
+
+    def latest(self):
+        """
+        Renvoie le point le plus récent
+
+        Returns:
+        - Tuple (timestamp_ns, value), ou None si le tampon est vide
+        """
+        if self._count == 0:
+            return None
+        slot = (self._count - 1) % self.capacity
+        return int(self._ts[slot]), float(self._values[slot])
+
+    def to_frame(self, n=None, start_ns=None):
+        """
+        Convertit le tampon (ou sa fin) en DataFrame
+
+        Parameters:
+        - n: Nombre de points les plus récents (par défaut : tous)
+        - start_ns: Ne garder que les points à partir de cet horodatage (nanosecondes epoch)
+
+        Returns:
+        - DataFrame avec les colonnes 'timestamp' (datetime64[ns], heure locale) et 'value'
+        """
+        if start_ns is not None:
+            ts, values = self.since(start_ns)
+        else:
+            ts, values = self.window(n)
+        # Une copie vectorisée : le DataFrame n'est pas affecté par les ajouts suivants
+        return pd.DataFrame({
+            'timestamp': epoch_ns_to_datetime64(ts),
+            'value': values.copy()
+        })
+
+
+class BufferPool:
+    """
+    Registre des TimeSeriesBuffer par capteur, avec une capacité par défaut commune
+    """
+    def __init__(self, capacity=DEFAULT_CAPACITY, capacities=None):
+        """
+        Parameters:
+        - capacity: Capacité par défaut des nouveaux tampons
+        - capacities: Dictionnaire optionnel ID du capteur -> capacité, prioritaire sur le défaut
+        """
+        self.capacity = capacity
+        self.capacities = dict(capacities or {})
+        self.buffers = {}
+
+    def get(self, sensor_id):
+        """Renvoie le tampon d'un capteur, ou None s'il n'a jamais reçu de données"""
+        return self.buffers.get(sensor_id)
+
+    def get_or_create(self, sensor_id):
+        """Renvoie le tampon d'un capteur, créé à la première utilisation"""
+        buffer = self.buffers.get(sensor_id)
+        if buffer is None:
+            buffer = TimeSeriesBuffer(self.capacities.get(sensor_id, self.capacity))
+            self.buffers[sensor_id] = buffer
+        return buffer
+
+    def append(self, sensor_id, timestamp_ns, value):
+        """Ajoute un point au tampon d'un capteur"""
+        self.get_or_create(sensor_id).append(timestamp_ns, value)
+
+    def extend(self, sensor_id, timestamps_ns, values):
+        """Ajoute plusieurs points au tampon d'un capteur en une écriture vectorisée"""
+        self.get_or_create(sensor_id).extend(timestamps_ns, values)
+
+    def __contains__(self, sensor_id):
+        return sensor_id in self.buffers
+
+    def __len__(self):
+        return len(self.buffers)
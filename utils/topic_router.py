@@ -0,0 +1,190 @@
+"""
+Table de routage précompilée pour les messages MQTT des capteurs
+Ce module construit une seule fois la correspondance (topic, uid) -> descripteur de capteur
+afin que le callback MQTT n'ait plus qu'une recherche dans un dictionnaire à effectuer
+"""
+
+import logging
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+# Descripteur immuable d'un capteur, partagé par tous les messages qui lui sont routés
+SensorRoute = namedtuple(
+    "SensorRoute",
+    ["sensor_id", "sensor_type", "mapped_type", "unit", "name", "mattress_id", "topic"]
+)
+
+# Map des topics vers les types de capteurs
+DEFAULT_TOPIC_TYPE_MAP = {
+    "capteur/temperature": "temperature",
+    "capteur/humidite": "humidity",
+    "capteur/debit_urinaire": "debit",
+    "capteur/poul": "poul",
+    "capteur/creatine": "creatine"
+}
+
+# Map des types de capteurs pour la compatibilité
+DEFAULT_SENSOR_TYPE_MAP = {
+    "temperature": "temperature",
+    "humidity": "humidity",
+    "debit": "flow",
+    "poul": "pulse",
+    "creatine": "creatinine"
+}
+
+# Unités selon le type de capteur
+DEFAULT_UNITS = {
+    "temperature": "°C",
+    "humidity": "%",
+    "debit": "L/h",
+    "poul": "bpm",
+    "creatine": "mg/dL"
+}
+
+# UID des ESP32 vers l'ID du matelas
+DEFAULT_MATTRESS_MAP = {
+    "1234567890abcdef": "MAT-101",
+    "abcdef1234567890": "MAT-102",
+    "0abcdef123456789": "MAT-103",
+    "def0123456789abc": "MAT-104",
+    "789abcdef012345": "MAT-105"
+}
+
+# Numéro de capteur de base pour le matelas MAT-101, décalé de 10 par matelas
+DEFAULT_BASE_IDS = {
+    "temperature": 202,
+    "humidity": 203,
+    "debit": 204,
+    "poul": 205,
+    "creatine": 206
+}
+
+DEFAULT_MATTRESS_ID = "MAT-101"
+
+
+class TopicRouter:
+    """
+    Routeur (topic, uid) -> SensorRoute construit à l'initialisation
+    Toutes les combinaisons connues sont précalculées ; un UID inconnu est routé
+    vers le matelas par défaut, comme le faisait l'ancien callback
+    """
+    def __init__(self,
+                 topic_type_map=None,
+                 sensor_type_map=None,
+                 units=None,
+                 mattress_map=None,
+                 base_ids=None,
+                 default_mattress_id=DEFAULT_MATTRESS_ID):
+        """
+        Initialise et compile la table de routage
+
+        Parameters:
+        - topic_type_map: Topic MQTT -> type de capteur brut
+        - sensor_type_map: Type brut -> type utilisé par l'interface
+        - units: Type brut -> unité
+        - mattress_map: UID de l'ESP32 -> ID du matelas
+        - base_ids: Type brut -> numéro de capteur pour MAT-101
+        - default_mattress_id: Matelas utilisé pour un UID inconnu
+        """
+        self.topic_type_map = dict(topic_type_map or DEFAULT_TOPIC_TYPE_MAP)
+        self.sensor_type_map = dict(sensor_type_map or DEFAULT_SENSOR_TYPE_MAP)
+        self.units = dict(units or DEFAULT_UNITS)
+        self.mattress_map = dict(mattress_map or DEFAULT_MATTRESS_MAP)
+        self.base_ids = dict(base_ids or DEFAULT_BASE_IDS)
+        self.default_mattress_id = default_mattress_id
+        self.routes = {}
+        self.default_routes = {}
+        self.compile()
+
+    def _build_route(self, topic, sensor_type, mattress_id):
+        """Construit le descripteur d'un capteur, ou None si l'ID ne peut pas être calculé"""
+        try:
+            mat_num = int(mattress_id.split('-')[1])
+            sensor_num = self.base_ids[sensor_type] + (mat_num - 101) * 10
+        except (ValueError, KeyError, IndexError):
+            logger.error(f"Error getting sensor ID for mattress {mattress_id}, sensor {sensor_type}")
+            return None
+
+        return SensorRoute(
+            sensor_id=f"SEN-{sensor_num}",
+            sensor_type=sensor_type,
+            mapped_type=self.sensor_type_map.get(sensor_type, sensor_type),
+            unit=self.units.get(sensor_type, ""),
+            name=f"Capteur {sensor_type.capitalize()}",
+            mattress_id=mattress_id,
+            topic=topic
+        )
+
+    def compile(self):
+        """
+        (Re)construit la table de routage complète
+        À appeler uniquement lorsque la configuration change
+        """
+        routes = {}
+        default_routes = {}
+        for topic, sensor_type in self.topic_type_map.items():
+            for uid, mattress_id in self.mattress_map.items():
+                route = self._build_route(topic, sensor_type, mattress_id)
+                if route is not None:
+                    routes[(topic, uid)] = route
+            default_route = self._build_route(topic, sensor_type, self.default_mattress_id)
+            if default_route is not None:
+                default_routes[topic] = default_route
+
+        # Remplacement atomique des tables : un lecteur voit l'ancienne ou la nouvelle
+        self.routes = routes
+        self.default_routes = default_routes
+        logger.info(f"Table de routage compilée: {len(routes)} routes pour {len(default_routes)} topics")
+
+    def reconfigure(self, topic_type_map=None, sensor_type_map=None, units=None,
+                    mattress_map=None, base_ids=None, default_mattress_id=None):
+        """
+        Met à jour la configuration puis recompile la table
+        Les paramètres laissés à None conservent leur valeur actuelle
+        """
+        if topic_type_map is not None:
+            self.topic_type_map = dict(topic_type_map)
+        if sensor_type_map is not None:
+            self.sensor_type_map = dict(sensor_type_map)
+        if units is not None:
+            self.units = dict(units)
+        if mattress_map is not None:
+            self.mattress_map = dict(mattress_map)
+        if base_ids is not None:
+            self.base_ids = dict(base_ids)
+        if default_mattress_id is not None:
+            self.default_mattress_id = default_mattress_id
+        self.compile()
+
+    def config(self):
+        """
+        Retourne la configuration du routeur, sérialisable (pour reconstruire le routeur dans un autre processus)
+
+        Returns:
+        - Dictionnaire utilisable comme TopicRouter(**config)
+        """
+        return {
+            'topic_type_map': dict(self.topic_type_map),
+            'sensor_type_map': dict(self.sensor_type_map),
+            'units': dict(self.units),
+            'mattress_map': dict(self.mattress_map),
+            'base_ids': dict(self.base_ids),
+            'default_mattress_id': self.default_mattress_id
+        }
+
+    def resolve(self, topic, uid):
+        """
+        Retourne le SensorRoute pour un couple (topic, uid)
+
+        Returns:
+        - SensorRoute, ou None si le topic n'est pas reconnu
+        """
+        route = self.routes.get((topic, uid))
+        if route is None:
+            route = self.default_routes.get(topic)
+        return route
+
+    def knows_topic(self, topic):
+        """Indique si le topic fait partie de la configuration"""
+        return topic in self.default_routes
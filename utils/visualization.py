@@ -1,19 +1,158 @@
+import copy
+import threading
+
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
+from utils.downsampling import downsample_frame
+from utils.translation import FALLBACK_LANGUAGE, bind
+
+# Figure templates
+#
+# Building a figure through plotly's constructors validates every property, which
+# costs far more than the data of a live chart. Each chart kind is therefore built
+# and validated once per (kind, sensor type, language) and kept as a plain figure
+# dictionary. A call only swaps the data arrays (and the per-call texts) into
+# shallow copies of the template's dictionaries and wraps them without validation
+# (go.Figure(..., _validate=False)); plotly still copies them, so the returned
+# figure can be modified freely.
+_templates = {}
+_templates_lock = threading.Lock()
+
+# Sensor type -> (translation key of the y-axis label, line color)
+SERIES_STYLES = {
+    'pressure': ('chart_axis_pressure', '#1f77b4'),       # Blue
+    'temperature': ('chart_axis_temperature', '#ff7f0e'), # Orange
+    'humidity': ('chart_axis_humidity', '#2ca02c'),       # Green
+    'movement': ('chart_axis_movement', '#d62728'),       # Red
+}
+DEFAULT_SERIES_STYLE = ('chart_axis_value', '#1f77b4')    # Blue
+
+# Define colors for each status
+STATUS_COLORS = {
+    'active': '#28a745',      # Green
+    'inactive': '#6c757d',    # Gray
+    'error': '#dc3545',       # Red
+    'maintenance': '#ffc107', # Yellow/Orange
+    'calibrating': '#17a2b8'  # Cyan
+}
+
+def _build_gauge(sensor_type, language):
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=0,
+        domain={'x': [0, 1], 'y': [0, 1]}
+    ))
+
+    fig.update_layout(
+        height=250,
+        margin=dict(l=10, r=10, t=50, b=10),
+        font=dict(size=12)
+    )
+    return fig
+
+def _build_status_distribution(sensor_type, language):
+    tr = bind(language)
+    fig = go.Figure(data=[
+        go.Bar(
+            x=[],
+            y=[],
+            textposition='auto'
+        )
+    ])
+
+    fig.update_layout(
+        title=tr('chart_status_distribution'),
+        xaxis_title=tr('status'),
+        yaxis_title=tr('chart_count'),
+        height=350,
+        margin=dict(l=20, r=20, t=40, b=20)
+    )
+    return fig
+
+def _build_time_series(sensor_type, language):
+    tr = bind(language)
+    y_label_key, color = SERIES_STYLES.get(sensor_type, DEFAULT_SERIES_STYLE)
+
+    fig = px.line(
+        pd.DataFrame({'timestamp': pd.Series([], dtype='datetime64[ns]'), 'value': pd.Series([], dtype=float)}),
+        x='timestamp',
+        y='value',
+        labels={'timestamp': tr('time'), 'value': tr(y_label_key)}
+    )
+
+    # Update the line style
+    fig.update_traces(line=dict(color=color, width=2))
+
+    # Add range slider
+    fig.update_layout(
+        xaxis=dict(
+            rangeslider=dict(visible=True),
+            type='date'
+        ),
+        height=400,
+        margin=dict(l=20, r=20, t=40, b=20)
+    )
+    return fig
+
+TEMPLATE_BUILDERS = {
+    'gauge': _build_gauge,
+    'status_distribution': _build_status_distribution,
+    'time_series': _build_time_series,
+}
+
+def get_figure_template(kind, sensor_type=None, language=None):
+    """
+    Validated figure of a chart kind, as a plain dictionary built once per key
+
+    Parameters:
+    - kind: 'gauge', 'status_distribution' or 'time_series'
+    - sensor_type: Sensor type (time series only: axis label and line color)
+    - language: Language of the chart labels (default: the fallback language)
+
+    Returns:
+    - Shared dictionary {'data': [...], 'layout': {...}} (do not modify)
+    """
+    language = language or FALLBACK_LANGUAGE
+    if kind != 'time_series':
+        sensor_type = None
+    key = (kind, sensor_type, language)
+    template = _templates.get(key)
+    if template is None:
+        # Built outside the lock: two sessions may build the same template once, the first one is kept
+        template = copy.deepcopy(TEMPLATE_BUILDERS[kind](sensor_type, language).to_plotly_json())
+        with _templates_lock:
+            template = _templates.setdefault(key, template)
+    return template
 
-def create_gauge_chart(value, title, suffix="", min_value=0, max_value=100):
+def _from_template(template, traces, layout):
+    """
+    Figure of a template with properties replaced, without validation
+
+    Parameters:
+    - template: Dictionary of get_figure_template
+    - traces: One dictionary of replaced properties per trace of the template
+    - layout: Dictionary of replaced layout properties
+
+    Returns:
+    - Plotly figure object
+    """
+    data = [{**trace, **changes} for trace, changes in zip(template['data'], traces)]
+    return go.Figure({'data': data, 'layout': {**template['layout'], **layout}}, _validate=False)
+
+def create_gauge_chart(value, title, suffix="", min_value=0, max_value=100, language=None):
     """
     Creates a gauge chart for sensor readings
-    
+
     Parameters:
     - value: The value to display on the gauge
     - title: Title of the gauge
     - suffix: Units to display after the value (e.g., "%", "°C")
     - min_value: Minimum value on the gauge
     - max_value: Maximum value on the gauge
-    
+    - language: Language of the chart labels (selects the template)
+
     Returns:
     - Plotly figure object
     """
@@ -24,7 +163,7 @@ def create_gauge_chart(value, title, suffix="", min_value=0, max_value=100):
     else:
         threshold_low = min_value + (max_value - min_value) * 0.25
         threshold_high = min_value + (max_value - min_value) * 0.75
-    
+
     # Set the color based on value
     if value < threshold_low:
         color = "red"
@@ -32,14 +171,12 @@ def create_gauge_chart(value, title, suffix="", min_value=0, max_value=100):
         color = "green"
     else:
         color = "orange"
-    
-    # Create the gauge chart
-    fig = go.Figure(go.Indicator(
-        mode="gauge+number",
-        value=value,
-        domain={'x': [0, 1], 'y': [0, 1]},
-        title={'text': title},
-        gauge={
+
+    # Swap the reading into the gauge template
+    return _from_template(get_figure_template('gauge', language=language), [{
+        'value': value,
+        'title': {'text': title},
+        'gauge': {
             'axis': {'range': [min_value, max_value]},
             'bar': {'color': color},
             'steps': [
@@ -53,111 +190,58 @@ def create_gauge_chart(value, title, suffix="", min_value=0, max_value=100):
                 'value': value
             }
         },
-        number={'suffix': suffix}
-    ))
-    
-    fig.update_layout(
-        height=250,
-        margin=dict(l=10, r=10, t=50, b=10),
-        font=dict(size=12)
-    )
-    
-    return fig
+        'number': {'suffix': suffix}
+    }], {})
 
-def create_status_distribution_chart(status_counts):
+def create_status_distribution_chart(status_counts, language=None):
     """
     Creates a bar chart showing the distribution of sensor statuses
-    
+
     Parameters:
     - status_counts: DataFrame with columns 'status' and 'count'
-    
+    - language: Language of the chart labels (selects the template)
+
     Returns:
     - Plotly figure object
     """
-    # Define colors for each status
-    status_colors = {
-        'active': '#28a745',      # Green
-        'inactive': '#6c757d',    # Gray
-        'error': '#dc3545',       # Red
-        'maintenance': '#ffc107', # Yellow/Orange
-        'calibrating': '#17a2b8'  # Cyan
-    }
-    
     # Map colors to statuses in the DataFrame
-    colors = [status_colors.get(status, '#6c757d') for status in status_counts['status']]
-    
-    # Create the bar chart
-    fig = go.Figure(data=[
-        go.Bar(
-            x=status_counts['status'],
-            y=status_counts['count'],
-            marker_color=colors,
-            text=status_counts['count'],
-            textposition='auto'
-        )
-    ])
-    
-    fig.update_layout(
-        title='Sensor Status Distribution',
-        xaxis_title='Status',
-        yaxis_title='Count',
-        height=350,
-        margin=dict(l=20, r=20, t=40, b=20)
-    )
-    
-    return fig
+    statuses = status_counts['status'].to_numpy()
+    counts = status_counts['count'].to_numpy()
+    colors = [STATUS_COLORS.get(status, '#6c757d') for status in statuses]
+
+    # Swap the counts into the bar chart template
+    return _from_template(get_figure_template('status_distribution', language=language), [{
+        'x': statuses,
+        'y': counts,
+        'marker': {'color': colors},
+        'text': counts
+    }], {})
 
 # Battery distribution chart function removed as sensors are now plugged in, not battery-powered
 
-def create_time_series_chart(data, title, sensor_type):
+def create_time_series_chart(data, title, sensor_type, max_points=None, downsampling='lttb', language=None):
     """
     Creates a time series chart for sensor readings
-    
+
     Parameters:
     - data: DataFrame with columns 'timestamp' and 'value'
     - title: Title of the chart
     - sensor_type: Type of sensor (affects y-axis label and line color)
-    
+    - max_points: Points sent to the browser (default: about 2 per pixel of a full-width chart)
+    - downsampling: 'lttb' (keeps the shape) or 'minmax' (keeps every extreme)
+    - language: Language of the chart labels (selects the template)
+
     Returns:
     - Plotly figure object
     """
-    # Define y-axis label based on sensor type
-    if sensor_type == 'pressure':
-        y_label = 'Pressure (mmHg)'
-        color = '#1f77b4'  # Blue
-    elif sensor_type == 'temperature':
-        y_label = 'Temperature (°C)'
-        color = '#ff7f0e'  # Orange
-    elif sensor_type == 'humidity':
-        y_label = 'Humidity (%)'
-        color = '#2ca02c'  # Green
-    elif sensor_type == 'movement':
-        y_label = 'Movement (intensity)'
-        color = '#d62728'  # Red
-    else:
-        y_label = 'Value'
-        color = '#1f77b4'  # Blue
-    
-    # Create the time series chart
-    fig = px.line(
-        data,
-        x='timestamp',
-        y='value',
-        title=title,
-        labels={'timestamp': 'Time', 'value': y_label}
-    )
-    
-    # Update the line style
-    fig.update_traces(line=dict(color=color, width=2))
-    
-    # Add range slider
-    fig.update_layout(
-        xaxis=dict(
-            rangeslider=dict(visible=True),
-            type='date'
-        ),
-        height=400,
-        margin=dict(l=20, r=20, t=40, b=20)
-    )
-    
-    return fig
+    # Long series are reduced before the figure is built: the browser cannot draw more anyway
+    data = downsample_frame(data, max_points, downsampling)
+
+    # Swap the series into the template of the sensor type
+    template = get_figure_template('time_series', sensor_type, language)
+    return _from_template(template, [{
+        'x': data['timestamp'].to_numpy(),
+        'y': data['value'].to_numpy()
+    }], {
+        'title': {**template['layout'].get('title', {}), 'text': title}
+    })
@@ -0,0 +1,238 @@
+"""
+Instantané de démarrage à chaud du service d'ingestion
+Le service écrit périodiquement les dernières valeurs et les tampons circulaires récents
+dans un fichier binaire compact ; une nouvelle instance (redémarrage Streamlit, déploiement
+autoscale) le projette en mémoire (mmap) au démarrage et sert des tableaux de bord complets
+avant l'arrivée du premier message MQTT.
+
+Format du fichier (little endian) :
+- en-tête : magic, longueur des métadonnées, nombre de capteurs, nombre total de points, date d'écriture
+- métadonnées JSON : liste [ID, nombre de points] des capteurs, dernières valeurs (enregistrements courants)
+  et date (epoch) de réception de chacune : une valeur restaurée puis jamais rafraîchie garde sa date d'origine
+- horodatages int64 de tous les capteurs bout à bout, puis valeurs float64 (alignés sur 8 octets)
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                     "data", "warm_start.bin")
+MAGIC = b"MDMWARM1"
+HEADER = struct.Struct("<8sIIQd")
+
+# Au-delà, l'instantané est jugé trop ancien pour être présenté comme l'état courant
+DEFAULT_MAX_AGE_S = 24 * 3600
+
+
+class WarmState:
+    """
+    Contenu d'un instantané chargé
+
+    - written_at: Epoch (secondes) de l'écriture
+    - latest: Dictionnaire ID du capteur -> dernier enregistrement
+    - latest_at: Dictionnaire ID du capteur -> epoch (secondes) de réception de ce dernier enregistrement
+    - history: Dictionnaire ID du capteur -> (timestamps_ns, values), vues en lecture seule sur le fichier projeté
+    """
+    __slots__ = ('written_at', 'latest', 'latest_at', 'history', '_mapping')
+
+    def __init__(self, written_at, latest, history, mapping=None, latest_at=None):
+        self.written_at = written_at
+        self.latest = latest
+        self.latest_at = latest_at if latest_at is not None else dict.fromkeys(latest, written_at)
+        self.history = history
+        self._mapping = mapping  # Gardé ouvert tant que les vues de history sont utilisées
+
+    @property
+    def age(self):
+        """Âge de l'instantané en secondes"""
+        return time.time() - self.written_at
+
+
+def write_warm_snapshot(path, latest, history, latest_at=None):
+    """
+    Écrit un instantané de manière atomique (fichier temporaire puis renommage)
+
+    Parameters:
+    - path: Fichier de destination
+    - latest: Mapping ID du capteur -> dernier enregistrement (sérialisable en JSON)
+    - history: Dictionnaire ID du capteur -> (timestamps_ns, values)
+    - latest_at: Dictionnaire ID du capteur -> epoch de réception du dernier enregistrement
+      (par défaut : maintenant)
+
+    Returns:
+    - Taille du fichier en octets
+    """
+    sensors = [(sensor_id, len(ts)) for sensor_id, (ts, _) in history.items()]
+    if latest_at is None:
+        latest_at = dict.fromkeys(latest, time.time())
+    meta = json.dumps({'sensors': sensors, 'latest': dict(latest), 'latest_at': latest_at}, default=str).encode()
+    meta += b" " * (-(HEADER.size + len(meta)) % 8)
+    total = sum(count for _, count in sensors)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(meta), len(sensors), total, time.time()))
+        f.write(meta)
+        for ts, _ in history.values():
+            f.write(np.ascontiguousarray(ts, dtype=np.int64).tobytes())
+        for _, values in history.values():
+            f.write(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    os.replace(tmp_path, path)
+    return HEADER.size + len(meta) + 16 * total
+
+
+def load_warm_snapshot(path=DEFAULT_SNAPSHOT_PATH, max_age_s=DEFAULT_MAX_AGE_S):
+    """
+    Projette un instantané en mémoire ; seules les métadonnées JSON sont analysées,
+    les historiques restent des vues sur le fichier
+
+    Les dernières valeurs reçues il y a plus de max_age_s sont écartées.
+
+    Returns:
+    - WarmState, ou None si le fichier est absent, invalide ou trop ancien
+    """
+    try:
+        with open(path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        magic, meta_len, sensor_count, total, written_at = HEADER.unpack_from(mapping)
+        if magic != MAGIC:
+            raise ValueError("magic invalide")
+        meta = json.loads(mapping[HEADER.size:HEADER.size + meta_len])
+        offset = HEADER.size + meta_len
+        timestamps = np.frombuffer(mapping, dtype=np.int64, count=total, offset=offset)
+        values = np.frombuffer(mapping, dtype=np.float64, count=total, offset=offset + 8 * total)
+        latest = meta['latest']
+        # Fichiers sans dates par valeur : toutes datées de l'écriture
+        latest_at = {sensor_id: float(meta.get('latest_at', {}).get(sensor_id, written_at)) for sensor_id in latest}
+        history = {}
+        position = 0
+        for sensor_id, count in meta['sensors']:
+            history[sensor_id] = (timestamps[position:position + count], values[position:position + count])
+            position += count
+    except (struct.error, ValueError, KeyError, TypeError, AttributeError) as e:
+        logger.warning(f"Instantané de démarrage ignoré ({path}): {e!r}")
+        return None
+
+    now = time.time()
+    if max_age_s is not None and now - written_at > max_age_s:
+        logger.info(f"Instantané de démarrage trop ancien ignoré ({(now - written_at) / 3600:.1f} h)")
+        return None
+    if max_age_s is not None:
+        expired = [sensor_id for sensor_id, received_at in latest_at.items() if now - received_at > max_age_s]
+        for sensor_id in expired:
+            del latest[sensor_id], latest_at[sensor_id]
+    return WarmState(written_at, latest, history, mapping, latest_at)
+
+
+class WarmStartWriter:
+    """
+    Thread qui réécrit l'instantané de démarrage du service d'ingestion à intervalle régulier,
+    uniquement lorsque la version des dernières valeurs a changé
+
+    Seule une source avec des tampons d'historique (intégration MQTT) est sauvegardée : le
+    simulateur direct redémarre instantanément et ne doit pas écraser l'instantané du broker.
+    À chaque passage, le service retire aussi les valeurs restaurées jamais rafraîchies.
+    """
+    def __init__(self, service, path=DEFAULT_SNAPSHOT_PATH, interval_s=30):
+        """
+        Parameters:
+        - service: IngestionService dont la source active est sauvegardée
+        - path: Fichier de l'instantané
+        - interval_s: Intervalle entre deux écritures
+        """
+        self.service = service
+        self.path = path
+        self.interval_s = interval_s
+        self.last_version = None
+        self.last_write_ms = 0.0
+        self.last_write_bytes = 0
+        self._received = {}  # ID du capteur -> (enregistrement, epoch de première observation)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Démarre le thread d'écriture"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="warm-start-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=5):
+        """Arrête le thread après une dernière écriture"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval_s):
+            self._write_safely()
+        self._write_safely()
+
+    def _write_safely(self):
+        try:
+            self.service.drop_stale_seeded()
+            self.write()
+        except Exception as e:
+            logger.error(f"Erreur lors de l'écriture de l'instantané de démarrage: {e}")
+
+    def write(self, force=False):
+        """
+        Écrit l'instantané si les dernières valeurs ont changé depuis la dernière écriture
+
+        Returns:
+        - True si un fichier a été écrit
+        """
+        integration = self.service.mqtt_integration
+        pool = getattr(integration, 'history', None)
+        if pool is None:
+            return False
+        snapshot = integration.get_snapshot()
+        if not snapshot.version or (snapshot.version == self.last_version and not force):
+            return False
+        start = time.perf_counter()
+        history = {}
+        # Copie sous le verrou du worker, comme get_history_frame : horodatages et valeurs du même état
+        with integration._lock:
+            for sensor_id, buffer in list(pool.buffers.items()):
+                ts, values = buffer.window()
+                history[sensor_id] = (ts.copy(), values.copy())
+        latest_at = self._received_times(snapshot)
+        self.last_write_bytes = write_warm_snapshot(self.path, snapshot.data, history, latest_at)
+        self.last_version = snapshot.version
+        self.last_write_ms = (time.perf_counter() - start) * 1000
+        logger.debug(f"Instantané de démarrage écrit: {len(snapshot)} capteurs, {self.last_write_bytes} octets")
+        return True
+
+    def _received_times(self, snapshot):
+        """
+        Date de réception de chaque dernière valeur : inchangée tant que l'enregistrement est le
+        même objet (valeur restaurée au démarrage : sa date d'origine), sinon celle de cette écriture
+        """
+        now = time.time()
+        seeded = self.service.seeded
+        received = {}
+        for sensor_id, record in snapshot.data.items():
+            known = self._received.get(sensor_id)
+            if known is None or known[0] is not record:
+                known = seeded.get(sensor_id)
+                if known is None or known[0] is not record:
+                    known = (record, now)
+            received[sensor_id] = known
+        self._received = received
+        return {sensor_id: received_at for sensor_id, (_, received_at) in received.items()}